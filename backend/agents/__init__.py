@@ -7,7 +7,7 @@ This module provides a collection of specialized agents for different tasks:
 - RegulatoryAgent: Handles ERA compliance queries
 
 Each agent has specialized prompts and retrieval strategies optimized
-for their domain.
+for their domain. The mode router picks agents when none are requested.
 """
 
 from backend.agents.base import BaseAgent, AgentResponse
@@ -16,6 +16,7 @@ from backend.agents.actions import ActionsAgent
 from backend.agents.analytics import AnalyticsAgent
 from backend.agents.regulatory import RegulatoryAgent
 from backend.agents.orchestrator import AgentOrchestrator, route_to_agent
+from backend.agents.router import RoutingDecision, route_query
 
 __all__ = [
     "BaseAgent",
@@ -26,4 +27,6 @@ __all__ = [
     "RegulatoryAgent",
     "AgentOrchestrator",
     "route_to_agent",
+    "RoutingDecision",
+    "route_query",
 ]
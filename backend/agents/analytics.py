@@ -9,11 +9,11 @@ Specializes in:
 
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.agents.base import AgentResponse, BaseAgent
-from backend.models import AnalyticsSnapshot
+from backend.agents.base import AgentResponse, BaseAgent, extract_sources
+from backend.services.analytics_cache import SnapshotView, get_latest_snapshot
+from backend.services.analytics_slicer import analytics_prompt_context
 from backend.services.llm import chat_completion
 
 
@@ -26,7 +26,8 @@ class AnalyticsAgent(BaseAgent):
     def __init__(self, db: AsyncSession):
         """Initialize with analytics data capability."""
         super().__init__(db)
-        self._analytics_data: Optional[dict] = None
+        self._snapshot: Optional[SnapshotView] = None
+        self._snapshot_loaded = False
 
     def get_system_prompt(self) -> str:
         """Get system prompt for analytics."""
@@ -63,27 +64,23 @@ Structure your analysis as:
 
 Always be precise with numbers and clearly state when data is incomplete."""
 
-    async def get_analytics_data(self) -> Optional[dict]:
-        """Get latest analytics snapshot from database."""
-        if self._analytics_data is not None:
-            return self._analytics_data
+    async def get_analytics_data(self, query: Optional[str] = None) -> Optional[dict]:
+        """Get latest analytics snapshot (prompt projection, cached per process).
 
-        stmt = (
-            select(AnalyticsSnapshot)
-            .order_by(AnalyticsSnapshot.created_at.desc())
-            .limit(1)
-        )
-        result = await self.db.execute(stmt)
-        snapshot = result.scalar_one_or_none()
-
-        if snapshot:
-            self._analytics_data = {
-                "id": str(snapshot.id),
-                "dataset_name": snapshot.dataset_name,
-                "payload": snapshot.payload,
-                "created_at": snapshot.created_at.isoformat(),
-            }
-        return self._analytics_data
+        With a query, the rows relevant to it are added as ``slice``.
+        """
+        await self.prefetch(query or "")
+        if self._snapshot is None:
+            return None
+        if query:
+            return await analytics_prompt_context(self._snapshot, query)
+        return self._snapshot.prompt_context()
+
+    async def prefetch(self, query: str) -> None:
+        """Load the latest analytics snapshot."""
+        if not self._snapshot_loaded:
+            self._snapshot = await get_latest_snapshot(self.db)
+            self._snapshot_loaded = True
 
     def build_analytics_context(self, analytics: Optional[dict]) -> str:
         """Build context from analytics data."""
@@ -101,6 +98,35 @@ Always be precise with numbers and clearly state when data is incomplete."""
             dr = payload["date_range"]
             parts.append(f"Date Range: {dr.get('min', 'N/A')} to {dr.get('max', 'N/A')}")
 
+        # Rows relevant to the question replace the static breakdowns
+        if analytics.get("slice"):
+            for key, label in (("saidi", "SAIDI (hours)"), ("saifi", "SAIFI"), ("caidi", "CAIDI (hours)")):
+                if key in payload:
+                    parts.append(f"{label}, whole dataset: {payload[key]}")
+            parts.append(f"\n{analytics['slice']}")
+            return "\n".join(parts)
+
+        for key, label in (("saidi", "SAIDI (hours)"), ("saifi", "SAIFI"), ("caidi", "CAIDI (hours)")):
+            if key in payload:
+                parts.append(f"{label}: {payload[key]}")
+        if "total_customers_affected" in payload:
+            parts.append(f"Total Customers Affected: {payload['total_customers_affected']:,}")
+
+        if "monthly_trend" in payload:
+            parts.append("\nMonthly Events:")
+            for month in payload["monthly_trend"]:
+                parts.append(f"  - {month['month']}: {month['events']}")
+
+        if "top_regions" in payload:
+            parts.append("\nEvents by Region:")
+            for region in payload["top_regions"]:
+                parts.append(f"  - {region['region']}: {region['events']} ({region['percentage']}%)")
+
+        if "outage_causes" in payload:
+            parts.append("\nEvents by Cause (%):")
+            for cause, pct in payload["outage_causes"].items():
+                parts.append(f"  - {cause}: {pct}%")
+
         if "category_counts" in payload:
             parts.append("\nCategory Breakdown:")
             for category, counts in payload["category_counts"].items():
@@ -114,13 +140,17 @@ Always be precise with numbers and clearly state when data is incomplete."""
         self,
         query: str,
         history: Optional[list[dict]] = None,
+        chunks: Optional[list[dict]] = None,
     ) -> AgentResponse:
         """Process query with analytics data included."""
         # Get document context
-        chunks, sources = await self.retrieve_context(query)
+        if chunks is None:
+            chunks, sources = await self.retrieve_context(query)
+        else:
+            sources = extract_sources(chunks)
 
         # Get analytics data
-        analytics = await self.get_analytics_data()
+        analytics = await self.get_analytics_data(query)
 
         # Build prompts
         system_prompt = self.get_system_prompt()
@@ -135,7 +165,7 @@ ANALYTICS DATA:
 {analytics_context}"""
 
         # Prepare messages
-        messages = history or []
+        messages = list(history or [])
         messages.append({"role": "user", "content": query})
 
         # Generate response
@@ -143,6 +173,7 @@ ANALYTICS DATA:
             messages=messages,
             system_prompt=system_prompt,
             context=full_context,
+            purpose=self.name,
         )
 
         answer = self.post_process(answer)
@@ -10,9 +10,22 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.rag import hybrid_retrieve
+from backend.services.context_assembly import merge_adjacent_chunks
 from backend.services.llm import chat_completion
 
 
+def extract_sources(chunks: list[dict]) -> list[str]:
+    """Unique source citations of chunks, in order."""
+    sources = []
+    seen = set()
+    for chunk in chunks:
+        citation = chunk.get("citation", chunk.get("source", ""))
+        if citation and citation not in seen:
+            sources.append(citation)
+            seen.add(citation)
+    return sources
+
+
 @dataclass
 class AgentResponse:
     """Response from an agent."""
@@ -97,21 +110,25 @@ class BaseAgent(ABC):
             top_n=self.get_top_n(),
             filters=self.get_retrieval_filters(),
         )
+        return chunks, extract_sources(chunks)
 
-        # Extract unique sources
-        sources = []
-        seen = set()
-        for chunk in chunks:
-            citation = chunk.get("citation", chunk.get("source", ""))
-            if citation and citation not in seen:
-                sources.append(citation)
-                seen.add(citation)
+    async def prefetch(self, query: str) -> None:
+        """Load what ``process`` needs from the database, ahead of time.
 
-        return chunks, sources
+        The orchestrator calls this before running agents concurrently with
+        pre-retrieved chunks, so ``process`` doesn't use the shared session.
+        Override in agents that read more than documents.
+
+        Args:
+            query: User query
+        """
+        return None
 
     def build_context_prompt(self, chunks: list[dict]) -> str:
         """Build context prompt from retrieved chunks.
 
+        Neighbouring chunks of a document are merged into one passage.
+
         Args:
             chunks: Retrieved document chunks
 
@@ -122,7 +139,7 @@ class BaseAgent(ABC):
             return "No relevant documents found."
 
         context_parts = []
-        for i, chunk in enumerate(chunks, 1):
+        for i, chunk in enumerate(merge_adjacent_chunks(chunks), 1):
             source = chunk.get("citation", chunk.get("source", "Unknown"))
             text = chunk.get("text", chunk.get("content", ""))
             context_parts.append(f"[{i}] Source: {source}\n{text}")
@@ -146,25 +163,30 @@ class BaseAgent(ABC):
         self,
         query: str,
         history: Optional[list[dict]] = None,
+        chunks: Optional[list[dict]] = None,
     ) -> AgentResponse:
         """Process a query and generate a response.
 
         Args:
             query: User query
             history: Optional conversation history
+            chunks: Pre-retrieved context; retrieved by the agent if omitted
 
         Returns:
             AgentResponse with answer and metadata
         """
         # Retrieve context
-        chunks, sources = await self.retrieve_context(query)
+        if chunks is None:
+            chunks, sources = await self.retrieve_context(query)
+        else:
+            sources = extract_sources(chunks)
 
         # Build prompts
         system_prompt = self.get_system_prompt()
         context_prompt = self.build_context_prompt(chunks)
 
-        # Prepare messages
-        messages = history or []
+        # Prepare messages (copied: history may be shared by concurrent agents)
+        messages = list(history or [])
         messages.append({"role": "user", "content": query})
 
         # Generate response
@@ -172,6 +194,7 @@ class BaseAgent(ABC):
             messages=messages,
             system_prompt=system_prompt,
             context=context_prompt,
+            purpose=self.name,
         )
 
         # Post-process
@@ -4,17 +4,37 @@ Provides:
 - Automatic routing based on mode/query
 - Agent registration and management
 - Multi-agent coordination for complex queries
+
+Multi-agent queries retrieve once for all agents: one hybrid retrieval
+with the largest top-N and the union of the agents' filters, then each
+agent gets the chunks matching its own filters. Agents then run
+concurrently without touching the database session.
+
+``stream_multi_agent`` reports each agent as it finishes, drops agents that
+exceed AGENT_TIMEOUT_SECONDS and streams the synthesis tokens.
+
+Without explicit modes, the local mode router (``agents/router.py``) picks
+the agents from the query text and embedding; the embedding is then reused
+by retrieval.
 """
 
-from typing import Optional, Type
+import asyncio
+import os
+from typing import Any, AsyncGenerator, Optional, Type
 
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.agents.base import AgentResponse, BaseAgent
+from backend.agents.base import AgentResponse, BaseAgent, extract_sources
 from backend.agents.strategy import StrategyAgent
 from backend.agents.actions import ActionsAgent
 from backend.agents.analytics import AnalyticsAgent
 from backend.agents.regulatory import RegulatoryAgent
+from backend.agents.router import RoutingDecision, load_centroids, route_query
+from backend.rag import hybrid_retrieve
+from backend.services.embeddings import get_embedding
+from backend.services.llm import chat_completion
+from backend.services.llm_stream import stream_chat_completion
 
 
 # Mode to agent mapping
@@ -26,6 +46,71 @@ MODE_AGENT_MAP: dict[str, Type[BaseAgent]] = {
 }
 
 
+# Seconds an agent may take before it is left out of the synthesis
+AGENT_TIMEOUT_SECONDS = float(os.getenv("AGENT_TIMEOUT_SECONDS", "30"))
+
+SYNTHESIS_PROMPT = """You are synthesizing responses from multiple specialized agents.
+Combine the insights into a coherent, comprehensive response.
+Highlight areas of agreement and note any complementary perspectives.
+Do not simply concatenate - create a unified answer."""
+
+SYNTHESIS_MESSAGES = [{"role": "user", "content": "Please synthesize these responses."}]
+
+# Filter keys that can be checked on retrieved chunks
+CHUNK_FILTER_KEYS = ("source", "document_id")
+
+# Extra chunks retrieved when some agents narrow the shared results
+SHARED_RETRIEVAL_OVERFETCH = 2
+
+
+def merge_filters(filters: list[Optional[dict]]) -> Optional[dict]:
+    """Union of retrieval filters: the conditions all of them share.
+
+    Args:
+        filters: Filters of each agent (None = no filtering)
+
+    Returns:
+        Filters matching every chunk any of them matches, or None
+    """
+    if not filters or any(not f for f in filters):
+        return None
+    shared = {
+        key: value
+        for key, value in filters[0].items()
+        if all(f.get(key) == value for f in filters[1:])
+    }
+    return shared or None
+
+
+def chunk_matches(chunk: dict, filters: dict[str, Any]) -> bool:
+    """Whether a retrieved chunk satisfies equality filters on its metadata.
+
+    Chunk sources may be stored as "<source> - <document>", so a source
+    filter also matches that prefix.
+    """
+    for key, value in filters.items():
+        actual = str(chunk.get(key) or "")
+        if key == "source":
+            if actual != value and not actual.startswith(f"{value} -"):
+                return False
+        elif actual != str(value):
+            return False
+    return True
+
+
+def build_synthesis_context(responses: dict[str, AgentResponse], query: str) -> str:
+    """Context of the synthesis call: the question and each agent's answer."""
+    parts = [f"Original Question: {query}\n"]
+    parts.append("Agent Responses:\n")
+
+    for mode, response in responses.items():
+        parts.append(f"## {mode.upper()} Agent:")
+        parts.append(response.answer)
+        parts.append("")
+
+    return "\n".join(parts)
+
+
 def get_agent_for_mode(mode: str, db: AsyncSession) -> BaseAgent:
     """Get the appropriate agent for a given mode.
 
@@ -119,29 +204,132 @@ class AgentOrchestrator:
         agent = self.get_agent(mode)
         return await agent.process(query, history)
 
-    async def multi_agent_query(
+    async def route(self, query: str) -> tuple[RoutingDecision, Optional[list[float]]]:
+        """Pick the agents for a query with the local mode router.
+
+        Args:
+            query: User query
+
+        Returns:
+            Tuple of (routing decision, query embedding or None when
+            embeddings are unavailable)
+        """
+        centroids = await load_centroids()
+        query_vector = None
+        if centroids:
+            try:
+                query_vector = await get_embedding(query)
+            except Exception as e:
+                logger.warning(f"Query embedding failed, routing by keywords: {e}")
+        return route_query(query, query_vector, centroids), query_vector
+
+    async def retrieve_shared(
         self,
         query: str,
         modes: list[str],
+        query_vector: Optional[list[float]] = None,
+    ) -> dict[str, list[dict]]:
+        """Retrieve context once for several agents.
+
+        One hybrid retrieval runs with the largest top-N and the union of the
+        agents' filters; each agent gets the chunks matching its own filters,
+        cut to its top-N. Agents whose filters can't be checked on chunks
+        (e.g. document type) get their own retrieval. Retrievals run one
+        after another on the orchestrator's session.
+
+        Args:
+            query: User query
+            modes: Modes of the agents
+            query_vector: Embedding of the query, if already computed
+
+        Returns:
+            Dict mapping mode to its chunks
+        """
+        agents = {mode: self.get_agent(mode) for mode in modes}
+        filters = {mode: agent.get_retrieval_filters() or {} for mode, agent in agents.items()}
+        merged = merge_filters(list(filters.values())) or {}
+
+        # Conditions each agent adds on top of the shared filters
+        narrowing = {
+            mode: {k: v for k, v in f.items() if merged.get(k) != v}
+            for mode, f in filters.items()
+        }
+        shared = [m for m in modes if all(k in CHUNK_FILTER_KEYS for k in narrowing[m])]
+        separate = [m for m in modes if m not in shared]
+
+        contexts: dict[str, list[dict]] = {}
+        if shared:
+            top_n = max(agents[m].get_top_n() for m in shared)
+            if any(narrowing[m] for m in shared):
+                top_n *= SHARED_RETRIEVAL_OVERFETCH
+            chunks = await hybrid_retrieve(
+                query=query,
+                db=self.db,
+                top_n=top_n,
+                filters=merged or None,
+                query_vector=query_vector,
+            )
+            for mode in shared:
+                matching = [c for c in chunks if chunk_matches(c, narrowing[mode])]
+                contexts[mode] = matching[: agents[mode].get_top_n()]
+
+        for mode in separate:
+            contexts[mode], _ = await agents[mode].retrieve_context(query)
+
+        return contexts
+
+    async def prepare(
+        self,
+        query: str,
+        modes: list[str],
+        query_vector: Optional[list[float]] = None,
+    ) -> dict[str, list[dict]]:
+        """Do all database work of a multi-agent query up front.
+
+        Args:
+            query: User query
+            modes: Modes of the agents
+            query_vector: Embedding of the query, if already computed
+
+        Returns:
+            Dict mapping mode to its chunks
+        """
+        contexts = await self.retrieve_shared(query, modes, query_vector)
+        for mode in modes:
+            await self.get_agent(mode).prefetch(query)
+        return contexts
+
+    async def multi_agent_query(
+        self,
+        query: str,
+        modes: Optional[list[str]] = None,
         history: Optional[list[dict]] = None,
     ) -> dict[str, AgentResponse]:
         """Query multiple agents and collect responses.
 
-        Useful for complex queries that span multiple domains.
+        Useful for complex queries that span multiple domains. Context is
+        retrieved once (``retrieve_shared``) and agent data is prefetched,
+        then the agents' LLM calls run concurrently without using the
+        database session (an AsyncSession is not safe for concurrent use).
 
         Args:
             query: User query
-            modes: List of modes/agents to query
+            modes: List of modes/agents to query (default: routed)
             history: Conversation history
 
         Returns:
             Dict mapping mode to AgentResponse
         """
-        import asyncio
+        query_vector = None
+        if not modes:
+            decision, query_vector = await self.route(query)
+            modes = decision.modes
+        modes = list(dict.fromkeys(modes))
+        contexts = await self.prepare(query, modes, query_vector)
 
         async def query_agent(mode: str) -> tuple[str, AgentResponse]:
             agent = self.get_agent(mode)
-            response = await agent.process(query, history)
+            response = await agent.process(query, history, chunks=contexts[mode])
             return mode, response
 
         tasks = [query_agent(mode) for mode in modes]
@@ -163,31 +351,129 @@ class AgentOrchestrator:
         Returns:
             Synthesized response combining insights from all agents
         """
-        # Build synthesis prompt
-        parts = [f"Original Question: {query}\n"]
-        parts.append("Agent Responses:\n")
-
-        for mode, response in responses.items():
-            parts.append(f"## {mode.upper()} Agent:")
-            parts.append(response.answer)
-            parts.append("")
-
-        # Use strategy agent for synthesis (could be a dedicated synthesizer)
-        from backend.services.llm import chat_completion
+        return await chat_completion(
+            messages=SYNTHESIS_MESSAGES,
+            system_prompt=SYNTHESIS_PROMPT,
+            context=build_synthesis_context(responses, query),
+            purpose="synthesis",
+        )
 
-        synthesis_prompt = """You are synthesizing responses from multiple specialized agents.
-Combine the insights into a coherent, comprehensive response.
-Highlight areas of agreement and note any complementary perspectives.
-Do not simply concatenate - create a unified answer."""
+    async def stream_multi_agent(
+        self,
+        query: str,
+        modes: Optional[list[str]] = None,
+        history: Optional[list[dict]] = None,
+        timeout: Optional[float] = None,
+        progress: bool = True,
+    ) -> AsyncGenerator[dict, None]:
+        """Query multiple agents and stream the synthesized answer.
+
+        Agents run concurrently; each is given ``timeout`` seconds and left
+        out of the synthesis when it takes longer or fails. Synthesis tokens
+        stream as soon as the last agent is in. With a single answer left,
+        that answer is streamed without a synthesis call.
+
+        Yields the events of ``stream_with_metadata``:
+        - start: {"agents": [...], "routing": {...} (when routed)}
+        - agent: {"agent", "status" (done/timeout/error), "sources", "elapsed_ms"}
+          as each agent finishes (only with ``progress``)
+        - token: {"content": "..."}
+        - done: {"content", "sources", "agents": {mode: status}}
 
-        combined_context = "\n".join(parts)
+        Args:
+            query: User query
+            modes: List of modes/agents to query (default: routed)
+            history: Conversation history
+            timeout: Seconds per agent (default AGENT_TIMEOUT_SECONDS)
+            progress: Whether to yield agent events
 
-        return await chat_completion(
-            messages=[{"role": "user", "content": "Please synthesize these responses."}],
-            system_prompt=synthesis_prompt,
-            context=combined_context,
+        Raises:
+            RuntimeError: If no agent answered
+        """
+        start: dict[str, Any] = {}
+        query_vector = None
+        if not modes:
+            decision, query_vector = await self.route(query)
+            modes = decision.modes
+            start["routing"] = decision.to_dict()
+        modes = list(dict.fromkeys(modes))
+        timeout = AGENT_TIMEOUT_SECONDS if timeout is None else timeout
+        yield {"type": "start", "data": {"agents": modes, **start}}
+
+        contexts = await self.prepare(query, modes, query_vector)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        async def query_agent(mode: str) -> tuple[str, Optional[AgentResponse], str]:
+            agent = self.get_agent(mode)
+            try:
+                response = await asyncio.wait_for(
+                    agent.process(query, history, chunks=contexts[mode]),
+                    timeout,
+                )
+                return mode, response, "done"
+            except asyncio.TimeoutError:
+                logger.warning(f"Agent {mode} timed out after {timeout}s, skipping")
+                return mode, None, "timeout"
+            except Exception as e:
+                logger.warning(f"Agent {mode} failed, skipping: {e}")
+                return mode, None, "error"
+
+        tasks = [asyncio.create_task(query_agent(mode)) for mode in modes]
+        responses: dict[str, AgentResponse] = {}
+        statuses: dict[str, str] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                mode, response, status = await next_done
+                statuses[mode] = status
+                if response is not None:
+                    responses[mode] = response
+                if progress:
+                    yield {
+                        "type": "agent",
+                        "data": {
+                            "agent": mode,
+                            "status": status,
+                            "sources": response.sources if response else [],
+                            "elapsed_ms": round((loop.time() - started) * 1000),
+                        },
+                    }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not responses:
+            raise RuntimeError("No agent answered in time")
+
+        # Keep the requested order for synthesis and citations
+        responses = {mode: responses[mode] for mode in modes if mode in responses}
+        sources = extract_sources(
+            [{"source": source} for r in responses.values() for source in r.sources]
         )
 
+        full_response = ""
+        if len(responses) == 1:
+            full_response = next(iter(responses.values())).answer
+            yield {"type": "token", "data": {"content": full_response}}
+        else:
+            async for token in stream_chat_completion(
+                messages=SYNTHESIS_MESSAGES,
+                system_prompt=SYNTHESIS_PROMPT,
+                context=build_synthesis_context(responses, query),
+                purpose="synthesis",
+            ):
+                full_response += token
+                yield {"type": "token", "data": {"content": token}}
+
+        yield {
+            "type": "done",
+            "data": {
+                "content": full_response,
+                "sources": sources,
+                "agents": {mode: statuses[mode] for mode in modes},
+            },
+        }
+
     @property
     def available_agents(self) -> dict[str, str]:
         """Get available agents and their descriptions.
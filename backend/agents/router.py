@@ -0,0 +1,240 @@
+"""Local mode router picking the agents a query needs.
+
+Routing is a cheap, synchronous classification (no LLM call):
+
+- keyword rules: weighted regexes per mode
+- centroid similarity: cosine similarity of the query embedding (the one
+  retrieval computes anyway) to the mean embedding of per-mode exemplar
+  queries; centroids are embedded once per process
+
+The best-scoring mode is always picked; other modes join when they score
+close to it, so only genuinely cross-domain questions fan out to several
+agents. Without an embedding (or before centroids are loaded) the keyword
+rules decide alone.
+"""
+
+import asyncio
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from operator import mul
+from typing import Optional
+
+from loguru import logger
+
+from backend.observability.metrics import AGENT_ROUTING_DECISIONS, AGENT_ROUTING_DURATION
+from backend.services.embeddings import get_embeddings
+from backend.services.rate_limiter import Priority
+
+# Mode used when nothing matches
+DEFAULT_MODE = "strategy_qa"
+
+# Other modes join the best one when scoring at least this share of its score
+ROUTER_SECONDARY_RATIO = float(os.getenv("ROUTER_SECONDARY_RATIO", "0.5"))
+# Most agents one query fans out to
+ROUTER_MAX_AGENTS = int(os.getenv("ROUTER_MAX_AGENTS", "2"))
+# Centroid similarities below this don't count (typical unrelated ~0.1-0.2)
+ROUTER_MIN_SIMILARITY = float(os.getenv("ROUTER_MIN_SIMILARITY", "0.25"))
+
+KEYWORD_RULES: dict[str, tuple[tuple[str, float], ...]] = {
+    "strategy_qa": (
+        (r"\bstrateg\w*", 1.0),
+        (r"\b(vision|mission|objectives?|goals?|pillars?)\b", 1.0),
+        (r"\b(plan|planning|roadmap|priorit\w*|long[- ]term)\b", 0.5),
+        (r"\b(challenges?|expan\w*|moderni[sz]\w*|capacity|invest\w*)\b", 0.5),
+    ),
+    "actions": (
+        (r"\b(actions?|recommend\w*|steps?|initiatives?)\b", 1.0),
+        (r"\b(what|which) should (we|uetcl)\b", 1.0),
+        (r"\bhow (can|could|do|should) (we|uetcl)\b", 0.75),
+        (r"\b(improve|reduce|mitigate|implement\w*|prioriti[sz]e)\b", 0.5),
+    ),
+    "analytics": (
+        (r"\b(analy[sz]\w*|data(set)?|trends?|statistics?|metrics?)\b", 1.0),
+        (r"\b(saidi|saifi|caidi|outages?|interruptions?|faults?|downtime)\b", 1.0),
+        (r"\b(highest|lowest|most|average|total|how many|per (month|region))\b", 0.5),
+        (r"\b(regions?|monthly|quarter\w*|(19|20)\d{2})\b", 0.25),
+    ),
+    "regulatory": (
+        (r"\bera\b|\belectricity regulatory authority\b", 1.0),
+        (r"\b(regulat\w*|complian\w*|licen[cs]\w*|grid code|tariffs?)\b", 1.0),
+        (r"\b(obligations?|requirements?|penalt\w*|permits?|reporting)\b", 0.5),
+        (r"\b(act|law|legal|statutory|conditions?)\b", 0.25),
+    ),
+}
+
+MODE_EXEMPLARS: dict[str, tuple[str, ...]] = {
+    "strategy_qa": (
+        "What is UETCL's strategic vision and mission?",
+        "What are the key objectives of the strategic plan?",
+        "How does the plan address transmission capacity expansion?",
+        "What are the strategic priorities for the next five years?",
+        "Which challenges does the strategy identify for the grid?",
+    ),
+    "actions": (
+        "What actions should we take to reduce transmission losses?",
+        "Recommend steps to improve grid reliability.",
+        "What initiatives should be prioritized this year?",
+        "How can we implement the maintenance strategy for substations?",
+        "Give me an action plan to mitigate outage risks.",
+    ),
+    "analytics": (
+        "Analyze the outage trends in the uploaded data.",
+        "Which regions have the highest outage frequency?",
+        "What were SAIDI and SAIFI last quarter?",
+        "Show the monthly number of interruptions by cause.",
+        "How many customers were affected by outages in 2024?",
+    ),
+    "regulatory": (
+        "What are ERA's requirements for grid code compliance?",
+        "What reporting obligations does UETCL have to ERA?",
+        "What are the license conditions for transmission operators?",
+        "Which penalties apply for regulatory non-compliance?",
+        "How are transmission tariffs approved by the regulator?",
+    ),
+}
+
+_PATTERNS = {
+    mode: tuple((re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in rules)
+    for mode, rules in KEYWORD_RULES.items()
+}
+
+_centroids: Optional[dict[str, list[float]]] = None
+_centroids_lock = asyncio.Lock()
+
+
+@dataclass
+class RoutingDecision:
+    """Agents picked for a query, with the scores behind the choice."""
+
+    modes: list[str]
+    scores: dict[str, float] = field(default_factory=dict)
+    method: str = "keywords"  # keywords, keywords+centroids
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "modes": self.modes,
+            "scores": {mode: round(score, 4) for mode, score in self.scores.items()},
+            "method": self.method,
+            "elapsed_ms": round(self.elapsed_ms, 4),
+        }
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _mean(vectors: list[list[float]]) -> list[float]:
+    return [sum(values) / len(vectors) for values in zip(*vectors)]
+
+
+async def load_centroids() -> Optional[dict[str, list[float]]]:
+    """Embed the exemplar queries and cache per-mode centroids.
+
+    Embeds once per process; on failure (e.g. no API key) routing keeps
+    using the keyword rules alone and loading is retried on the next call.
+
+    Returns:
+        Unit-length centroid per mode, or None
+    """
+    global _centroids
+    if _centroids is not None:
+        return _centroids
+    async with _centroids_lock:
+        if _centroids is None:
+            texts = [(mode, text) for mode, exemplars in MODE_EXEMPLARS.items() for text in exemplars]
+            try:
+                vectors = await get_embeddings(
+                    [text for _, text in texts], priority=Priority.INTERACTIVE
+                )
+            except Exception as e:
+                logger.warning(f"Router centroids unavailable, using keyword rules: {e}")
+                return None
+            by_mode: dict[str, list[list[float]]] = {}
+            for (mode, _), vector in zip(texts, vectors):
+                by_mode.setdefault(mode, []).append(_normalize(vector))
+            _centroids = {mode: _normalize(_mean(vs)) for mode, vs in by_mode.items()}
+    return _centroids
+
+
+def keyword_scores(query: str) -> dict[str, float]:
+    """Summed weights of the keyword rules each mode matches."""
+    return {
+        mode: sum(weight for pattern, weight in patterns if pattern.search(query))
+        for mode, patterns in _PATTERNS.items()
+    }
+
+
+def centroid_scores(
+    query_vector: list[float],
+    centroids: dict[str, list[float]],
+) -> dict[str, float]:
+    """Cosine similarity of the query to each mode's centroid (0 below threshold)."""
+    norm = math.sqrt(sum(v * v for v in query_vector)) or 1.0
+    scores = {}
+    for mode, centroid in centroids.items():
+        similarity = sum(map(mul, query_vector, centroid)) / norm
+        scores[mode] = similarity if similarity >= ROUTER_MIN_SIMILARITY else 0.0
+    return scores
+
+
+def route_query(
+    query: str,
+    query_vector: Optional[list[float]] = None,
+    centroids: Optional[dict[str, list[float]]] = None,
+    max_agents: int = ROUTER_MAX_AGENTS,
+) -> RoutingDecision:
+    """Pick the agents needed for a query.
+
+    Keyword scores are scaled to [0, 1] by the best mode's score and added
+    to the centroid similarities, so both signals weigh about the same.
+
+    Args:
+        query: User query
+        query_vector: Query embedding, if already computed
+        centroids: Mode centroids (default: those loaded by load_centroids)
+        max_agents: Most modes to return
+
+    Returns:
+        RoutingDecision with at least one mode
+    """
+    started = time.perf_counter()
+
+    scores = keyword_scores(query)
+    top_keyword = max(scores.values())
+    if top_keyword:
+        scores = {mode: score / top_keyword for mode, score in scores.items()}
+
+    method = "keywords"
+    centroids = centroids if centroids is not None else _centroids
+    if query_vector and centroids:
+        method = "keywords+centroids"
+        for mode, similarity in centroid_scores(query_vector, centroids).items():
+            scores[mode] = scores.get(mode, 0.0) + similarity
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    best = ranked[0][1]
+    if best <= 0:
+        modes = [DEFAULT_MODE]
+    else:
+        modes = [
+            mode for mode, score in ranked
+            if score > 0 and score >= best * ROUTER_SECONDARY_RATIO
+        ][:max(1, max_agents)]
+
+    elapsed = time.perf_counter() - started
+    AGENT_ROUTING_DURATION.labels(method=method).observe(elapsed)
+    for mode in modes:
+        AGENT_ROUTING_DECISIONS.labels(mode=mode).inc()
+
+    return RoutingDecision(
+        modes=modes,
+        scores=dict(ranked),
+        method=method,
+        elapsed_ms=elapsed * 1000,
+    )
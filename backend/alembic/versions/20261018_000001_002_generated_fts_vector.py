@@ -0,0 +1,71 @@
+"""Replace the FTS trigger with a STORED generated tsvector column.
+
+The plpgsql trigger fired once per inserted chunk row, which dominated the
+cost of bulk chunk loads. A generated column is computed by the executor as
+part of COPY / multi-row INSERT and needs no trigger.
+
+Revision ID: 002
+Revises: add_user_auth_fields
+Create Date: 2026-10-18 00:00:01.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = 'add_user_auth_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS document_chunks_fts_trigger ON document_chunks")
+    op.execute("DROP FUNCTION IF EXISTS document_chunks_fts_update()")
+
+    op.drop_index('ix_document_chunks_fts_vector', table_name='document_chunks')
+    op.execute("ALTER TABLE document_chunks DROP COLUMN fts_vector")
+    op.execute("""
+        ALTER TABLE document_chunks
+        ADD COLUMN fts_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english'::regconfig, COALESCE(text, ''))) STORED
+    """)
+    op.execute("COMMENT ON COLUMN document_chunks.fts_vector IS 'Full-text search vector, auto-generated from text'")
+
+    op.create_index(
+        'ix_document_chunks_fts_vector',
+        'document_chunks',
+        ['fts_vector'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_chunks_fts_vector', table_name='document_chunks')
+    op.execute("ALTER TABLE document_chunks DROP COLUMN fts_vector")
+    op.execute("ALTER TABLE document_chunks ADD COLUMN fts_vector tsvector")
+    op.execute("UPDATE document_chunks SET fts_vector = to_tsvector('english', COALESCE(text, ''))")
+
+    op.create_index(
+        'ix_document_chunks_fts_vector',
+        'document_chunks',
+        ['fts_vector'],
+        postgresql_using='gin'
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION document_chunks_fts_update()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.fts_vector := to_tsvector('english', COALESCE(NEW.text, ''));
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER document_chunks_fts_trigger
+        BEFORE INSERT OR UPDATE OF text ON document_chunks
+        FOR EACH ROW EXECUTE FUNCTION document_chunks_fts_update();
+    """)
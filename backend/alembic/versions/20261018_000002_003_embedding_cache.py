@@ -0,0 +1,44 @@
+"""Persistent embedding store and document file hashes.
+
+Adds the embedding_cache table (embeddings keyed by model, dimensions and
+SHA-256 of the normalized chunk text) and documents.file_hash for skipping
+duplicate uploads.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 00:00:02.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'embedding_cache',
+        sa.Column('model', sa.String(100), primary_key=True),
+        sa.Column('dimensions', sa.Integer(), primary_key=True),
+        sa.Column('content_hash', sa.String(64), primary_key=True, comment='SHA-256 hex digest of the normalized chunk text'),
+        sa.Column('embedding', sa.LargeBinary(), nullable=False, comment='Vector packed as little-endian float32'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+    )
+
+    op.add_column(
+        'documents',
+        sa.Column('file_hash', sa.String(64), nullable=True, comment='SHA-256 of the uploaded file, used to skip duplicate uploads'),
+    )
+    op.create_index('ix_documents_file_hash', 'documents', ['file_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_file_hash', table_name='documents')
+    op.drop_column('documents', 'file_hash')
+    op.drop_table('embedding_cache')
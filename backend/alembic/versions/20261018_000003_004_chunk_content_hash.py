@@ -0,0 +1,31 @@
+"""Add content_hash to document_chunks for incremental reindex.
+
+Existing rows keep a NULL hash; reindex hashes their text on the fly and
+fills the column in as chunks are kept or rewritten.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 00:00:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'document_chunks',
+        sa.Column('content_hash', sa.String(64), nullable=True, comment='SHA-256 of the normalized chunk text, used by incremental reindex'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('document_chunks', 'content_hash')
@@ -0,0 +1,52 @@
+"""Durable ingestion_jobs table for the background ingestion queue.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 00:00:04.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestion_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('document_name', sa.String(500), nullable=False),
+        sa.Column('file_path', sa.String(1000), nullable=False),
+        sa.Column('doc_type', sa.String(50), nullable=False),
+        sa.Column('source', sa.String(50), nullable=False),
+        sa.Column('file_hash', sa.String(64), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued', comment='queued, running, done or failed'),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('chunks_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('worker_id', sa.String(100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_ingestion_jobs_created_at', 'ingestion_jobs', ['created_at'])
+    op.create_index('ix_ingestion_jobs_status_created', 'ingestion_jobs', ['status', 'created_at'])
+    op.create_index('ix_ingestion_jobs_completed_at', 'ingestion_jobs', ['completed_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingestion_jobs_completed_at', table_name='ingestion_jobs')
+    op.drop_index('ix_ingestion_jobs_status_created', table_name='ingestion_jobs')
+    op.drop_index('ix_ingestion_jobs_created_at', table_name='ingestion_jobs')
+    op.drop_table('ingestion_jobs')
@@ -0,0 +1,29 @@
+"""Add checkpoint to ingestion_jobs for resumable ingestion.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 00:00:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'ingestion_jobs',
+        sa.Column('checkpoint', postgresql.JSONB(), nullable=False, server_default='{}', comment='Last completed stage and batch progress, for resuming'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('ingestion_jobs', 'checkpoint')
@@ -0,0 +1,29 @@
+"""Add metrics to ingestion_jobs for per-stage accounting.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 00:00:06.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'ingestion_jobs',
+        sa.Column('metrics', postgresql.JSONB(), nullable=False, server_default='{}', comment='Stage wall times, page/chunk/token counts and peak RSS'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('ingestion_jobs', 'metrics')
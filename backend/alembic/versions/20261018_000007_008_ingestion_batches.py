@@ -0,0 +1,47 @@
+"""Bulk ingestion batches.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 00:00:07.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestion_batches',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(500), nullable=False),
+        sa.Column('origin', sa.String(1000), nullable=False, comment='Server directory or uploaded archive name'),
+        sa.Column('max_parallel', sa.Integer(), nullable=False, server_default='2'),
+        sa.Column('files_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('skipped', postgresql.JSONB(), nullable=False, server_default='[]', comment='Files not queued: duplicates and unreadable files, with reason'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+    )
+    op.create_index('ix_ingestion_batches_created_at', 'ingestion_batches', ['created_at'])
+
+    op.add_column(
+        'ingestion_jobs',
+        sa.Column('batch_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('ingestion_batches.id', ondelete='SET NULL'), nullable=True),
+    )
+    op.create_index('ix_ingestion_jobs_batch_id', 'ingestion_jobs', ['batch_id'])
+    op.create_index('ix_ingestion_jobs_file_hash', 'ingestion_jobs', ['file_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingestion_jobs_file_hash', table_name='ingestion_jobs')
+    op.drop_index('ix_ingestion_jobs_batch_id', table_name='ingestion_jobs')
+    op.drop_column('ingestion_jobs', 'batch_id')
+    op.drop_index('ix_ingestion_batches_created_at', table_name='ingestion_batches')
+    op.drop_table('ingestion_batches')
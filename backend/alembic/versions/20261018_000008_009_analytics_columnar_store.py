@@ -0,0 +1,28 @@
+"""Add store_path to analytics_snapshots for the columnar Parquet store.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 00:00:08.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'analytics_snapshots',
+        sa.Column('store_path', sa.String(length=1000), nullable=True, comment='Directory of the columnar Parquet store'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('analytics_snapshots', 'store_path')
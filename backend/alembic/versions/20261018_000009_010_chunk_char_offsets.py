@@ -0,0 +1,37 @@
+"""Add char_start/char_end to document_chunks for context assembly.
+
+Offsets let neighbouring retrieved chunks be merged into one passage
+without their shared overlap. Existing rows keep NULL offsets (assembly
+falls back to matching the overlapping text) until they are reindexed.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 00:00:09.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'document_chunks',
+        sa.Column('char_start', sa.Integer(), nullable=True, comment='Start offset of the chunk in the chunked document text'),
+    )
+    op.add_column(
+        'document_chunks',
+        sa.Column('char_end', sa.Integer(), nullable=True, comment='End offset of the chunk in the chunked document text'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('document_chunks', 'char_end')
+    op.drop_column('document_chunks', 'char_start')
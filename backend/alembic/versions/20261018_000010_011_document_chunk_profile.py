@@ -0,0 +1,38 @@
+"""Add chunk_profile to documents for small-to-big retrieval.
+
+Documents indexed with the "small" profile have 150-token chunks that
+retrieval expands to windows of neighbouring chunks. Existing documents
+keep the "standard" profile.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 00:00:10.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'documents',
+        sa.Column(
+            'chunk_profile',
+            sa.String(20),
+            nullable=False,
+            server_default='standard',
+            comment='Chunk profile the document was indexed with (standard, small)',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'chunk_profile')
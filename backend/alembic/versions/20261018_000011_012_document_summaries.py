@@ -0,0 +1,33 @@
+"""Add summary to documents for the document-level summary index.
+
+Summaries are generated in the background after ingestion and embedded
+into a separate Qdrant collection; retrieval uses them to narrow chunk
+search to the most relevant documents. Existing documents are summarized
+by the same background worker (NULL = pending).
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18 00:00:11.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'documents',
+        sa.Column('summary', sa.Text(), nullable=True, comment='Generated document summary, indexed for two-stage retrieval'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'summary')
@@ -0,0 +1,41 @@
+"""Add status to documents so partially ingested documents stay hidden.
+
+Background ingestion commits the document and chunk rows before the
+vectors are upserted; until the job completes the document is "pending"
+(or "failed") and excluded from search, listings and duplicate checks.
+Existing documents are complete.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 00:00:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'documents',
+        sa.Column(
+            'status',
+            sa.String(20),
+            nullable=False,
+            server_default='indexed',
+            comment='pending, indexed or failed; set to indexed once all vectors are upserted',
+        ),
+    )
+    op.create_index('ix_documents_status', 'documents', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_status', table_name='documents')
+    op.drop_column('documents', 'status')
@@ -0,0 +1,161 @@
+"""Bulk ingestion CLI for SISUiQ.
+
+Queues every PDF in a directory or zip/tar archive as one ingestion batch
+and reports its aggregated progress until it finishes.
+
+Run directly:
+    python -m backend.ingest_bulk data/uetcl --source uetcl --type report
+    python -m backend.ingest_bulk corpus.zip --parallel 4
+    python -m backend.ingest_bulk data/era --manifest data/era/manifest.csv --no-wait
+
+Jobs are processed by the ingestion workers (the API or ``backend.worker``);
+pass --run-workers to process them in this process instead.
+
+Exit status is 1 if any job of the batch failed.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from backend.db import close_db
+from backend.services.bulk_ingest import (
+    BULK_INGEST_PARALLELISM,
+    BulkIngestError,
+    get_batch_progress,
+    ingest_archive,
+    ingest_directory,
+    parse_manifest,
+)
+
+# Seconds between progress reports
+POLL_SECONDS = 2.0
+
+
+def print_progress(progress: dict) -> None:
+    """Print one aggregated progress line."""
+    counts = progress["counts"]
+    print(
+        f"  [{progress['progress']:3d}%] {progress['status']:<7} "
+        f"queued {counts['queued']}, running {counts['running']}, "
+        f"done {counts['done']}, failed {counts['failed']} "
+        f"({progress['chunks_count']} chunks)",
+        flush=True,
+    )
+
+
+async def wait_for_batch(batch_id: str) -> dict:
+    """Report progress until every job of the batch has finished."""
+    while True:
+        progress = await get_batch_progress(batch_id)
+        print_progress(progress)
+        if progress["status"] not in ("queued", "running"):
+            return progress
+        await asyncio.sleep(POLL_SECONDS)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Queue the batch and optionally wait for it."""
+    path = Path(args.path)
+    try:
+        if path.is_dir():
+            summary = await ingest_directory(
+                str(path),
+                doc_type=args.doc_type,
+                source=args.source,
+                manifest_path=args.manifest,
+                recursive=not args.no_recursive,
+                max_parallel=args.parallel,
+                name=args.name,
+                restrict_to_root=False,
+            )
+        elif path.is_file():
+            manifest = None
+            if args.manifest:
+                manifest_file = Path(args.manifest)
+                manifest = parse_manifest(manifest_file.read_text(encoding="utf-8"), manifest_file.name)
+            summary = await ingest_archive(
+                path,
+                path.name,
+                doc_type=args.doc_type,
+                source=args.source,
+                manifest=manifest,
+                max_parallel=args.parallel,
+                name=args.name,
+            )
+        else:
+            print(f"❌ Not found: {path}", file=sys.stderr)
+            return 2
+    except BulkIngestError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    print(f"📦 Batch {summary['batch_id']} ({summary['name']})")
+    print(
+        f"   {summary['queued']} of {summary['files_total']} files queued, "
+        f"{len(summary['skipped'])} skipped, max {summary['max_parallel']} in parallel"
+    )
+    for skipped in summary["skipped"]:
+        print(f"   ⏭️  {skipped['file']}: {skipped['reason']}")
+
+    if args.no_wait or not summary["queued"]:
+        return 0
+
+    if args.run_workers:
+        from backend.services.ingestion_jobs import start_workers, stop_workers
+        from backend.services.qdrant import close_client, ensure_collection
+
+        await ensure_collection()
+        start_workers(summary["max_parallel"])
+        try:
+            progress = await wait_for_batch(summary["batch_id"])
+        finally:
+            await stop_workers()
+            await close_client()
+    else:
+        progress = await wait_for_batch(summary["batch_id"])
+
+    for failed in progress["failed_jobs"]:
+        print(f"   ❌ {failed['document_name']}: {failed['error_message']}")
+    print(
+        f"✅ Batch finished: {progress['counts']['done']} done, "
+        f"{progress['counts']['failed']} failed, {progress['chunks_count']} chunks"
+    )
+    return 1 if progress["counts"]["failed"] else 0
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    try:
+        return await run(args)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory or archive of PDFs")
+    parser.add_argument("path", help="Directory or zip/tar archive of PDFs")
+    parser.add_argument("--manifest", help="Manifest (JSON or CSV) with name, type, source per file")
+    parser.add_argument("--type", dest="doc_type", default="other", help="Default document type")
+    parser.add_argument("--source", default="other", help="Default document source")
+    parser.add_argument("--name", help="Batch name")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=BULK_INGEST_PARALLELISM,
+        help="Maximum jobs of this batch running at once",
+    )
+    parser.add_argument("--no-recursive", action="store_true", help="Skip subdirectories")
+    parser.add_argument("--no-wait", action="store_true", help="Queue the batch and exit")
+    parser.add_argument(
+        "--run-workers",
+        action="store_true",
+        help="Process the batch in this process instead of relying on running workers",
+    )
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
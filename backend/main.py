@@ -8,10 +8,17 @@ from fastapi.responses import RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from backend.db import close_db
-from backend.routers import admin, auth, chat, chat_stream, health, ingest
+from backend.routers import admin, analytics, auth, chat, chat_stream, health, ingest
 from backend.routers.v1 import router as v1_router
 from backend.services.qdrant import close_client, ensure_collection
-from backend.services.ingestion_jobs import start_worker, stop_worker
+from backend.services.ingestion_jobs import start_workers, stop_workers
+from backend.services.data_profile import shutdown_profile_pool
+from backend.services.llm_gateway import close_gateway
+from backend.services.job_events import close_job_event_hub
+
+# Run ingestion workers inside the API process. Set to false when a
+# separate `python -m backend.worker` process handles ingestion.
+RUN_INGESTION_WORKERS = os.getenv("RUN_INGESTION_WORKERS", "true").lower() == "true"
 
 
 # --- HTTPS Enforcement Middleware ---
@@ -52,15 +59,19 @@ async def lifespan(app: FastAPI):
     # Startup
     await ensure_collection()
     
-    # Start background ingestion worker
-    start_worker()
+    # Start background ingestion workers (unless a separate worker runs them)
+    if RUN_INGESTION_WORKERS:
+        start_workers()
     
     yield
     
     # Shutdown
-    await stop_worker()
+    await stop_workers()
+    await close_job_event_hub()
+    shutdown_profile_pool()
     await close_db()
     await close_client()
+    await close_gateway()
 
 
 app = FastAPI(
@@ -98,6 +109,7 @@ app.add_middleware(
 # Include routers - legacy (unversioned)
 app.include_router(auth.router)  # Auth router first
 app.include_router(admin.router)
+app.include_router(analytics.router)
 app.include_router(chat.router)
 app.include_router(chat_stream.router)
 app.include_router(health.router)
@@ -12,6 +12,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -66,6 +67,13 @@ class DocumentSource(str, enum.Enum):
     OTHER = "other"
 
 
+class DocumentStatus(str, enum.Enum):
+    """Document indexing status (only indexed documents are searchable)."""
+    PENDING = "pending"
+    INDEXED = "indexed"
+    FAILED = "failed"
+
+
 # --- Utility functions ---
 
 def utc_now() -> datetime:
@@ -236,6 +244,30 @@ class Document(Base):
         default=DocumentSource.OTHER,
     )
     file_path: Mapped[str] = mapped_column(String(1000), nullable=False)
+    file_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the uploaded file, used to skip duplicate uploads",
+    )
+    chunk_profile: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="standard",
+        server_default="standard",
+        comment="Chunk profile the document was indexed with (standard, small)",
+    )
+    summary: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Generated document summary, indexed for two-stage retrieval",
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=DocumentStatus.INDEXED.value,
+        server_default=DocumentStatus.INDEXED.value,
+        comment="pending, indexed or failed; set to indexed once all vectors are upserted",
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -254,6 +286,8 @@ class Document(Base):
     __table_args__ = (
         Index("ix_documents_type", "type"),
         Index("ix_documents_source", "source"),
+        Index("ix_documents_file_hash", "file_hash"),
+        Index("ix_documents_status", "status"),
     )
 
     def __repr__(self) -> str:
@@ -282,11 +316,27 @@ class DocumentChunk(Base):
         comment="Short source reference, e.g. 'UETCL Strategic Plan 2024-2029'",
     )
     page: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    # FTS vector - generated column for automatic updates
-    # Note: This is defined as a regular column; the actual GENERATED ALWAYS AS
-    # expression will be created in the migration for PostgreSQL-specific syntax
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the normalized chunk text, used by incremental reindex",
+    )
+    char_start: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="Start offset of the chunk in the chunked document text",
+    )
+    char_end: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="End offset of the chunk in the chunked document text",
+    )
+    # FTS vector - STORED generated column, so bulk loads (COPY / multi-row
+    # INSERT) compute it set-wise without a per-row plpgsql trigger.
+    # Never written by the application.
     fts_vector = mapped_column(
         TSVECTOR,
+        Computed("to_tsvector('english'::regconfig, COALESCE(text, ''))", persisted=True),
         nullable=True,
         comment="Full-text search vector, auto-generated from text",
     )
@@ -308,6 +358,161 @@ class DocumentChunk(Base):
         return f"<DocumentChunk doc={self.document_id} idx={self.chunk_index}>"
 
 
+class IngestionBatch(Base):
+    """A bulk ingestion request (directory or archive) fanned out to jobs.
+
+    Jobs of a batch reference it via ``ingestion_jobs.batch_id``; workers run
+    at most ``max_parallel`` of them at once so one large batch can't
+    monopolize the ingestion workers.
+    """
+    __tablename__ = "ingestion_batches"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    name: Mapped[str] = mapped_column(String(500), nullable=False)
+    origin: Mapped[str] = mapped_column(
+        String(1000),
+        nullable=False,
+        comment="Server directory or uploaded archive name",
+    )
+    max_parallel: Mapped[int] = mapped_column(Integer, nullable=False, default=2)
+    files_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped: Mapped[list] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=list,
+        comment="Files not queued: duplicates and unreadable files, with reason",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=utc_now,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<IngestionBatch {self.id} files={self.files_total}>"
+
+
+class IngestionJobRecord(Base):
+    """Durable background ingestion job.
+
+    Workers lease queued rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` and
+    keep the lease alive with heartbeats; a running job whose lease expired
+    (worker crash) is picked up again by another worker.
+    """
+    __tablename__ = "ingestion_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    document_name: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(1000), nullable=False)
+    doc_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    file_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ingestion_batches.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="queued",
+        comment="queued, running, done or failed",
+    )
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    chunks_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    document_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+    )
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    checkpoint: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+        comment="Last completed stage and batch progress, for resuming",
+    )
+    metrics: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+        comment="Stage wall times, page/chunk/token counts and peak RSS",
+    )
+    worker_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=utc_now,
+        index=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=utc_now,
+        onupdate=utc_now,
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    __table_args__ = (
+        Index("ix_ingestion_jobs_status_created", "status", "created_at"),
+        Index("ix_ingestion_jobs_completed_at", "completed_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<IngestionJobRecord {self.id} status={self.status}>"
+
+
+class EmbeddingCacheEntry(Base):
+    """Persistent embedding for a normalized chunk text.
+
+    Keyed by embedding model, vector dimensions and the SHA-256 of the
+    normalized text, so identical chunks are only ever embedded once.
+    """
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    dimensions: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content_hash: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="SHA-256 hex digest of the normalized chunk text",
+    )
+    embedding: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        comment="Vector packed as little-endian float32",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=utc_now,
+    )
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingCacheEntry {self.model}/{self.dimensions} {self.content_hash[:12]}>"
+
+
 class AnalyticsSnapshot(Base):
     """Analytics snapshot model for processed data summaries."""
     __tablename__ = "analytics_snapshots"
@@ -333,6 +538,11 @@ class AnalyticsSnapshot(Base):
         nullable=True,
         comment="Path to raw data file",
     )
+    store_path: Mapped[str | None] = mapped_column(
+        String(1000),
+        nullable=True,
+        comment="Directory of the columnar Parquet store",
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -1,8 +1,16 @@
 """Prometheus metrics for SISUiQ.
 
 Provides:
-- Counters: chat_requests_total, rag_queries_total, analytics_runs_total
-- Histograms: rag_duration_seconds, llm_duration_seconds, request_duration_seconds
+- Counters: chat_requests_total, rag_queries_total, analytics_runs_total,
+  embeddings_created_total, embedding_retries_total,
+  embedding_store_lookups_total, agent_routing_decisions_total,
+  llm_tokens_total, singleflight_calls_total, document_index_retrievals_total
+- Histograms: rag_duration_seconds, llm_duration_seconds, request_duration_seconds,
+  embedding_batch_duration_seconds, embedding_throughput_per_second,
+  openai_queue_seconds, ingestion_stage_duration_seconds,
+  ingestion_extraction_peak_rss_bytes, ingestion_job_pages,
+  ingestion_job_chunks, agent_routing_duration_seconds,
+  llm_time_to_first_token_seconds, llm_concurrency_wait_seconds
 - GET /metrics endpoint in Prometheus text format
 - Middleware for automatic request duration tracking
 
@@ -75,6 +83,46 @@ ANALYTICS_RUNS = Counter(
     ["dataset"],
 ) if PROMETHEUS_AVAILABLE else NoOpMetric()
 
+EMBEDDINGS_CREATED = Counter(
+    "embeddings_created_total",
+    "Total number of texts embedded via the embeddings API",
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+EMBEDDING_RETRIES = Counter(
+    "embedding_retries_total",
+    "Total number of retried embeddings API requests",
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+EMBEDDING_STORE_LOOKUPS = Counter(
+    "embedding_store_lookups_total",
+    "Chunk texts looked up in the persistent embedding store",
+    ["result"],  # hit, miss
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens used by chat completions (cached: prompt tokens served from the prompt cache)",
+    ["model", "type"],  # prompt, completion, cached
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Calls issued (leader) or coalesced into an identical in-flight call (follower)",
+    ["group", "role"],  # group: embeddings, retrieval, llm
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+AGENT_ROUTING_DECISIONS = Counter(
+    "agent_routing_decisions_total",
+    "Agents picked by the local mode router",
+    ["mode"],
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+DOCUMENT_INDEX_RETRIEVALS = Counter(
+    "document_index_retrievals_total",
+    "Retrievals by how the document summary index was used",
+    ["stage"],  # summaries, narrowed, full
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
 
 # --- Histograms ---
 
@@ -103,6 +151,73 @@ REQUEST_DURATION = Histogram(
     buckets=DURATION_BUCKETS,
 ) if PROMETHEUS_AVAILABLE else NoOpMetric()
 
+EMBEDDING_BATCH_DURATION = Histogram(
+    "embedding_batch_duration_seconds",
+    "Duration of a single embeddings API request in seconds",
+    buckets=DURATION_BUCKETS,
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+OPENAI_QUEUE_TIME = Histogram(
+    "openai_queue_seconds",
+    "Time an OpenAI call waited in the rate scheduler before being issued",
+    ["scheduler", "priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+EMBEDDING_THROUGHPUT = Histogram(
+    "embedding_throughput_per_second",
+    "Embeddings produced per second for one batched embedding run",
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+
+INGESTION_STAGE_DURATION = Histogram(
+    "ingestion_stage_duration_seconds",
+    "Wall time of one ingestion job stage in seconds",
+    ["stage"],  # extract, chunk, store, embed, upsert
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+INGESTION_EXTRACTION_PEAK_RSS = Histogram(
+    "ingestion_extraction_peak_rss_bytes",
+    "Peak process RSS while extracting one document",
+    buckets=tuple(mb * 1024 * 1024 for mb in (128, 256, 512, 768, 1024, 1536, 2048, 3072, 4096)),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+INGESTION_JOB_PAGES = Histogram(
+    "ingestion_job_pages",
+    "Pages parsed per ingestion job by each extractor",
+    ["extractor"],  # pypdf, pdfplumber, ocr
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+INGESTION_JOB_CHUNKS = Histogram(
+    "ingestion_job_chunks",
+    "Chunks produced per ingestion job",
+    buckets=(1, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from issuing a chat completion to its first token",
+    ["model"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+LLM_CONCURRENCY_WAIT = Histogram(
+    "llm_concurrency_wait_seconds",
+    "Time a chat completion waited for a gateway concurrency slot",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
+AGENT_ROUTING_DURATION = Histogram(
+    "agent_routing_duration_seconds",
+    "Time the local mode router took to pick agents for a query",
+    ["method"],  # keywords, keywords+centroids
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+) if PROMETHEUS_AVAILABLE else NoOpMetric()
+
 
 # --- Metrics Endpoint ---
 
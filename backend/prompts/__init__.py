@@ -1,6 +1,6 @@
 """System prompt templates and builders for SISUiQ agents."""
 
-from backend.prompts.builder import build_context, build_system_prompt
+from backend.prompts.builder import build_context, build_messages, build_system_prompt
 from backend.prompts.templates import BASE_PERSONA, MODE_TEMPLATES
 
 __all__ = [
@@ -8,4 +8,5 @@ __all__ = [
     "MODE_TEMPLATES",
     "build_system_prompt",
     "build_context",
+    "build_messages",
 ]
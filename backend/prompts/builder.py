@@ -1,9 +1,16 @@
 """Prompt builder utilities for SISUiQ.
 
 This module provides functions to build system prompts and context strings
-from templates and dynamic data.
+from templates and dynamic data, and to lay them out as API messages.
+
+Messages are laid out prefix-stable for the provider's automatic prompt
+caching: the static system prompt first, then the conversation history,
+then the per-turn context and question. The history window only moves in
+steps, so consecutive turns share the system prompt and history as a cached
+prefix.
 """
 
+from functools import lru_cache
 from typing import Any
 
 from backend.prompts.templates import (
@@ -15,8 +22,16 @@ from backend.prompts.templates import (
     CONTEXT_HEADER,
     MODE_TEMPLATES,
 )
+from backend.services.context_assembly import merge_adjacent_chunks
+
+# Prior messages kept in the prompt: at least HISTORY_WINDOW; the window's
+# start moves HISTORY_WINDOW_STEP messages at a time, so it stays fixed
+# (and cacheable) for several turns
+HISTORY_WINDOW = 10
+HISTORY_WINDOW_STEP = 6
 
 
+@lru_cache(maxsize=128)
 def build_system_prompt(
     mode: str,
     has_analytics: bool = False,
@@ -26,6 +41,9 @@ def build_system_prompt(
 ) -> str:
     """Build a complete system prompt from templates.
 
+    Memoized: the prompt only depends on the arguments, and an identical
+    string keeps the provider's prompt cache warm.
+
     Args:
         mode: Chat mode (strategy_qa, actions, analytics, regulatory)
         has_analytics: Whether analytics data is available
@@ -68,6 +86,51 @@ def build_system_prompt(
     return "\n\n".join(parts)
 
 
+def history_window(messages: list[dict[str, str]], window: int = HISTORY_WINDOW) -> list[dict[str, str]]:
+    """Recent messages to include, with a start that moves in steps.
+
+    Args:
+        messages: Prior conversation messages, oldest first
+        window: Minimum number of messages to keep
+
+    Returns:
+        Tail of ``messages`` (between ``window`` and
+        ``window + HISTORY_WINDOW_STEP - 1`` messages once it is that long)
+    """
+    start = max(0, len(messages) - window)
+    start -= start % HISTORY_WINDOW_STEP
+    return messages[start:]
+
+
+def build_messages(
+    system_prompt: str,
+    context: str,
+    messages: list[dict[str, str]],
+) -> list[dict[str, str]]:
+    """Lay out a chat request prefix-stable for prompt caching.
+
+    Order: system prompt, prior history, retrieved context, current
+    question. Only the last two change every turn.
+
+    Args:
+        system_prompt: Static system prompt
+        context: Retrieved context for this turn
+        messages: Conversation history ending with the current user message
+
+    Returns:
+        Messages list for the chat completions API
+    """
+    history = [{"role": m["role"], "content": m["content"]} for m in messages]
+    question = history.pop() if history and history[-1]["role"] == "user" else None
+
+    full_messages = [{"role": "system", "content": system_prompt}]
+    full_messages.extend(history_window(history))
+    full_messages.append({"role": "system", "content": f"CONTEXT:\n{context}"})
+    if question:
+        full_messages.append(question)
+    return full_messages
+
+
 def build_context(
     chunks: list[dict[str, Any]],
     analytics: dict[str, Any] | None = None,
@@ -75,6 +138,9 @@ def build_context(
 ) -> str:
     """Build context section from retrieved chunks and analytics.
 
+    Neighbouring chunks of a document are merged into one passage (see
+    ``services/context_assembly.py``).
+
     Args:
         chunks: List of retrieved document chunks with text and metadata
         analytics: Optional analytics data summary
@@ -89,7 +155,7 @@ def build_context(
     if chunks:
         context_parts.append(CONTEXT_HEADER)
 
-        for i, chunk in enumerate(chunks[:max_chunks], 1):
+        for i, chunk in enumerate(merge_adjacent_chunks(chunks[:max_chunks]), 1):
             citation = _format_citation(chunk)
             text = chunk.get("text", "").strip()
             context_parts.append(f"\n[{i}] {citation}\n{text}")
@@ -144,6 +210,19 @@ def _format_analytics_summary(summary: dict[str, Any]) -> str:
     # Get payload (might be nested or at top level)
     payload = summary.get("payload", summary)
 
+    # Query-specific slice replaces the static breakdowns
+    if summary.get("slice"):
+        if "row_count" in payload:
+            parts.append(f"Records: {payload['row_count']}")
+        if "date_range" in payload:
+            dr = payload["date_range"]
+            parts.append(f"Date Range: {dr.get('min', 'N/A')} to {dr.get('max', 'N/A')}")
+        for key, label in (("saidi", "SAIDI"), ("saifi", "SAIFI"), ("caidi", "CAIDI")):
+            if key in payload:
+                parts.append(f"{label} (whole dataset): {payload[key]}")
+        parts.append(f"\n{summary['slice']}")
+        return "\n".join(parts)
+
     # SAIDI/SAIFI metrics
     if "saidi" in payload:
         parts.append(
@@ -153,6 +232,10 @@ def _format_analytics_summary(summary: dict[str, Any]) -> str:
         parts.append(
             f"SAIFI (System Average Interruption Frequency Index): {payload['saifi']}"
         )
+    if "caidi" in payload:
+        parts.append(
+            f"CAIDI (Customer Average Interruption Duration Index, hours): {payload['caidi']}"
+        )
 
     # Event counts
     if "total_events" in payload:
@@ -181,7 +264,7 @@ def _format_analytics_summary(summary: dict[str, Any]) -> str:
     # Monthly trend
     if "monthly_trend" in payload:
         parts.append("\nMonthly Trend:")
-        for month in payload["monthly_trend"][:6]:
+        for month in payload["monthly_trend"][-6:]:
             parts.append(f"  - {month['month']}: {month['events']} events")
 
     # Generic row count
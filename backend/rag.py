@@ -1,18 +1,31 @@
 """Hybrid RAG retrieval with Reciprocal Rank Fusion."""
-from typing import Any, Dict, List, Optional
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import func, select, text
+from sqlalchemy import and_, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import Document, DocumentChunk
+from backend.db import get_db_context
+from backend.models import Document, DocumentChunk, DocumentStatus
+from backend.observability.metrics import DOCUMENT_INDEX_RETRIEVALS
+from backend.services.chunking import CHUNK_PROFILES
+from backend.services.context_assembly import merge_runs
+from backend.services.document_summaries import select_documents
 from backend.services.embeddings import get_embedding
-from backend.services.qdrant import search_similar
+from backend.services.qdrant import corpus_generation, search_similar
+from backend.services.singleflight import fingerprint, get_singleflight
+
+# Neighbouring chunks added on each side of a hit from a document indexed
+# with an expanding chunk profile (small-to-big retrieval)
+CHUNK_WINDOW = int(os.getenv("CHUNK_WINDOW", "2"))
 
 
 async def semantic_search(
     query: str,
     top_k: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    query_vector: Optional[List[float]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Perform semantic search using Qdrant.
@@ -20,13 +33,15 @@ async def semantic_search(
     Args:
         query: Search query text
         top_k: Number of results to return
-        filters: Optional filters (source, document_id)
+        filters: Optional filters (source, document_id, document_ids)
+        query_vector: Embedding of the query, if already computed
 
     Returns:
         List of ranked hits with metadata
     """
     # Get query embedding
-    query_vector = await get_embedding(query)
+    if query_vector is None:
+        query_vector = await get_embedding(query)
 
     # Search Qdrant
     hits = await search_similar(
@@ -56,7 +71,7 @@ async def keyword_search(
         query: Search query text
         db: Database session
         top_k: Number of results to return
-        filters: Optional filters (source, type)
+        filters: Optional filters (source, type, document_id, document_ids)
 
     Returns:
         List of ranked hits with metadata
@@ -74,10 +89,13 @@ async def keyword_search(
             DocumentChunk.text,
             DocumentChunk.source,
             DocumentChunk.page,
+            DocumentChunk.char_start,
+            DocumentChunk.char_end,
             func.ts_rank(DocumentChunk.fts_vector, tsquery).label("rank_score"),
         )
         .join(Document, Document.id == DocumentChunk.document_id)
         .where(DocumentChunk.fts_vector.op("@@")(tsquery))
+        .where(Document.status == DocumentStatus.INDEXED.value)
     )
 
     # Apply filters
@@ -88,6 +106,8 @@ async def keyword_search(
             stmt = stmt.where(Document.type == filters["type"])
         if "document_id" in filters:
             stmt = stmt.where(DocumentChunk.document_id == filters["document_id"])
+        if "document_ids" in filters:
+            stmt = stmt.where(DocumentChunk.document_id.in_(filters["document_ids"]))
 
     # Order by rank and limit
     stmt = stmt.order_by(text("rank_score DESC")).limit(top_k)
@@ -104,6 +124,8 @@ async def keyword_search(
             "text": row.text,
             "source": row.source or "",
             "page": row.page,
+            "char_start": row.char_start,
+            "char_end": row.char_end,
             "score": float(row.rank_score),
             "rank": rank + 1,
             "search_type": "keyword",
@@ -148,6 +170,8 @@ def rrf_fusion(
                 "text": hit["text"],
                 "source": hit["source"],
                 "page": hit.get("page"),
+                "char_start": hit.get("char_start"),
+                "char_end": hit.get("char_end"),
                 "semantic_rank": hit["rank"],
                 "keyword_rank": None,
             }
@@ -168,11 +192,17 @@ def rrf_fusion(
                 "text": hit["text"],
                 "source": hit["source"],
                 "page": hit.get("page"),
+                "char_start": hit.get("char_start"),
+                "char_end": hit.get("char_end"),
                 "semantic_rank": None,
                 "keyword_rank": hit["rank"],
             }
         else:
             chunks[chunk_id]["keyword_rank"] = hit["rank"]
+            # Points indexed before offsets were stored lack them
+            if chunks[chunk_id]["char_start"] is None:
+                chunks[chunk_id]["char_start"] = hit.get("char_start")
+                chunks[chunk_id]["char_end"] = hit.get("char_end")
 
     # Sort by RRF score (descending)
     sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
@@ -187,6 +217,116 @@ def rrf_fusion(
     return results
 
 
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Union of inclusive index ranges."""
+    merged: List[Tuple[int, int]] = []
+    for low, high in sorted(ranges):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+
+async def expand_chunk_windows(
+    chunks: List[Dict[str, Any]],
+    db: AsyncSession,
+    window: int = CHUNK_WINDOW,
+) -> List[Dict[str, Any]]:
+    """
+    Expand hits from small-chunk documents to windows of neighbouring chunks.
+
+    The windows of all hits are loaded in one range query (only documents
+    whose chunk profile expands match). Each window is merged into one
+    passage; touching or overlapping windows of a document become a single
+    passage that keeps the best score of the hits in it.
+
+    Args:
+        chunks: Fused hits, best first
+        db: Database session
+        window: Chunks added on each side of a hit (0 disables expansion)
+
+    Returns:
+        Passages, best first; hits from other documents are unchanged
+    """
+    if window <= 0:
+        return chunks
+
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    for chunk in chunks:
+        index = chunk.get("chunk_index")
+        if chunk.get("document_id") is None or index is None:
+            continue
+        ranges.setdefault(str(chunk["document_id"]), []).append(
+            (max(0, index - window), index + window)
+        )
+    if not ranges:
+        return chunks
+
+    expanding = [profile.name for profile in CHUNK_PROFILES.values() if profile.expand]
+    stmt = (
+        select(
+            DocumentChunk.id,
+            DocumentChunk.document_id,
+            DocumentChunk.chunk_index,
+            DocumentChunk.text,
+            DocumentChunk.source,
+            DocumentChunk.page,
+            DocumentChunk.char_start,
+            DocumentChunk.char_end,
+        )
+        .join(Document, Document.id == DocumentChunk.document_id)
+        .where(Document.chunk_profile.in_(expanding))
+        .where(Document.status == DocumentStatus.INDEXED.value)
+        .where(or_(*[
+            and_(
+                DocumentChunk.document_id == uuid.UUID(document_id),
+                DocumentChunk.chunk_index.between(low, high),
+            )
+            for document_id, spans in ranges.items()
+            for low, high in _merge_ranges(spans)
+        ]))
+    )
+    result = await db.execute(stmt)
+
+    rows: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for row in result.all():
+        rows[(str(row.document_id), row.chunk_index)] = {
+            "chunk_id": str(row.id),
+            "document_id": str(row.document_id),
+            "chunk_index": row.chunk_index,
+            "text": row.text,
+            "source": row.source or "",
+            "page": row.page,
+            "char_start": row.char_start,
+            "char_end": row.char_end,
+        }
+    if not rows:
+        return chunks
+
+    hits = {
+        (str(chunk.get("document_id")), chunk.get("chunk_index")): chunk
+        for chunk in chunks
+    }
+    expanded: List[Dict[str, Any]] = []
+    seen = set()
+    for chunk in chunks:
+        document_id = str(chunk.get("document_id"))
+        index = chunk.get("chunk_index")
+        if (document_id, index) not in rows:
+            expanded.append(chunk)
+            continue
+        # Neighbours in index order; hits keep their own scores
+        for neighbour in range(index - window, index + window + 1):
+            key = (document_id, neighbour)
+            if key in seen or key not in rows:
+                continue
+            seen.add(key)
+            expanded.append(hits.get(key, rows[key]))
+
+    return merge_runs(expanded)
+
+
 async def hybrid_retrieve(
     query: str,
     db: AsyncSession,
@@ -194,42 +334,83 @@ async def hybrid_retrieve(
     semantic_k: int = 15,
     keyword_k: int = 15,
     filters: Optional[Dict[str, Any]] = None,
+    query_vector: Optional[List[float]] = None,
+    window: int = CHUNK_WINDOW,
 ) -> List[Dict[str, Any]]:
     """
     Perform hybrid retrieval combining semantic and keyword search with RRF.
 
+    Unfiltered retrievals first consult the document summary index
+    (``services/document_summaries.py``): summary-style questions get the
+    best-matching document summaries, and on large corpora chunk search is
+    narrowed to the documents whose summaries match best.
+
+    Hits from documents indexed with small chunks are expanded to windows of
+    their neighbouring chunks (``expand_chunk_windows``), so candidates are
+    matched on small chunks while the prompt gets whole passages.
+
+    Concurrent identical retrievals (same query, parameters, filters and
+    corpus generation) run once, in their own database session; every
+    caller gets its own copy of the chunks.
+
     Args:
         query: Search query
-        db: Database session
+        db: Caller's database session (not used by the shared retrieval)
         top_n: Final number of results to return
         semantic_k: Number of semantic search results
         keyword_k: Number of keyword search results
         filters: Optional filters (source, type, document_id)
+        query_vector: Embedding of the query, if already computed (e.g. for
+            routing); saves the embedding call
+        window: Neighbouring chunks added on each side of a small-chunk hit
 
     Returns:
         Fused list of chunks with metadata
     """
-    # Run both searches (could parallelize with asyncio.gather)
-    semantic_hits = await semantic_search(query, top_k=semantic_k, filters=filters)
-    keyword_hits = await keyword_search(query, db, top_k=keyword_k, filters=filters)
-
-    # Fuse results
-    fused = rrf_fusion(semantic_hits, keyword_hits)
-
-    # Return top N
-    results = fused[:top_n]
-
-    # Enrich with document info if needed
-    for result in results:
-        # Format source citation
-        page = result.get("page")
-        source = result.get("source", "Unknown")
-        if page:
-            result["citation"] = f"[{source} p.{page}]"
-        else:
-            result["citation"] = f"[{source}]"
-
-    return results
+    async def retrieve() -> List[Dict[str, Any]]:
+        # Own session: followers must not depend on the leading request's,
+        # which is closed when that request ends or disconnects
+        async with get_db_context() as db:
+            vector = query_vector
+            scope = filters
+            if not filters:
+                if vector is None:
+                    vector = await get_embedding(query)
+                selection = await select_documents(query, vector, db)
+                DOCUMENT_INDEX_RETRIEVALS.labels(stage=selection.stage).inc()
+                if selection.stage == "summaries":
+                    return selection.passages[:top_n]
+                if selection.document_ids is not None:
+                    scope = {"document_ids": selection.document_ids}
+
+            # Run both searches (could parallelize with asyncio.gather)
+            semantic_hits = await semantic_search(
+                query, top_k=semantic_k, filters=scope, query_vector=vector
+            )
+            keyword_hits = await keyword_search(query, db, top_k=keyword_k, filters=scope)
+
+            # Fuse results
+            fused = rrf_fusion(semantic_hits, keyword_hits)
+
+            # Return top N
+            results = fused[:top_n]
+
+            # Enrich with document info if needed
+            for result in results:
+                # Format source citation
+                page = result.get("page")
+                source = result.get("source", "Unknown")
+                if page:
+                    result["citation"] = f"[{source} p.{page}]"
+                else:
+                    result["citation"] = f"[{source}]"
+
+            return await expand_chunk_windows(results, db, window=window)
+
+    key = fingerprint(
+        query, top_n, semantic_k, keyword_k, filters, window, corpus_generation()
+    )
+    return await get_singleflight("retrieval").do(key, retrieve, copy_result=True)
 
 
 async def get_document_name(document_id: str, db: AsyncSession) -> str:
@@ -1,5 +1,5 @@
 """API routers package."""
 
-from backend.routers import admin, auth, chat, chat_stream, health, ingest
+from backend.routers import admin, analytics, auth, chat, chat_stream, health, ingest
 
-__all__ = ["admin", "auth", "chat", "chat_stream", "health", "ingest"]
+__all__ = ["admin", "analytics", "auth", "chat", "chat_stream", "health", "ingest"]
@@ -5,6 +5,7 @@ Provides admin-only API endpoints for:
 - Session review
 - Documents management
 - Analytics snapshots
+- Ingestion job recovery
 
 SECURITY NOTE: This is DEMO-ONLY authentication.
 In production, use proper JWT/OAuth authentication.
@@ -28,8 +29,10 @@ from backend.models import (
     ChatSession,
     Document,
     DocumentChunk,
+    DocumentStatus,
     User,
 )
+from backend.services import llm_gateway
 from backend.services.qdrant import delete_by_document_id
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -135,6 +138,7 @@ class DocumentItem(BaseModel):
     source: str
     file_path: str
     chunk_count: int
+    status: str
     created_at: str
 
 
@@ -314,11 +318,15 @@ async def get_session_messages(
 async def list_documents(
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    status: DocumentStatus = Query(default=DocumentStatus.INDEXED),
     _admin: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    List all ingested documents with chunk counts.
+    List ingested documents with chunk counts.
+    
+    Only indexed documents by default; pass ``status=pending`` or
+    ``status=failed`` to see documents of running or failed ingestion jobs.
     
     Returns:
         { "data": [...], "count": <total> }
@@ -332,7 +340,9 @@ async def list_documents(
     )
 
     # Get total count
-    total_count = await db.scalar(select(func.count(Document.id)))
+    total_count = await db.scalar(
+        select(func.count(Document.id)).where(Document.status == status.value)
+    )
 
     stmt = (
         select(
@@ -341,9 +351,11 @@ async def list_documents(
             Document.type,
             Document.source,
             Document.file_path,
+            Document.status,
             Document.created_at,
             chunk_count.label("chunk_count"),
         )
+        .where(Document.status == status.value)
         .order_by(Document.created_at.desc())
         .offset(offset)
         .limit(limit)
@@ -360,6 +372,7 @@ async def list_documents(
             source=row.source.value if hasattr(row.source, 'value') else str(row.source),
             file_path=row.file_path,
             chunk_count=row.chunk_count or 0,
+            status=row.status,
             created_at=row.created_at.isoformat(),
         ).model_dump()
         for row in rows
@@ -472,8 +485,14 @@ async def get_stats(
     user_count = await db.scalar(select(func.count(User.id)))
     session_count = await db.scalar(select(func.count(ChatSession.id)))
     message_count = await db.scalar(select(func.count(ChatMessage.id)))
-    doc_count = await db.scalar(select(func.count(Document.id)))
-    chunk_count = await db.scalar(select(func.count(DocumentChunk.id)))
+    doc_count = await db.scalar(
+        select(func.count(Document.id)).where(Document.status == DocumentStatus.INDEXED.value)
+    )
+    chunk_count = await db.scalar(
+        select(func.count(DocumentChunk.id))
+        .join(Document, Document.id == DocumentChunk.document_id)
+        .where(Document.status == DocumentStatus.INDEXED.value)
+    )
     analytics_count = await db.scalar(select(func.count(AnalyticsSnapshot.id)))
 
     return {
@@ -502,8 +521,14 @@ class DocumentReindexResponse(BaseModel):
     """Response for document reindexing."""
     document_id: str
     name: str
+    chunk_profile: str = "standard"
     old_chunks: int
     new_chunks: int
+    kept: int = 0
+    added: int = 0
+    removed: int = 0
+    moved: int = 0
+    embedding_calls: int = 0
     message: str
 
 
@@ -554,22 +579,28 @@ async def delete_document(
 @router.post("/documents/{document_id}/reindex", response_model=DocumentReindexResponse)
 async def reindex_document(
     document_id: str,
+    full: bool = False,
+    chunk_profile: Optional[str] = None,
     _admin: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Reindex a document by re-chunking and re-embedding.
+    Reindex a document by re-chunking and diffing against stored chunks.
     
     This will:
-    - Delete existing chunks and vectors
     - Re-extract text from the stored PDF
     - Re-chunk with current settings
-    - Generate new embeddings
-    - Store new vectors in Qdrant
+    - Keep unchanged chunks and their vectors
+    - Delete removed chunks and vectors
+    - Embed and store only new or changed chunks
+    
+    Pass ``full=true`` to replace every chunk and vector instead, and
+    ``chunk_profile`` (standard, small) to switch the document's chunk
+    profile.
     
     Use this when:
     - Chunking parameters have changed
-    - Embedding model has been updated
+    - Embedding model has been updated (with ``full=true``)
     - Document appears corrupted in search
     """
     from backend.services.document_ops import (
@@ -584,14 +615,26 @@ async def reindex_document(
         raise HTTPException(status_code=400, detail="Invalid document ID format")
     
     try:
-        result = await do_reindex(db, doc_uuid, trace_id=document_id[:8])
+        result = await do_reindex(
+            db, doc_uuid, trace_id=document_id[:8], full=full, chunk_profile=chunk_profile
+        )
         
         return DocumentReindexResponse(
             document_id=result["document_id"],
             name=result["name"],
+            chunk_profile=result["chunk_profile"],
             old_chunks=result["old_chunks"],
             new_chunks=result["new_chunks"],
-            message=f"Successfully reindexed document '{result['name']}': {result['old_chunks']} → {result['new_chunks']} chunks",
+            kept=result["kept"],
+            added=result["added"],
+            removed=result["removed"],
+            moved=result["moved"],
+            embedding_calls=result["embedding_calls"],
+            message=(
+                f"Successfully reindexed document '{result['name']}': "
+                f"{result['old_chunks']} → {result['new_chunks']} chunks "
+                f"({result['kept']} kept, {result['added']} added, {result['removed']} removed)"
+            ),
         )
 
     except DocumentNotFoundError:
@@ -600,6 +643,88 @@ async def reindex_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class SummaryBackfillResponse(BaseModel):
+    """Response for building missing document summaries."""
+    summarized: int
+    pending: int
+    message: str
+
+
+@router.post("/documents/summaries/backfill", response_model=SummaryBackfillResponse)
+async def backfill_document_summaries(
+    limit: int = Query(default=20, ge=1, le=100),
+    _admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Build summaries for indexed documents that don't have one yet.
+    
+    The summary worker does this in the background; use this endpoint to
+    fill the summary index right away (e.g. after enabling it on an
+    existing corpus) or where no ingestion workers run.
+    """
+    from backend.services.document_summaries import summarize_pending
+    
+    summarized = await summarize_pending(limit)
+    pending = await db.scalar(
+        select(func.count(Document.id)).where(
+            Document.summary.is_(None),
+            Document.status == DocumentStatus.INDEXED.value,
+        )
+    )
+    
+    return SummaryBackfillResponse(
+        summarized=summarized,
+        pending=pending or 0,
+        message=f"Summarized {summarized} documents, {pending or 0} still pending",
+    )
+
+
+# --- Ingestion Job Endpoints ---
+
+
+class ResumeJobsRequest(BaseModel):
+    """Request to resume failed ingestion jobs."""
+    job_ids: Optional[List[str]] = None  # None resumes every failed job
+
+
+class ResumeJobsResponse(BaseModel):
+    """Response for resuming ingestion jobs."""
+    resumed: List[str]
+    count: int
+    message: str
+
+
+@router.post("/ingestion/jobs/resume", response_model=ResumeJobsResponse)
+async def resume_ingestion_jobs(
+    request: ResumeJobsRequest,
+    _admin: User = Depends(require_admin),
+):
+    """
+    Requeue failed ingestion jobs in bulk.
+    
+    Resumed jobs continue from their last checkpoint: completed
+    extraction, chunking and embedding batches are not repeated.
+    Omit ``job_ids`` to resume every failed job.
+    """
+    from backend.services.ingestion_jobs import resume_jobs
+    
+    if request.job_ids is not None:
+        try:
+            for job_id in request.job_ids:
+                uuid.UUID(job_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid job ID format")
+    
+    resumed = await resume_jobs(request.job_ids)
+    
+    return ResumeJobsResponse(
+        resumed=resumed,
+        count=len(resumed),
+        message=f"Resumed {len(resumed)} failed ingestion jobs",
+    )
+
+
 # --- Tips Generation Endpoint ---
 
 
@@ -622,9 +747,6 @@ async def get_document_tips(
 
     Uses LLM to analyze document chunks and generate relevant sample questions.
     """
-    import os
-    from openai import AsyncOpenAI
-
     # Get documents with chunks
     chunk_count = (
         select(func.count(DocumentChunk.id))
@@ -635,6 +757,7 @@ async def get_document_tips(
 
     stmt = (
         select(Document.id, Document.name, Document.type, Document.source, chunk_count.label("chunk_count"))
+        .where(Document.status == DocumentStatus.INDEXED.value)
         .having(chunk_count > 0)
         .group_by(Document.id)
         .order_by(Document.created_at.desc())
@@ -683,9 +806,8 @@ async def get_document_tips(
 
     # Generate sample questions using LLM
     try:
-        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-        response = await client.chat.completions.create(
+        # Shares the pooled client and chat rate limits with chat and ingestion
+        response_text = await llm_gateway.complete(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -714,10 +836,11 @@ Generate 5 diverse, specific questions and 3 practical tips."""
             ],
             temperature=0.7,
             max_tokens=500,
+            purpose="tips",
         )
 
         import json
-        response_text = response.choices[0].message.content or "{}"
+        response_text = response_text or "{}"
         # Clean up response if wrapped in markdown
         if response_text.startswith("```"):
             response_text = response_text.split("```")[1]
@@ -0,0 +1,88 @@
+"""Analytics snapshot endpoints.
+
+Serve snapshot payloads (or their slim projections) from the process-wide
+snapshot cache with ETags, so clients can keep the payload out of chat
+responses and revalidate it cheaply with If-None-Match.
+"""
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import get_db
+from backend.services.analytics_cache import (
+    VIEWS,
+    SnapshotView,
+    get_latest_snapshot,
+    get_snapshot,
+)
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+# Snapshots never change; "latest" must be revalidated on every use
+SNAPSHOT_CACHE_CONTROL = "private, max-age=86400, immutable"
+LATEST_CACHE_CONTROL = "private, no-cache"
+
+VIEW_PATTERN = "^(" + "|".join(VIEWS) + ")$"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _snapshot_response(
+    snapshot: SnapshotView,
+    view: str,
+    if_none_match: Optional[str],
+    cache_control: str,
+) -> Response:
+    etag = snapshot.etag(view)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        {
+            "id": snapshot.id,
+            "dataset_name": snapshot.dataset_name,
+            "created_at": snapshot.created_at,
+            "view": view,
+            "payload": snapshot.projection(view),
+        },
+        headers=headers,
+    )
+
+
+@router.get("/latest")
+async def latest_snapshot(
+    dataset_name: Optional[str] = Query(default=None),
+    view: str = Query(default="full", pattern=VIEW_PATTERN),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Latest analytics snapshot, optionally of one dataset.
+
+    Returns 304 when If-None-Match matches the current snapshot's ETag.
+    """
+    snapshot = await get_latest_snapshot(db, dataset_name)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="No analytics snapshot found")
+    return _snapshot_response(snapshot, view, if_none_match, LATEST_CACHE_CONTROL)
+
+
+@router.get("/snapshots/{snapshot_id}")
+async def snapshot_by_id(
+    snapshot_id: uuid.UUID,
+    view: str = Query(default="full", pattern=VIEW_PATTERN),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """One analytics snapshot (immutable, cacheable by clients)."""
+    snapshot = await get_snapshot(db, snapshot_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Analytics snapshot not found")
+    return _snapshot_response(snapshot, view, if_none_match, SNAPSHOT_CACHE_CONTROL)
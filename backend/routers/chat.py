@@ -10,7 +10,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db import get_db
 from backend.models import (
-    AnalyticsSnapshot,
     ChatMessage,
     ChatMode,
     ChatSession,
@@ -20,6 +19,8 @@ from backend.models import (
     UserRole,
 )
 from backend.rag import hybrid_retrieve
+from backend.services.analytics_cache import SnapshotView, get_latest_snapshot
+from backend.services.analytics_slicer import analytics_prompt_context
 from backend.services.auth import hash_password
 from backend.services.llm import (
     build_context_prompt,
@@ -58,6 +59,7 @@ class ChatResponse(BaseModel):
     session_id: str
     sources: List[str]
     analytics: Optional[dict] = None
+    analytics_ref: Optional[dict] = None
 
 
 class SessionInfo(BaseModel):
@@ -147,26 +149,9 @@ def get_source_filter(mode: str) -> Optional[dict]:
 async def get_latest_analytics(
     db: AsyncSession,
     dataset_name: Optional[str] = None,
-) -> Optional[dict]:
-    """Get latest analytics snapshot."""
-    stmt = select(AnalyticsSnapshot).order_by(AnalyticsSnapshot.created_at.desc())
-
-    if dataset_name:
-        stmt = stmt.where(AnalyticsSnapshot.dataset_name == dataset_name)
-
-    stmt = stmt.limit(1)
-
-    result = await db.execute(stmt)
-    snapshot = result.scalar_one_or_none()
-
-    if snapshot:
-        return {
-            "id": str(snapshot.id),
-            "dataset_name": snapshot.dataset_name,
-            "payload": snapshot.payload,
-            "created_at": snapshot.created_at.isoformat(),
-        }
-    return None
+) -> Optional[SnapshotView]:
+    """Get latest analytics snapshot (cached per process)."""
+    return await get_latest_snapshot(db, dataset_name)
 
 
 async def get_session_messages(
@@ -265,9 +250,12 @@ async def chat(
     )
 
     # Get analytics for analytics mode
-    analytics_data = None
+    snapshot = None
     if request.mode == "analytics":
-        analytics_data = await get_latest_analytics(db)
+        snapshot = await get_latest_analytics(db)
+    analytics_data = (
+        await analytics_prompt_context(snapshot, request.message) if snapshot else None
+    )
 
     # Build prompts
     system_prompt = build_system_prompt(
@@ -284,6 +272,7 @@ async def chat(
         messages=history,
         system_prompt=system_prompt,
         context=context,
+        purpose=request.mode,
     )
 
     # Store assistant message
@@ -310,7 +299,8 @@ async def chat(
         answer=answer,
         session_id=str(session.id),
         sources=sources,
-        analytics=analytics_data.get("payload") if analytics_data else None,
+        analytics=snapshot.chat_payload() if snapshot else None,
+        analytics_ref=snapshot.ref() if snapshot else None,
     )
 
 
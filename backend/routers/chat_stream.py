@@ -10,14 +10,14 @@ import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
 
+from backend.agents.orchestrator import AgentOrchestrator
 from backend.db import get_db
 from backend.models import (
-    AnalyticsSnapshot,
     ChatMessage,
     ChatMode,
     ChatSession,
@@ -26,6 +26,8 @@ from backend.models import (
     UserRole,
 )
 from backend.rag import hybrid_retrieve
+from backend.services.analytics_cache import SnapshotView, get_latest_snapshot
+from backend.services.analytics_slicer import analytics_prompt_context
 from backend.services.auth import hash_password
 from backend.services.llm_stream import stream_with_metadata
 
@@ -42,6 +44,16 @@ class StreamRequest(BaseModel):
     session_id: Optional[str] = None
 
 
+class MultiAgentStreamRequest(BaseModel):
+    """Request model for streaming multi-agent chat."""
+
+    message: str
+    modes: Optional[list[str]] = Field(default=None, min_length=1)
+    session_id: Optional[str] = None
+    progress: bool = True
+    agent_timeout: Optional[float] = Field(default=None, gt=0)
+
+
 async def get_or_create_user(email: str, db: AsyncSession) -> User:
     """Get existing user or create demo user."""
     stmt = select(User).where(User.email == email)
@@ -85,26 +97,55 @@ def derive_session_title(message: str) -> str:
 async def get_latest_analytics(
     db: AsyncSession,
     dataset_name: Optional[str] = None,
-) -> Optional[dict]:
-    """Get latest analytics snapshot."""
-    stmt = select(AnalyticsSnapshot).order_by(AnalyticsSnapshot.created_at.desc())
+) -> Optional[SnapshotView]:
+    """Get latest analytics snapshot (cached per process)."""
+    return await get_latest_snapshot(db, dataset_name)
 
-    if dataset_name:
-        stmt = stmt.where(AnalyticsSnapshot.dataset_name == dataset_name)
 
-    stmt = stmt.limit(1)
+def parse_mode(mode: str) -> ChatMode:
+    """Validate a chat mode, raising 400 on unknown modes."""
+    try:
+        return ChatMode(mode)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode. Must be one of: {[m.value for m in ChatMode]}",
+        )
 
-    result = await db.execute(stmt)
-    snapshot = result.scalar_one_or_none()
 
-    if snapshot:
-        return {
-            "id": str(snapshot.id),
-            "dataset_name": snapshot.dataset_name,
-            "payload": snapshot.payload,
-            "created_at": snapshot.created_at.isoformat(),
-        }
-    return None
+async def get_or_create_session(
+    session_id: Optional[str],
+    message: str,
+    mode: ChatMode,
+    user: User,
+    db: AsyncSession,
+) -> ChatSession:
+    """Get the user's session by ID, or start a new one titled by the message."""
+    if session_id:
+        try:
+            session_uuid = uuid.UUID(session_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid session_id format")
+
+        stmt = select(ChatSession).where(
+            ChatSession.id == session_uuid,
+            ChatSession.user_id == user.id,
+        )
+        result = await db.execute(stmt)
+        session = result.scalar_one_or_none()
+
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session
+
+    session = ChatSession(
+        user_id=user.id,
+        title=derive_session_title(message),
+        mode=mode,
+    )
+    db.add(session)
+    await db.flush()
+    return session
 
 
 async def get_session_messages(
@@ -135,45 +176,17 @@ async def stream_chat(
     Sends events:
     - start: {"sources": [...], "session_id": "..."}
     - token: {"content": "..."}
-    - done: {"content": "full response", "sources": [...], "analytics": {...}}
+    - done: {"content": "full response", "sources": [...], "analytics": {...},
+      "analytics_ref": {...}}
     - error: {"message": "..."}
 
     The client should accumulate tokens to build the full response.
     """
-    # Validate mode
-    try:
-        mode_enum = ChatMode(request.mode)
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid mode. Must be one of: {[m.value for m in ChatMode]}",
-        )
-
-    # Get or create session
-    session: ChatSession
-    if request.session_id:
-        try:
-            session_uuid = uuid.UUID(request.session_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid session_id format")
-
-        stmt = select(ChatSession).where(
-            ChatSession.id == session_uuid,
-            ChatSession.user_id == user.id,
-        )
-        result = await db.execute(stmt)
-        session = result.scalar_one_or_none()
-
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-    else:
-        session = ChatSession(
-            user_id=user.id,
-            title=derive_session_title(request.message),
-            mode=mode_enum,
-        )
-        db.add(session)
-        await db.flush()
+    # Validate mode and get or create session
+    mode_enum = parse_mode(request.mode)
+    session = await get_or_create_session(
+        request.session_id, request.message, mode_enum, user, db
+    )
 
     # Store user message
     user_message = ChatMessage(
@@ -196,9 +209,12 @@ async def stream_chat(
     )
 
     # Get analytics for analytics mode
-    analytics_data = None
+    snapshot = None
     if request.mode == "analytics":
-        analytics_data = await get_latest_analytics(db)
+        snapshot = await get_latest_analytics(db)
+    analytics_data = (
+        await analytics_prompt_context(snapshot, request.message) if snapshot else None
+    )
 
     # Capture session_id for streaming
     session_id_str = str(session.id)
@@ -239,6 +255,8 @@ async def stream_chat(
                     db.add(assistant_message)
                     await db.commit()
 
+                    event["data"]["analytics"] = snapshot.chat_payload() if snapshot else None
+                    event["data"]["analytics_ref"] = snapshot.ref() if snapshot else None
                     yield {
                         "event": "done",
                         "data": json.dumps(event["data"]),
@@ -252,3 +270,83 @@ async def stream_chat(
             }
 
     return EventSourceResponse(event_generator())
+
+
+@router.post("/stream/multi")
+async def stream_multi_agent_chat(
+    request: MultiAgentStreamRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Streaming multi-agent chat: several agents answer, one synthesis streams.
+
+    Sends events:
+    - start: {"agents": [...], "routing": {...}, "session_id": "..."}
+    - agent: {"agent": "...", "status": "done|timeout|error", "sources": [...],
+      "elapsed_ms": ...} as each agent finishes (when progress is set)
+    - token: {"content": "..."}
+    - done: {"content": "full response", "sources": [...], "agents": {...}}
+    - error: {"message": "..."}
+
+    Without modes, the local mode router picks the agents (the start event
+    then carries "routing"). Agents slower than agent_timeout seconds
+    (default AGENT_TIMEOUT_SECONDS) are left out of the synthesis.
+    """
+    modes = [parse_mode(mode) for mode in request.modes or []]
+    session = await get_or_create_session(
+        request.session_id,
+        request.message,
+        modes[0] if modes else ChatMode.STRATEGY_QA,
+        user,
+        db,
+    )
+
+    # History before this message: agents add the query themselves
+    history = await get_session_messages(session.id, db)
+
+    # Store user message
+    db.add(ChatMessage(
+        session_id=session.id,
+        role=MessageRole.USER,
+        content=request.message,
+    ))
+    await db.flush()
+
+    orchestrator = AgentOrchestrator(db)
+    session_id_str = str(session.id)
+
+    async def event_generator():
+        """Generate SSE events."""
+        try:
+            async for event in orchestrator.stream_multi_agent(
+                query=request.message,
+                modes=[mode.value for mode in modes] or None,
+                history=history,
+                timeout=request.agent_timeout,
+                progress=request.progress,
+            ):
+                if event["type"] == "start":
+                    event["data"]["session_id"] = session_id_str
+
+                elif event["type"] == "done":
+                    db.add(ChatMessage(
+                        session_id=session.id,
+                        role=MessageRole.ASSISTANT,
+                        content=event["data"]["content"],
+                    ))
+                    await db.commit()
+
+                yield {
+                    "event": event["type"],
+                    "data": json.dumps(event["data"]),
+                }
+
+        except Exception as e:
+            await db.rollback()
+            yield {
+                "event": "error",
+                "data": json.dumps({"message": str(e)}),
+            }
+
+    return EventSourceResponse(event_generator())
@@ -1,19 +1,17 @@
 """Document and data ingestion endpoints."""
+import json
 import os
+import shutil
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-import pandas as pd
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from pydantic import BaseModel
-from pypdf import PdfReader
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sse_starlette.sse import EventSourceResponse
 
 from backend.db import get_db
 from backend.models import (
@@ -21,19 +19,41 @@ from backend.models import (
     Document,
     DocumentChunk,
     DocumentSource,
+    DocumentStatus,
     DocumentType,
 )
-from backend.services.chunking import chunk_text
-from backend.services.embeddings import get_embeddings
+from backend.services.chunk_loader import bulk_insert_chunks
+from backend.services.chunking import chunk_text, get_chunk_profile
+from backend.services.document_summaries import wake_summary_worker
+from backend.services.embedding_store import embed_chunks
+from backend.services.analytics_cache import invalidate_analytics_cache
+from backend.services.analytics_store import ANALYTICS_STORE_PATH, build_dataset_async
+from backend.services.extraction import determine_page, extract_pdf_text_async
 from backend.services.qdrant import upsert_chunks
 from backend.services.ingestion_jobs import (
     JobStatus,
     IngestionJob,
     create_job,
+    find_unfinished_jobs,
     get_job,
     list_jobs,
-    queue_job,
 )
+from backend.services.bulk_ingest import (
+    BulkIngestError,
+    get_batch_progress,
+    ingest_archive,
+    ingest_directory,
+)
+from backend.services.uploads import (
+    MAX_ARCHIVE_UPLOAD_BYTES,
+    MAX_DATA_UPLOAD_BYTES,
+    MAX_PDF_UPLOAD_BYTES,
+    SavedUpload,
+    UploadError,
+    save_upload,
+    save_upload_to_temp,
+)
+from backend.services.job_events import TERMINAL_STAGES, event_to_sse, get_job_event_hub
 
 router = APIRouter(prefix="/api/ingest", tags=["ingestion"])
 
@@ -67,84 +87,40 @@ class DataResponse(BaseModel):
     message: str
 
 
-def extract_pdf_text(file_path: Path) -> tuple[str, list[int]]:
-    """
-    Extract text from PDF file using pypdf, pdfplumber, or OCR as fallback.
-
-    Args:
-        file_path: Path to PDF file
-
-    Returns:
-        Tuple of (full_text, page_breaks) where page_breaks is list of char positions
-    """
-    full_text = ""
-    page_breaks = []
-    
-    # Try pypdf first (fastest for embedded text)
+async def save_pdf_upload(file: UploadFile, file_id: uuid.UUID) -> SavedUpload:
+    """Stream an uploaded PDF to DOCS_PATH, mapping rejections to HTTP errors."""
     try:
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            page_breaks.append(len(full_text))
-            page_text = page.extract_text() or ""
-            full_text += page_text + "\n\n"
-    except Exception:
-        pass  # Fall through to pdfplumber
-    
-    # If pypdf didn't extract much text, try pdfplumber
-    if len(full_text.strip()) < 100:
-        full_text = ""
-        page_breaks = []
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_breaks.append(len(full_text))
-                    page_text = page.extract_text() or ""
-                    full_text += page_text + "\n\n"
-        except Exception:
-            pass  # Fall through to OCR
-    
-    # If still no text, try OCR (for scanned PDFs)
-    if len(full_text.strip()) < 100:
-        full_text = ""
-        page_breaks = []
-        try:
-            # Process one page at a time to reduce memory usage
-            # Use lower DPI (150 instead of 200) to save memory
-            from pdf2image.pdf2image import pdfinfo_from_path
-            import gc
-
-            info = pdfinfo_from_path(file_path)
-            num_pages = info.get("Pages", 1)
-
-            for page_num in range(1, num_pages + 1):
-                page_breaks.append(len(full_text))
-                # Convert single page at a time
-                images = convert_from_path(
-                    file_path,
-                    dpi=150,  # Lower DPI to reduce memory
-                    first_page=page_num,
-                    last_page=page_num
-                )
-                if images:
-                    page_text = pytesseract.image_to_string(images[0]) or ""
-                    full_text += page_text + "\n\n"
-                    # Explicitly free memory
-                    del images
-                    gc.collect()
-        except Exception as e:
-            raise RuntimeError(f"OCR extraction failed: {e}")
+        return await save_upload(file, DOCS_PATH / f"{file_id}.pdf", MAX_PDF_UPLOAD_BYTES)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
 
-    return full_text.strip(), page_breaks
+async def find_duplicate_document(
+    db: AsyncSession,
+    file_hash: str,
+) -> tuple[Document, int] | None:
+    """Find an already-ingested document with the same file hash.
 
+    Only completely indexed documents count.
 
-def determine_page(char_start: int, page_breaks: list[int]) -> int | None:
-    """Determine page number from character position."""
-    if not page_breaks:
+    Returns:
+        Tuple of (document, chunk count), or None if the file is new
+    """
+    result = await db.execute(
+        select(Document)
+        .where(Document.file_hash == file_hash)
+        .where(Document.status == DocumentStatus.INDEXED.value)
+        .order_by(Document.created_at)
+        .limit(1)
+    )
+    document = result.scalar_one_or_none()
+    if document is None:
         return None
-    for i, break_pos in enumerate(page_breaks):
-        if char_start < break_pos:
-            return i  # 0-indexed page before this break
-    return len(page_breaks)  # Last page
+
+    chunks_count = await db.scalar(
+        select(func.count()).select_from(DocumentChunk).where(DocumentChunk.document_id == document.id)
+    )
+    return document, chunks_count or 0
 
 
 @router.post("/docs", response_model=DocumentResponse)
@@ -163,6 +139,9 @@ async def ingest_document(
     - Chunks the text
     - Creates embeddings
     - Stores in Qdrant and Postgres
+
+    Returns 409 if an identical file is being ingested by a background job
+    (a failed one is resumed).
     """
     # Validate file type
     if not file.filename or not file.filename.lower().endswith(".pdf"):
@@ -185,18 +164,37 @@ async def ingest_document(
             detail=f"Invalid source. Must be one of: {[s.value for s in DocumentSource]}",
         )
 
-    # Generate file ID and path
+    # Stream to disk, hashing on the way
     file_id = uuid.uuid4()
-    file_path = DOCS_PATH / f"{file_id}.pdf"
-
-    # Save file
-    content = await file.read()
-    file_path.write_bytes(content)
+    saved = await save_pdf_upload(file, file_id)
+    file_path = saved.path
+    file_hash = saved.sha256
+
+    # Identical file already ingested: return it instead of re-processing
+    duplicate = await find_duplicate_document(db, file_hash)
+    if duplicate:
+        file_path.unlink(missing_ok=True)
+        existing, chunks_count = duplicate
+        return DocumentResponse(
+            id=str(existing.id),
+            name=existing.name,
+            type=existing.type.value,
+            source=existing.source.value,
+            chunks_count=chunks_count,
+            message="Document already ingested (identical file); returning existing document",
+        )
+    unfinished = (await find_unfinished_jobs([file_hash])).get(file_hash)
+    if unfinished:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Identical file is being ingested by job {unfinished.job_id}",
+        )
 
     try:
         # Extract text from PDF
         try:
-            full_text, page_breaks = extract_pdf_text(file_path)
+            full_text, page_breaks = await extract_pdf_text_async(file_path)
         except Exception as e:
             file_path.unlink()  # Clean up
             raise HTTPException(status_code=400, detail=f"PDF extraction error: {str(e)}")
@@ -206,7 +204,10 @@ async def ingest_document(
             raise HTTPException(status_code=400, detail="Could not extract text from PDF - empty content")
 
         # Chunk the text
-        chunks = chunk_text(full_text, chunk_size=600, chunk_overlap=100)
+        profile = get_chunk_profile()
+        chunks = chunk_text(
+            full_text, chunk_size=profile.chunk_size, chunk_overlap=profile.chunk_overlap
+        )
 
         if not chunks:
             file_path.unlink()
@@ -225,45 +226,42 @@ async def ingest_document(
             type=doc_type_enum,
             source=source_enum,
             file_path=str(file_path.relative_to(STORAGE_PATH.parent)),
+            file_hash=file_hash,
+            chunk_profile=profile.name,
         )
         db.add(document)
 
         # Prepare chunks for embedding and storage
         chunk_texts = [c[0] for c in chunks]
 
-        # Get embeddings
-        embeddings = await get_embeddings(chunk_texts)
+        # Get embeddings (stored embeddings are reused)
+        embeddings = await embed_chunks(chunk_texts)
 
-        # Create chunk records and prepare for Qdrant
+        # Prepare chunk records for Postgres and Qdrant
         qdrant_chunks = []
         for idx, (chunk_text_content, char_start, char_end) in enumerate(chunks):
             page_num = determine_page(char_start, page_breaks)
 
-            chunk_id = uuid.uuid4()
-            chunk = DocumentChunk(
-                id=chunk_id,
-                document_id=file_id,
-                chunk_index=idx,
-                text=chunk_text_content,
-                source=source_ref,
-                page=page_num,
-            )
-            db.add(chunk)
-
             qdrant_chunks.append({
-                "chunk_id": chunk_id,
+                "chunk_id": uuid.uuid4(),
                 "document_id": file_id,
                 "chunk_index": idx,
                 "text": chunk_text_content,
                 "source": source_ref,
                 "page": page_num,
+                "char_start": char_start,
+                "char_end": char_end,
             })
 
+        # Bulk-load chunk rows (flushes the document row first)
+        await bulk_insert_chunks(db, qdrant_chunks)
+
         # Upsert to Qdrant
         await upsert_chunks(qdrant_chunks, embeddings)
 
         # Commit database transaction
         await db.commit()
+        wake_summary_worker()
 
         return DocumentResponse(
             id=str(file_id),
@@ -294,7 +292,8 @@ async def ingest_data(
     Ingest a tabular data file (CSV or XLSX).
 
     - Stores the raw file
-    - Creates analytics_snapshot with summary stats
+    - Creates analytics_snapshot with summary stats (streaming profile)
+    - Converts the data to a Parquet store with precomputed aggregates
     """
     # Validate file type
     if not file.filename:
@@ -308,75 +307,17 @@ async def ingest_data(
     # Generate file ID and path (preserve extension)
     file_id = uuid.uuid4()
     file_path = DATA_PATH / f"{file_id}{ext}"
+    store_dir = ANALYTICS_STORE_PATH / str(file_id)
 
-    # Save file
-    content = await file.read()
-    file_path.write_bytes(content)
+    # Stream file to disk
+    try:
+        await save_upload(file, file_path, MAX_DATA_UPLOAD_BYTES)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
 
     try:
-        # Read file for summary
-        if ext == ".csv":
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path, engine="openpyxl")
-
-        # Clean columns: drop empty, replace "Unnamed" with generic
-        df = df.dropna(axis=1, how="all")
-        cleaned_cols = []
-        for idx, col in enumerate(df.columns):
-            name = str(col)
-            if name.startswith("Unnamed") or name.strip() == "":
-                name = f"column_{idx+1}"
-            cleaned_cols.append(name)
-        df.columns = cleaned_cols
-
-        # Build summary payload
-        payload: dict = {
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "columns": list(df.columns),
-            "column_types": {col: str(dtype) for col, dtype in df.dtypes.items()},
-        }
-
-        # Add date range if date columns exist
-        date_columns = df.select_dtypes(include=["datetime64"]).columns.tolist()
-        for col in df.columns:
-            if "date" in col.lower() or "time" in col.lower():
-                try:
-                    dates = pd.to_datetime(df[col], errors="coerce")
-                    valid_dates = dates.dropna()
-                    if not valid_dates.empty:
-                        payload["date_range"] = {
-                            "column": col,
-                            "min": str(valid_dates.min()),
-                            "max": str(valid_dates.max()),
-                        }
-                        break
-                except Exception:
-                    pass
-
-        # Add category counts for string columns (first few)
-        for col in df.select_dtypes(include=["object"]).columns[:3]:
-            value_counts = df[col].value_counts().head(5).to_dict()
-            if value_counts:
-                payload.setdefault("category_counts", {})[col] = {
-                    str(k): int(v) for k, v in value_counts.items()
-                }
-
-        # Add numeric summaries
-        numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-        if numeric_cols:
-            payload["numeric_summary"] = {}
-            for col in numeric_cols[:5]:  # First 5 numeric columns
-                payload["numeric_summary"][col] = {
-                    "mean": float(df[col].mean()) if not pd.isna(df[col].mean()) else None,
-                    "min": float(df[col].min()) if not pd.isna(df[col].min()) else None,
-                    "max": float(df[col].max()) if not pd.isna(df[col].max()) else None,
-                }
-        
-        # Add preview rows (first 5)
-        preview_rows = df.head(5).fillna("").to_dict(orient="records")
-        payload["preview_rows"] = preview_rows
+        # Profile the file and build its columnar store in the profiling pool
+        payload = await build_dataset_async(file_path, ext, store_dir)
 
         # Determine dataset name
         name = dataset_name or Path(file.filename).stem or f"dataset_{file_id}"
@@ -387,9 +328,13 @@ async def ingest_data(
             dataset_name=name,
             payload=payload,
             file_path=str(file_path.relative_to(STORAGE_PATH.parent)),
+            store_path=(
+                str(store_dir.relative_to(STORAGE_PATH.parent)) if "store" in payload else None
+            ),
         )
         db.add(snapshot)
         await db.commit()
+        invalidate_analytics_cache()
 
         return DataResponse(
             id=str(file_id),
@@ -402,9 +347,10 @@ async def ingest_data(
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up file on error
+        # Clean up files on error
         if file_path.exists():
             file_path.unlink()
+        shutil.rmtree(store_dir, ignore_errors=True)
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Data ingestion failed: {str(e)}")
 
@@ -428,10 +374,34 @@ class JobStatusResponse(BaseModel):
     document_id: Optional[str] = None
     chunks_count: int = 0
     error_message: Optional[str] = None
+    attempts: int = 0
+    batch_id: Optional[str] = None
+    checkpoint: dict = {}
+    metrics: dict = {}
     created_at: str
     updated_at: str
     completed_at: Optional[str] = None
 
+    @classmethod
+    def from_job(cls, job: IngestionJob) -> "JobStatusResponse":
+        """Build the response from a job."""
+        return cls(
+            job_id=job.job_id,
+            status=job.status.value if hasattr(job.status, 'value') else str(job.status),
+            progress=job.progress,
+            document_name=job.document_name,
+            document_id=job.document_id,
+            chunks_count=job.chunks_count,
+            error_message=job.error_message,
+            attempts=job.attempts,
+            batch_id=job.batch_id,
+            checkpoint=job.checkpoint,
+            metrics=job.metrics,
+            created_at=job.created_at.isoformat(),
+            updated_at=job.updated_at.isoformat(),
+            completed_at=job.completed_at.isoformat() if job.completed_at else None,
+        )
+
 
 class JobListResponse(BaseModel):
     """Response for job list."""
@@ -445,12 +415,18 @@ async def ingest_document_async(
     name: Optional[str] = Form(None),
     doc_type: str = Form("other"),
     source: str = Form("other"),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Queue a PDF document for background ingestion.
     
     Returns immediately with a job_id that can be polled for status.
-    Use GET /api/ingest/jobs/{job_id} to check progress.
+    Use GET /api/ingest/jobs/{job_id} to check progress, or stream it from
+    GET /api/ingest/jobs/{job_id}/events.
+
+    If an identical file was already ingested, the job is completed
+    immediately and points at the existing document. If one is being
+    ingested, or its job failed (the job is resumed), that job is returned.
     """
     # Validate file type
     if not file.filename or not file.filename.lower().endswith(".pdf"):
@@ -473,26 +449,51 @@ async def ingest_document_async(
             detail=f"Invalid source. Must be one of: {[s.value for s in DocumentSource]}",
         )
     
-    # Generate file path and save
+    # Stream to disk, hashing on the way
     file_id = uuid.uuid4()
-    file_path = DOCS_PATH / f"{file_id}.pdf"
-    
-    content = await file.read()
-    file_path.write_bytes(content)
-    
+    saved = await save_pdf_upload(file, file_id)
+    file_path = saved.path
+    file_hash = saved.sha256
+
+    duplicate = await find_duplicate_document(db, file_hash)
+    if duplicate:
+        file_path.unlink(missing_ok=True)
+        existing, chunks_count = duplicate
+        job = await create_job(
+            document_name=existing.name,
+            file_path=existing.file_path,
+            doc_type=existing.type.value,
+            source=existing.source.value,
+            file_hash=file_hash,
+            existing_document_id=str(existing.id),
+            existing_chunks_count=chunks_count,
+        )
+        return JobQueueResponse(
+            job_id=job.job_id,
+            status=JobStatus.DONE.value,
+            message=f"Document '{existing.name}' already ingested (identical file)",
+        )
+    unfinished = (await find_unfinished_jobs([file_hash])).get(file_hash)
+    if unfinished:
+        file_path.unlink(missing_ok=True)
+        return JobQueueResponse(
+            job_id=unfinished.job_id,
+            status=unfinished.status,
+            message=f"Document '{unfinished.document_name}' is already being ingested (identical file)",
+        )
+
     # Determine document name
     doc_name = name or file.filename or f"document_{file_id}"
     
     # Create and queue job
-    job = create_job(
+    job = await create_job(
         document_name=doc_name,
         file_path=str(file_path),
         doc_type=doc_type,
         source=source,
+        file_hash=file_hash,
     )
     
-    await queue_job(job)
-    
     return JobQueueResponse(
         job_id=job.job_id,
         status=job.status.value if hasattr(job.status, 'value') else str(job.status),
@@ -500,6 +501,71 @@ async def ingest_document_async(
     )
 
 
+@router.get("/jobs/events")
+async def stream_all_job_events(limit: int = 100):
+    """
+    Stream progress of all ingestion jobs over one Server-Sent Events connection.
+
+    Sends events:
+    - snapshot: {"jobs": [...]} queued and running jobs at connect time
+    - stage: {"job_id": "...", "stage": "...", "progress": 40, ...}
+    - progress: {"job_id": "...", "stage": "...", "pages_extracted": 12, ...}
+
+    Events of every job are multiplexed; clients route them by job_id.
+    """
+    async def event_generator():
+        async with get_job_event_hub().subscribe() as queue:
+            jobs = await list_jobs(
+                limit=limit,
+                statuses=[JobStatus.QUEUED, JobStatus.RUNNING],
+            )
+            yield {
+                "event": "snapshot",
+                "data": json.dumps({
+                    "jobs": [JobStatusResponse.from_job(j).model_dump() for j in jobs],
+                }),
+            }
+            while True:
+                yield event_to_sse(await queue.get())
+
+    return EventSourceResponse(event_generator())
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream progress of one ingestion job (Server-Sent Events).
+
+    Sends events:
+    - snapshot: current job status (same shape as GET /api/ingest/jobs/{job_id})
+    - stage: {"stage": "extracting" | "chunking" | "storing" | "embedding" | "done" | "failed", ...}
+    - progress: pages_extracted/pages_total, chunks_embedded, points_upserted
+
+    The stream closes after the job is done or failed.
+    """
+    if await get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def event_generator():
+        async with get_job_event_hub().subscribe(job_id) as queue:
+            # Read the snapshot after subscribing so no event falls in between
+            job = await get_job(job_id)
+            if job is None:
+                return
+            snapshot = JobStatusResponse.from_job(job)
+            yield {"event": "snapshot", "data": snapshot.model_dump_json()}
+            if snapshot.status in TERMINAL_STAGES:
+                return
+
+            while True:
+                event = await queue.get()
+                yield event_to_sse(event)
+                if event.get("event") == "stage" and event.get("stage") in TERMINAL_STAGES:
+                    return
+
+    return EventSourceResponse(event_generator())
+
+
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(job_id: str):
     """
@@ -507,23 +573,12 @@ async def get_job_status(job_id: str):
     
     Poll this endpoint to track background ingestion progress.
     """
-    job = get_job(job_id)
+    job = await get_job(job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    return JobStatusResponse(
-        job_id=job.job_id,
-        status=job.status.value if hasattr(job.status, 'value') else str(job.status),
-        progress=job.progress,
-        document_name=job.document_name,
-        document_id=job.document_id,
-        chunks_count=job.chunks_count,
-        error_message=job.error_message,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat(),
-        completed_at=job.completed_at.isoformat() if job.completed_at else None,
-    )
+    return JobStatusResponse.from_job(job)
 
 
 @router.get("/jobs", response_model=JobListResponse)
@@ -533,23 +588,153 @@ async def list_ingestion_jobs(limit: int = 50):
     
     Returns jobs sorted by creation time (newest first).
     """
-    jobs = list_jobs(limit=limit)
+    jobs = await list_jobs(limit=limit)
     
     return JobListResponse(
-        jobs=[
-            JobStatusResponse(
-                job_id=j.job_id,
-                status=j.status.value if hasattr(j.status, 'value') else str(j.status),
-                progress=j.progress,
-                document_name=j.document_name,
-                document_id=j.document_id,
-                chunks_count=j.chunks_count,
-                error_message=j.error_message,
-                created_at=j.created_at.isoformat(),
-                updated_at=j.updated_at.isoformat(),
-                completed_at=j.completed_at.isoformat() if j.completed_at else None,
-            )
-            for j in jobs
-        ],
+        jobs=[JobStatusResponse.from_job(j) for j in jobs],
         count=len(jobs),
     )
+
+
+# --- Bulk Ingestion Endpoints ---
+
+
+class BulkDirectoryRequest(BaseModel):
+    """Request to ingest a server-side directory."""
+    path: str
+    doc_type: str = "other"
+    source: str = "other"
+    manifest_path: Optional[str] = None
+    recursive: bool = True
+    max_parallel: Optional[int] = None
+    name: Optional[str] = None
+
+
+class BulkIngestResponse(BaseModel):
+    """Response when a bulk batch is queued."""
+    batch_id: str
+    name: str
+    files_total: int
+    queued: int
+    skipped: list[dict]
+    max_parallel: int
+    message: str
+
+
+class BatchProgressResponse(BaseModel):
+    """Aggregated progress of a bulk batch."""
+    batch_id: str
+    name: str
+    origin: str
+    status: str
+    progress: int
+    files_total: int
+    jobs_total: int
+    counts: dict[str, int]
+    chunks_count: int
+    max_parallel: int
+    skipped: list[dict]
+    failed_jobs: list[dict]
+    created_at: str
+
+
+def archive_kind(filename: str) -> Optional[str]:
+    """Upload kind (".zip" or ".tar") of an archive name, or None."""
+    lower = filename.lower()
+    if lower.endswith(".zip"):
+        return ".zip"
+    if lower.endswith((".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")):
+        return ".tar"
+    return None
+
+
+def _bulk_response(summary: dict) -> BulkIngestResponse:
+    return BulkIngestResponse(
+        **summary,
+        message=(
+            f"Queued {summary['queued']} of {summary['files_total']} files "
+            f"({len(summary['skipped'])} skipped)"
+        ),
+    )
+
+
+@router.post("/bulk/archive", response_model=BulkIngestResponse)
+async def ingest_bulk_archive(
+    file: UploadFile = File(...),
+    name: Optional[str] = Form(None),
+    doc_type: str = Form("other"),
+    source: str = Form("other"),
+    max_parallel: Optional[int] = Form(None),
+):
+    """
+    Queue every PDF in a zip or tar archive for background ingestion.
+
+    A manifest.json or manifest.csv at the archive root may set name, type
+    and source per file. Files already ingested are skipped. Track the
+    batch with GET /api/ingest/batches/{batch_id}.
+    """
+    filename = file.filename or "archive"
+    kind = archive_kind(filename)
+    if kind is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Archive must be .zip, .tar, .tar.gz, .tgz, .tar.bz2 or .tar.xz",
+        )
+    try:
+        saved = await save_upload_to_temp(file, MAX_ARCHIVE_UPLOAD_BYTES, kind)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    archive_path = saved.path
+    try:
+        summary = await ingest_archive(
+            archive_path,
+            filename,
+            doc_type=doc_type,
+            source=source,
+            max_parallel=max_parallel,
+            name=name,
+        )
+    except BulkIngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        archive_path.unlink(missing_ok=True)
+
+    return _bulk_response(summary)
+
+
+@router.post("/bulk/directory", response_model=BulkIngestResponse)
+async def ingest_bulk_directory(request: BulkDirectoryRequest):
+    """
+    Queue every PDF in a server-side directory for background ingestion.
+
+    The directory must be inside BULK_INGEST_ROOT (relative paths resolve
+    against it). A manifest.json or manifest.csv in the directory, or at
+    manifest_path, may set name, type and source per file.
+    """
+    try:
+        summary = await ingest_directory(
+            request.path,
+            doc_type=request.doc_type,
+            source=request.source,
+            manifest_path=request.manifest_path,
+            recursive=request.recursive,
+            max_parallel=request.max_parallel,
+            name=request.name,
+        )
+    except BulkIngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _bulk_response(summary)
+
+
+@router.get("/batches/{batch_id}", response_model=BatchProgressResponse)
+async def get_batch_status(batch_id: str):
+    """
+    Get the aggregated progress of a bulk ingestion batch.
+    """
+    progress = await get_batch_progress(batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+
+    return BatchProgressResponse(**progress)
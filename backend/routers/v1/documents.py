@@ -12,7 +12,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db import get_db
-from backend.models import Document, DocumentSource, User, UserRole
+from backend.models import Document, DocumentSource, DocumentStatus, User, UserRole
 from backend.services.auth import hash_password
 
 router = APIRouter()
@@ -107,7 +107,7 @@ async def list_documents(
 
     Args:
         source: Filter by document source (uetcl, era)
-        status: Filter by status (pending, indexed, failed)
+        status: Filter by status (pending, indexed, failed; default indexed)
         limit: Maximum documents to return
         offset: Offset for pagination
 
@@ -127,8 +127,8 @@ async def list_documents(
                 detail=f"Invalid source. Must be one of: {[s.value for s in DocumentSource]}",
             )
 
-    if status:
-        stmt = stmt.where(Document.status == status)
+    # Documents of running or failed ingestion jobs only on request
+    stmt = stmt.where(Document.status == (status or DocumentStatus.INDEXED.value))
 
     # Get total
     count_stmt = select(func.count()).select_from(stmt.subquery())
@@ -0,0 +1,199 @@
+"""Process-wide cache of analytics snapshots and their projections.
+
+Analytics-mode chat requests need the latest snapshot on every turn. The
+snapshots are cached per process instead of being re-read (with their full
+JSONB payload) for each request:
+
+- the latest snapshot per dataset (and overall) is cached for up to
+  ANALYTICS_CACHE_TTL_SECONDS; ``ingest_data`` invalidates it as soon as a
+  new snapshot is stored, the TTL bounds staleness in other processes
+- snapshots by id never change and are kept in a small LRU
+
+Each cached ``SnapshotView`` offers projections of the payload:
+
+- ``prompt``: what the prompt builder and the analytics agent render
+  (no preview rows or store metadata)
+- ``client``: what the insights panel displays, returned inline in chat
+  responses
+- ``full``: the stored payload, served by ``GET /api/analytics/...`` with
+  an ETag
+
+CHAT_ANALYTICS_PAYLOAD selects what chat responses carry: ``client``
+(default), ``full`` or ``none`` (clients fetch it via ``analytics_ref``).
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import AnalyticsSnapshot
+
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "60"))
+
+# What chat responses include: client, full or none
+CHAT_ANALYTICS_PAYLOAD = os.getenv("CHAT_ANALYTICS_PAYLOAD", "client")
+
+# Snapshots kept by id
+SNAPSHOT_CACHE_SIZE = 32
+
+PROMPT_PAYLOAD_KEYS = (
+    "total_events",
+    "total_customers_affected",
+    "saidi",
+    "saifi",
+    "caidi",
+    "top_regions",
+    "outage_causes",
+    "monthly_trend",
+    "row_count",
+    "date_range",
+    "category_counts",
+    "numeric_summary",
+    "note",
+)
+
+CLIENT_PAYLOAD_KEYS = (
+    "saidi",
+    "saifi",
+    "caidi",
+    "total_events",
+    "total_customers_affected",
+    "top_regions",
+    "outage_causes",
+    "monthly_trend",
+    "note",
+    "row_count",
+    "date_range",
+    "category_counts",
+)
+
+VIEWS = ("prompt", "client", "full")
+
+
+def _project(payload: dict, keys: Tuple[str, ...]) -> dict:
+    return {k: payload[k] for k in keys if k in payload}
+
+
+@dataclass
+class SnapshotView:
+    """An analytics snapshot with precomputed projections."""
+    id: str
+    dataset_name: str
+    created_at: str
+    store_path: Optional[str]
+    payload: dict
+    digest: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        canonical = json.dumps(self.payload, sort_keys=True, default=str)
+        self.digest = hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    @classmethod
+    def from_model(cls, snapshot: AnalyticsSnapshot) -> "SnapshotView":
+        return cls(
+            id=str(snapshot.id),
+            dataset_name=snapshot.dataset_name,
+            created_at=snapshot.created_at.isoformat(),
+            store_path=snapshot.store_path,
+            payload=snapshot.payload or {},
+        )
+
+    def etag(self, view: str = "full") -> str:
+        """Strong ETag of one projection."""
+        return f'"{self.digest}-{view}"'
+
+    def projection(self, view: str) -> dict:
+        """Payload projection: prompt, client or full."""
+        if view == "prompt":
+            return _project(self.payload, PROMPT_PAYLOAD_KEYS)
+        if view == "client":
+            return _project(self.payload, CLIENT_PAYLOAD_KEYS)
+        return self.payload
+
+    def prompt_context(self) -> dict:
+        """Analytics dict for the prompt builder and the analytics agent."""
+        return {
+            "id": self.id,
+            "dataset_name": self.dataset_name,
+            "payload": self.projection("prompt"),
+            "store_path": self.store_path,
+            "created_at": self.created_at,
+        }
+
+    def ref(self) -> dict:
+        """Reference to fetch the full payload from the analytics endpoint."""
+        return {
+            "snapshot_id": self.id,
+            "dataset_name": self.dataset_name,
+            "etag": self.etag(),
+            "href": f"/api/analytics/snapshots/{self.id}",
+        }
+
+    def chat_payload(self) -> Optional[dict]:
+        """Analytics carried inline by chat responses (CHAT_ANALYTICS_PAYLOAD)."""
+        if CHAT_ANALYTICS_PAYLOAD == "none":
+            return None
+        return self.projection("full" if CHAT_ANALYTICS_PAYLOAD == "full" else "client")
+
+
+# dataset name ("" = any dataset) -> (loaded at, view or None if no snapshot)
+_latest: Dict[str, Tuple[float, Optional[SnapshotView]]] = {}
+_by_id: "OrderedDict[str, SnapshotView]" = OrderedDict()
+
+
+def _remember(view: SnapshotView) -> None:
+    _by_id[view.id] = view
+    _by_id.move_to_end(view.id)
+    while len(_by_id) > SNAPSHOT_CACHE_SIZE:
+        _by_id.popitem(last=False)
+
+
+async def get_latest_snapshot(
+    db: AsyncSession,
+    dataset_name: Optional[str] = None,
+) -> Optional[SnapshotView]:
+    """Latest snapshot, optionally of one dataset, from the cache or database."""
+    key = dataset_name or ""
+    cached = _latest.get(key)
+    if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    stmt = select(AnalyticsSnapshot).order_by(AnalyticsSnapshot.created_at.desc())
+    if dataset_name:
+        stmt = stmt.where(AnalyticsSnapshot.dataset_name == dataset_name)
+    result = await db.execute(stmt.limit(1))
+    snapshot = result.scalar_one_or_none()
+
+    view = None
+    if snapshot:
+        view = _by_id.get(str(snapshot.id)) or SnapshotView.from_model(snapshot)
+        _remember(view)
+    _latest[key] = (time.monotonic(), view)
+    return view
+
+
+async def get_snapshot(db: AsyncSession, snapshot_id: uuid.UUID) -> Optional[SnapshotView]:
+    """Snapshot by id (snapshots are immutable, so cached without expiry)."""
+    view = _by_id.get(str(snapshot_id))
+    if view:
+        _by_id.move_to_end(view.id)
+        return view
+
+    snapshot = await db.get(AnalyticsSnapshot, snapshot_id)
+    if not snapshot:
+        return None
+    view = SnapshotView.from_model(snapshot)
+    _remember(view)
+    return view
+
+
+def invalidate_analytics_cache() -> None:
+    """Forget the cached latest snapshots (call after storing a snapshot)."""
+    _latest.clear()
@@ -0,0 +1,372 @@
+"""Query-aware slicing of analytics data for prompts.
+
+Instead of the same static summary for every analytics question, the
+slicer puts only the rows relevant to the question into the prompt:
+
+1. ``parse_slice`` reads the time range, regions, causes, metrics and
+   grouping mentioned in the question with plain rules (no LLM call).
+   Region and cause values come from the dataset's own aggregates;
+   relative ranges ("last 6 months", "this year") are anchored at the end
+   of the dataset's date range.
+2. ``slice_rows`` reads the matching rows from a precomputed aggregate when
+   one answers the question (grouping with no filter on another
+   dimension), and otherwise queries the columnar store.
+3. ``format_slice`` renders a compact table that fits ANALYTICS_SLICE_TOKENS,
+   with per-group SAIDI/SAIFI/CAIDI when the data allows.
+
+Snapshots without a columnar store are not sliced; the static summary is
+used for them as before.
+"""
+import asyncio
+import os
+import re
+from calendar import month_abbr, month_name
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from backend.services.analytics_cache import SnapshotView
+from backend.services.analytics_store import (
+    AnalyticsQueryError,
+    query_dataset,
+    read_aggregate,
+    resolve_store_path,
+)
+from backend.services.chunking import count_tokens
+
+# Token budget of the sliced table
+ANALYTICS_SLICE_TOKENS = int(os.getenv("ANALYTICS_SLICE_TOKENS", "600"))
+
+_MONTHS = {name.lower(): i for i, name in enumerate(month_name) if name}
+_MONTHS.update({abbr.lower(): i for i, abbr in enumerate(month_abbr) if abbr})
+_MONTH_PATTERN = "|".join(sorted(_MONTHS, key=len, reverse=True))
+
+_QUARTER_RE = re.compile(r"\bq([1-4])\s*(?:of\s*)?((?:19|20)\d{2})\b")
+_MONTH_YEAR_RE = re.compile(rf"\b({_MONTH_PATTERN})\.?\s+((?:19|20)\d{{2}})\b")
+_YEAR_RE = re.compile(r"\b((?:19|20)\d{2})\b")
+_TRAILING_RE = re.compile(r"\b(?:last|past|previous)\s+(\d+\s+)?(month|quarter|year)s?\b")
+_SINCE_RE = re.compile(rf"\bsince\s+(?:({_MONTH_PATTERN})\.?\s+)?((?:19|20)\d{{2}})\b")
+
+_GROUP_WORDS = {
+    "month": ("by month", "monthly", "per month", "each month", "trend", "over time", "month by month", "timeline"),
+    "region": ("by region", "per region", "regions", "regional", "which region", "where"),
+    "cause": ("by cause", "causes", "cause", "why", "reasons", "caused"),
+}
+
+_METRIC_WORDS = {
+    "saidi": ("saidi",),
+    "saifi": ("saifi",),
+    "caidi": ("caidi",),
+    "customers": ("customer", "affected"),
+    "customer_hours": ("duration", "hours", "minutes", "customer-hours", "how long"),
+    "events": ("outage", "events", "interruptions", "incidents", "faults", "how many", "number of", "count"),
+}
+
+# Words too generic to identify a measure column
+_STOPWORDS = {"the", "and", "per", "total", "count", "number", "value", "amount", "date", "time"}
+
+
+@dataclass
+class SliceSpec:
+    """What a question asks of a dataset."""
+    start: Optional[date] = None  # inclusive
+    end: Optional[date] = None  # exclusive
+    period: Optional[str] = None
+    regions: List[str] = field(default_factory=list)
+    causes: List[str] = field(default_factory=list)
+    metrics: List[str] = field(default_factory=list)
+    measures: List[str] = field(default_factory=list)
+    group_by: Optional[str] = None  # "month", "region" or "cause"
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _parse_anchor(payload: dict) -> Optional[date]:
+    value = (payload.get("date_range") or {}).get("max")
+    try:
+        return datetime.fromisoformat(str(value)).date() if value else None
+    except ValueError:
+        return None
+
+
+def _parse_period(text: str, anchor: Optional[date]) -> Tuple[Optional[date], Optional[date], Optional[str]]:
+    """Time range mentioned in lowercased text: (start, end, label)."""
+    if m := _QUARTER_RE.search(text):
+        start = date(int(m.group(2)), 3 * int(m.group(1)) - 2, 1)
+        return start, _add_months(start, 3), f"Q{m.group(1)} {m.group(2)}"
+
+    if m := _SINCE_RE.search(text):
+        start = date(int(m.group(2)), _MONTHS[m.group(1)] if m.group(1) else 1, 1)
+        return start, None, f"since {start:%b %Y}"
+
+    months = [(int(y), _MONTHS[name]) for name, y in _MONTH_YEAR_RE.findall(text)]
+    if months:
+        first, last = min(months), max(months)
+        start = date(first[0], first[1], 1)
+        end = _add_months(date(last[0], last[1], 1), 1)
+        label = f"{start:%b %Y}" if first == last else f"{start:%b %Y} to {date(*last, 1):%b %Y}"
+        return start, end, label
+
+    years = sorted({int(y) for y in _YEAR_RE.findall(text)})
+    if years:
+        label = str(years[0]) if len(years) == 1 else f"{years[0]} to {years[-1]}"
+        return date(years[0], 1, 1), date(years[-1] + 1, 1, 1), label
+
+    if anchor:
+        if m := _TRAILING_RE.search(text):
+            count = int(m.group(1) or 1)
+            months_back = count * {"month": 1, "quarter": 3, "year": 12}[m.group(2)]
+            end = _add_months(date(anchor.year, anchor.month, 1), 1)
+            return _add_months(end, -months_back), end, m.group(0)
+        if "this year" in text:
+            return date(anchor.year, 1, 1), date(anchor.year + 1, 1, 1), str(anchor.year)
+
+    return None, None, None
+
+
+def _mentioned(text: str, values: List[Any]) -> List[str]:
+    found = []
+    for value in values:
+        if value is None:
+            continue
+        label = str(value)
+        pattern = re.escape(label.lower()).replace("_", "[ _]")
+        if re.search(rf"\b{pattern}\b", text):
+            found.append(label)
+    return found
+
+
+def _measure_words(column: str) -> List[str]:
+    return [w for w in re.split(r"[^a-z0-9]+", column.lower()) if len(w) > 2 and w not in _STOPWORDS]
+
+
+def parse_slice(question: str, payload: dict, vocab: Dict[str, List[Any]]) -> SliceSpec:
+    """Parse the slice of a dataset a question refers to.
+
+    Args:
+        question: User question
+        payload: Full snapshot payload (with its ``store`` entry)
+        vocab: Known ``region`` and ``cause`` values of the dataset
+
+    Returns:
+        SliceSpec; empty fields mean "not mentioned"
+    """
+    text = question.lower()
+    store = payload.get("store") or {}
+    roles = store.get("roles", {})
+    spec = SliceSpec()
+
+    if roles.get("date"):
+        spec.start, spec.end, spec.period = _parse_period(text, _parse_anchor(payload))
+    spec.regions = _mentioned(text, vocab.get("region", []))
+    spec.causes = _mentioned(text, vocab.get("cause", []))
+
+    for metric, words in _METRIC_WORDS.items():
+        if any(w in text for w in words):
+            spec.metrics.append(metric)
+    has_customers = bool(roles.get("customers"))
+    has_hours = has_customers and bool(roles.get("duration"))
+    available = {"events", "customers", "saifi"} if has_customers else {"events"}
+    if has_hours:
+        available |= {"customer_hours", "saidi", "caidi"}
+    spec.metrics = [m for m in spec.metrics if m in available] or ["events"]
+    if "events" not in spec.metrics:
+        spec.metrics.insert(0, "events")
+    spec.measures = [
+        m for m in store.get("measures", [])
+        if any(re.search(rf"\b{re.escape(w)}", text) for w in _measure_words(m))
+    ]
+
+    dimensions = [d for d in ("month", "region", "cause") if (roles.get("date") if d == "month" else roles.get(d))]
+    for dimension in dimensions:
+        if any(w in text for w in _GROUP_WORDS[dimension]):
+            spec.group_by = dimension
+            break
+    if spec.group_by is None and dimensions:
+        if len(spec.regions) > 1 and "region" in dimensions:
+            spec.group_by = "region"
+        elif len(spec.causes) > 1 and "cause" in dimensions:
+            spec.group_by = "cause"
+        elif "month" in dimensions and (spec.start is None or spec.end is None or _add_months(spec.start, 1) < spec.end):
+            spec.group_by = "month"
+        else:
+            spec.group_by = next((d for d in dimensions if d != "month"), None)
+    return spec
+
+
+def _vocab(store_dir: Any, payload: dict) -> Dict[str, List[Any]]:
+    """Region and cause values, from the precomputed aggregates."""
+    roles = (payload.get("store") or {}).get("roles", {})
+    vocab: Dict[str, List[Any]] = {}
+    for dimension in ("region", "cause"):
+        if roles.get(dimension):
+            vocab[dimension] = [row[roles[dimension]] for row in read_aggregate(store_dir, f"by_{dimension}")]
+    return vocab
+
+
+def slice_rows(store_dir: Any, payload: dict, spec: SliceSpec) -> Tuple[str, List[dict]]:
+    """Rows of the slice: (group key column, rows with ``events`` etc.)."""
+    store = payload["store"]
+    roles = store["roles"]
+    key = "month" if spec.group_by == "month" else roles.get(spec.group_by or "", None)
+
+    filters: List[Tuple[str, str, Any]] = []
+    if spec.start:
+        filters.append((roles["date"], ">=", spec.start.isoformat()))
+    if spec.end:
+        filters.append((roles["date"], "<", spec.end.isoformat()))
+    if spec.regions:
+        filters.append((roles["region"], "in", spec.regions))
+    if spec.causes:
+        filters.append((roles["cause"], "in", spec.causes))
+
+    # A precomputed aggregate answers the slice when the only filter is on
+    # its own dimension
+    filtered = {
+        "month": bool(spec.start or spec.end),
+        "region": bool(spec.regions),
+        "cause": bool(spec.causes),
+    }
+    others = [d for d, on in filtered.items() if on and d != spec.group_by]
+    if key and not others and f"by_{spec.group_by}" in store.get("aggregates", []):
+        rows = read_aggregate(store_dir, f"by_{spec.group_by}")
+        if spec.group_by == "month":
+            start = spec.start.strftime("%Y-%m") if spec.start else None
+            end = spec.end.strftime("%Y-%m") if spec.end else None
+            rows = [r for r in rows if (not start or r["month"] >= start) and (not end or r["month"] < end)]
+        elif spec.group_by == "region" and spec.regions:
+            rows = [r for r in rows if r[key] in spec.regions]
+        elif spec.group_by == "cause" and spec.causes:
+            rows = [r for r in rows if r[key] in spec.causes]
+        return key, rows
+
+    aggregates: List[Tuple[str, str]] = [("*", "count")]
+    if roles.get("customers"):
+        aggregates.append((roles["customers"], "sum"))
+        if roles.get("duration"):
+            aggregates.append(("customer_hours", "sum"))
+    for measure in spec.measures:
+        aggregates += [(measure, "sum"), (measure, "mean")]
+    result = query_dataset(
+        store_dir,
+        filters=filters,
+        group_by=[key] if key else None,
+        aggregates=aggregates,
+        limit=10_000,
+    )
+    rows = [{("events" if k == "count" else k): v for k, v in row.items()} for row in result["rows"]]
+    return key, rows
+
+
+def _fmt(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:,.0f}" if abs(value) >= 1000 else f"{value:.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+def format_slice(
+    key: Optional[str],
+    rows: List[dict],
+    payload: dict,
+    spec: SliceSpec,
+    max_tokens: int = ANALYTICS_SLICE_TOKENS,
+) -> str:
+    """Render slice rows as a compact table within a token budget."""
+    roles = payload["store"]["roles"]
+    customers_col = roles.get("customers")
+    served = payload.get("customers_served")
+    total_events = sum(r.get("events") or 0 for r in rows)
+
+    columns: List[Tuple[str, Any]] = []
+    if key:
+        columns.append(("Month" if key == "month" else key, lambda r: r.get(key)))
+    columns.append(("Events", lambda r: r.get("events")))
+    if key and total_events:
+        columns.append(("Share %", lambda r: round(100 * (r.get("events") or 0) / total_events, 1)))
+    if "customers" in spec.metrics or "saifi" in spec.metrics:
+        columns.append(("Customers", lambda r: r.get(f"{customers_col}_sum")))
+    if "customer_hours" in spec.metrics or "saidi" in spec.metrics:
+        columns.append(("Customer-hours", lambda r: r.get("customer_hours_sum")))
+    if "saidi" in spec.metrics and served:
+        columns.append(("SAIDI h", lambda r: (r.get("customer_hours_sum") or 0) / served))
+    if "saifi" in spec.metrics and served:
+        columns.append(("SAIFI", lambda r: (r.get(f"{customers_col}_sum") or 0) / served))
+    if "caidi" in spec.metrics:
+        columns.append((
+            "CAIDI h",
+            lambda r: (r.get("customer_hours_sum") or 0) / r[f"{customers_col}_sum"]
+            if r.get(f"{customers_col}_sum") else None,
+        ))
+    for measure in spec.measures:
+        columns.append((f"{measure} sum", lambda r, m=measure: r.get(f"{m}_sum")))
+        columns.append((f"{measure} avg", lambda r, m=measure: r.get(f"{m}_mean")))
+
+    described = []
+    if spec.period:
+        described.append(f"period {spec.period}")
+    if spec.regions:
+        described.append(f"{roles['region']} in {', '.join(spec.regions)}")
+    if spec.causes:
+        described.append(f"{roles['cause']} in {', '.join(spec.causes)}")
+    if key:
+        described.append(f"by {'month' if key == 'month' else key}")
+    header = f"Slice: {'; '.join(described) or 'all records'} ({total_events:,} events)"
+    if not rows:
+        return f"{header}\nNo matching records."
+
+    lines = [header, " | ".join(name for name, _ in columns)]
+    budget = max_tokens - count_tokens("\n".join(lines))
+    # Keep the most recent months, or the largest groups
+    ordered = list(reversed(rows)) if key == "month" else rows
+    body: List[str] = []
+    for row in ordered:
+        line = " | ".join(_fmt(getter(row)) for _, getter in columns)
+        cost = count_tokens(line) + 1
+        if cost > budget:
+            break
+        budget -= cost
+        body.append(line)
+    if key == "month":
+        body.reverse()
+    lines += body
+    if len(body) < len(rows):
+        lines.append(f"({len(rows) - len(body)} more rows omitted)")
+    return "\n".join(lines)
+
+
+def slice_analytics(snapshot: SnapshotView, question: str, max_tokens: int = ANALYTICS_SLICE_TOKENS) -> Optional[str]:
+    """Table of the analytics rows relevant to a question, or None.
+
+    Returns None when the snapshot has no columnar store or slicing fails,
+    so callers fall back to the static summary.
+    """
+    payload = snapshot.payload
+    if not snapshot.store_path or not payload.get("store"):
+        return None
+    store_dir = resolve_store_path(snapshot.store_path)
+    try:
+        spec = parse_slice(question, payload, _vocab(store_dir, payload))
+        key, rows = slice_rows(store_dir, payload, spec)
+        if key == "month" and rows:
+            for row in rows:
+                row["month"] = datetime.strptime(row["month"], "%Y-%m").strftime("%b %Y")
+        return format_slice(key, rows, payload, spec, max_tokens)
+    except (AnalyticsQueryError, OSError, KeyError) as e:
+        logger.warning(f"Analytics slicing failed for snapshot {snapshot.id}: {e}")
+        return None
+
+
+async def analytics_prompt_context(snapshot: SnapshotView, question: str) -> dict:
+    """Prompt analytics dict for a question, with its ``slice`` when available."""
+    context = snapshot.prompt_context()
+    context["slice"] = await asyncio.to_thread(slice_analytics, snapshot, question)
+    return context
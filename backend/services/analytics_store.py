@@ -0,0 +1,521 @@
+"""Columnar store and aggregation API for analytics datasets.
+
+Each ingested CSV/XLSX dataset is converted once into a directory of
+zstd-compressed Parquet files under ``STORAGE_PATH/analytics/<id>``:
+
+- ``data.parquet``: every row, with cleaned column names and one type per
+  column (the detected date column is stored as a timestamp)
+- ``by_month.parquet``, ``by_region.parquet``, ``by_cause.parquet``:
+  precomputed group-by aggregates (event count, customers affected,
+  customer-hours interrupted and sum/mean of the numeric measures)
+
+Region, cause, customers and duration columns are recognised by name. The
+headline figures are also written into the snapshot payload using the
+keys the prompt builder already renders (``monthly_trend``,
+``top_regions``, ``outage_causes``, ``total_customers_affected`` and the
+SAIDI/SAIFI/CAIDI reliability indices), so chat context benefits without
+reading the store.
+
+``query_dataset`` answers filter and group-by queries over ``data.parquet``
+in-process with pyarrow. Files are memory-mapped and the decoded tables are
+kept in a small LRU, so repeated queries on a dataset skip disk and
+decompression entirely.
+
+Conversion runs in the profiling process pool together with profiling
+(``build_dataset_async``); pyarrow and pandas are imported lazily.
+"""
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from backend.services.data_profile import (
+    PROFILE_CHUNK_ROWS,
+    iter_chunks,
+    profile_dataset,
+    run_in_profile_pool,
+)
+
+STORAGE_PATH = Path(os.getenv("STORAGE_PATH", "storage"))
+ANALYTICS_STORE_PATH = STORAGE_PATH / "analytics"
+
+# Customers served by the network, for SAIDI/SAIFI when the data has no
+# customers-served column (unset = only CAIDI is computed)
+RELIABILITY_CUSTOMERS_SERVED = int(os.getenv("RELIABILITY_CUSTOMERS_SERVED", "0")) or None
+
+# Decoded datasets kept in memory per process
+ANALYTICS_TABLE_CACHE_SIZE = int(os.getenv("ANALYTICS_TABLE_CACHE_SIZE", "8"))
+
+DATA_FILE = "data.parquet"
+PARQUET_COMPRESSION = "zstd"
+METADATA_KEY = b"sisuiq.analytics"
+
+# Name fragments identifying dimension and reliability columns
+REGION_HINTS = ("region", "area", "zone", "district")
+CAUSE_HINTS = ("cause", "reason")
+CUSTOMERS_SERVED_HINTS = ("customers_served", "customers served", "total_customers", "total customers")
+CUSTOMERS_HINTS = ("customer",)
+DURATION_HINTS = ("duration", "minutes", "hours", "hrs")
+
+# Measures aggregated per group and payload limits
+MAX_MEASURES = 5
+MONTHLY_TREND_MONTHS = 24
+TOP_REGIONS = 10
+
+AGGREGATES = ("by_month", "by_region", "by_cause")
+AGGREGATE_FUNCTIONS = ("count", "count_distinct", "sum", "mean", "min", "max")
+FILTER_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in")
+
+
+class AnalyticsQueryError(ValueError):
+    """Raised for queries the dataset can't answer (unknown column, operator...)."""
+
+
+# --- Conversion ---
+
+
+def _find_column(columns: Sequence[str], hints: Sequence[str], exclude: Sequence[str] = ()) -> Optional[str]:
+    for column in columns:
+        lower = column.lower()
+        if any(h in lower for h in hints) and not any(e in lower for e in exclude):
+            return column
+    return None
+
+
+def detect_roles(payload: dict) -> Dict[str, Optional[str]]:
+    """Pick the date, region, cause and reliability columns of a dataset."""
+    types = payload["column_types"]
+    categorical = [c for c, t in types.items() if t == "object"]
+    numeric = [c for c, t in types.items() if t in ("int64", "float64")]
+    served = _find_column(numeric, CUSTOMERS_SERVED_HINTS)
+    return {
+        "date": (payload.get("date_range") or {}).get("column"),
+        "region": _find_column(categorical, REGION_HINTS),
+        "cause": _find_column(categorical, CAUSE_HINTS),
+        "customers": _find_column(numeric, CUSTOMERS_HINTS, exclude=("served", "total")),
+        "customers_served": served,
+        "duration": _find_column(numeric, DURATION_HINTS),
+    }
+
+
+def _arrow_type(dtype: str) -> Any:
+    import pyarrow as pa
+
+    return {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "datetime64[ns]": pa.timestamp("ns"),
+    }.get(dtype, pa.string())
+
+
+def _to_timestamps(series: Any) -> Any:
+    import pandas as pd
+
+    try:
+        values = pd.to_datetime(series, errors="coerce")
+    except (TypeError, ValueError):
+        values = pd.to_datetime(series, errors="coerce", utc=True)
+    if getattr(values.dt, "tz", None) is not None:
+        values = values.dt.tz_convert(None)
+    return values
+
+
+def _coerce_chunk(chunk: Any, names: Dict[str, str], types: Dict[str, str], date_column: Optional[str]) -> Any:
+    """Select, rename and cast one chunk to the dataset's final column types."""
+    import pandas as pd
+
+    chunk = chunk[list(names)].rename(columns=names)
+    for column, dtype in types.items():
+        series = chunk[column]
+        if column == date_column or dtype == "datetime64[ns]":
+            chunk[column] = _to_timestamps(series)
+        elif dtype == "int64":
+            chunk[column] = series.astype("int64")
+        elif dtype == "float64":
+            chunk[column] = pd.to_numeric(series, errors="coerce").astype("float64")
+        elif dtype == "bool":
+            chunk[column] = series.astype(bool)
+        else:
+            chunk[column] = series.map(str).where(series.notna(), None)
+    return chunk
+
+
+def _write_data(src: Path, ext: str, dest: Path, profile: Any, payload: dict, roles: dict, chunk_rows: int) -> None:
+    """Second pass over the source: write ``data.parquet`` chunk by chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = profile.column_names()
+    types = payload["column_types"]
+    date_column = roles["date"]
+    schema = pa.schema(
+        [
+            pa.field(c, pa.timestamp("ns") if c == date_column else _arrow_type(t))
+            for c, t in types.items()
+        ],
+        metadata={METADATA_KEY: json.dumps({"roles": roles}).encode()},
+    )
+    with pq.ParquetWriter(dest, schema, compression=PARQUET_COMPRESSION) as writer:
+        for chunk in iter_chunks(src, ext, chunk_rows):
+            chunk = _coerce_chunk(chunk, names, types, date_column)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _duration_hours(column: str) -> float:
+    """Hours per unit of a duration column (minutes unless named in hours)."""
+    lower = column.lower()
+    return 1.0 if "hour" in lower or "hrs" in lower else 1.0 / 60
+
+
+def _with_derived(table: Any, roles: dict) -> Any:
+    """Add the month and customer-hours columns used by the aggregates."""
+    import pyarrow.compute as pc
+
+    if roles["date"] and "month" not in table.column_names:
+        table = table.append_column("month", pc.strftime(table[roles["date"]], format="%Y-%m"))
+    if roles["customers"] and roles["duration"] and "customer_hours" not in table.column_names:
+        hours = pc.multiply(
+            pc.cast(table[roles["duration"]], "float64"),
+            _duration_hours(roles["duration"]),
+        )
+        table = table.append_column(
+            "customer_hours",
+            pc.multiply(pc.cast(table[roles["customers"]], "float64"), hours),
+        )
+    return table
+
+
+def _measures(payload: dict, roles: dict) -> List[str]:
+    skip = {roles["customers"], roles["customers_served"], roles["duration"]}
+    numeric = [c for c, t in payload["column_types"].items() if t in ("int64", "float64")]
+    return [c for c in numeric if c not in skip][:MAX_MEASURES]
+
+
+def _group(table: Any, key: str, roles: dict, measures: List[str]) -> Any:
+    """Aggregate one dimension: events, customers, customer-hours, measures."""
+    aggregations: List[Tuple[Any, str]] = [([], "count_all")]
+    if roles["customers"]:
+        aggregations.append((roles["customers"], "sum"))
+    if "customer_hours" in table.column_names:
+        aggregations.append(("customer_hours", "sum"))
+    for measure in measures:
+        aggregations += [(measure, "sum"), (measure, "mean")]
+
+    grouped = table.filter(table[key].is_valid()).group_by(key).aggregate(aggregations)
+    grouped = grouped.rename_columns(
+        ["events" if c == "count_all" else c for c in grouped.column_names]
+    )
+    order = [(key, "ascending")] if key == "month" else [("events", "descending")]
+    return grouped.sort_by(order)
+
+
+def _reliability(table: Any, roles: dict) -> dict:
+    """SAIFI/SAIDI (per customer served, SAIDI in hours) and CAIDI (hours)."""
+    import pyarrow.compute as pc
+
+    if not roles["customers"]:
+        return {}
+    customers = pc.sum(table[roles["customers"]]).as_py() or 0
+    result: dict = {"total_customers_affected": int(customers)}
+
+    served = RELIABILITY_CUSTOMERS_SERVED
+    if roles["customers_served"]:
+        served = pc.max(table[roles["customers_served"]]).as_py() or served
+
+    if "customer_hours" in table.column_names:
+        customer_hours = pc.sum(table["customer_hours"]).as_py() or 0.0
+        if customers:
+            result["caidi"] = round(customer_hours / customers, 2)
+        if served:
+            result["saidi"] = round(customer_hours / served, 2)
+    if served:
+        result["saifi"] = round(customers / served, 2)
+        result["customers_served"] = int(served)
+    return result
+
+
+def _headline(aggregates: Dict[str, Any], total: int) -> dict:
+    """Payload keys rendered by the prompt builder."""
+    from datetime import datetime
+
+    headline: dict = {"total_events": total}
+    if "by_month" in aggregates:
+        months = aggregates["by_month"].to_pylist()[-MONTHLY_TREND_MONTHS:]
+        headline["monthly_trend"] = [
+            {"month": datetime.strptime(m["month"], "%Y-%m").strftime("%b %Y"), "events": m["events"]}
+            for m in months
+        ]
+    if "by_region" in aggregates:
+        regions = aggregates["by_region"]
+        key = regions.column_names[0]
+        headline["top_regions"] = [
+            {"region": r[key], "events": r["events"], "percentage": round(100 * r["events"] / total, 1)}
+            for r in regions.slice(0, TOP_REGIONS).to_pylist()
+        ]
+    if "by_cause" in aggregates:
+        causes = aggregates["by_cause"]
+        key = causes.column_names[0]
+        headline["outage_causes"] = {
+            r[key]: round(100 * r["events"] / total, 1) for r in causes.to_pylist()
+        }
+    return headline
+
+
+def build_dataset(src: Path, ext: str, store_dir: Path, chunk_rows: int = PROFILE_CHUNK_ROWS) -> dict:
+    """Profile a CSV/XLSX file and convert it into a columnar store.
+
+    Args:
+        src: Source file
+        ext: ".csv" or ".xlsx"
+        store_dir: Directory for the Parquet files (created)
+        chunk_rows: Rows per chunk
+
+    Returns:
+        Snapshot payload: the profile summary plus headline aggregates and a
+        ``store`` entry describing the queryable columns. If conversion
+        fails, the plain profile payload is returned and no store is left.
+    """
+    import pyarrow.parquet as pq
+
+    profile = profile_dataset(src, ext, chunk_rows)
+    payload = profile.to_payload()
+    if not payload["row_count"]:
+        return payload
+
+    roles = detect_roles(payload)
+    try:
+        store_dir.mkdir(parents=True, exist_ok=True)
+        data_path = store_dir / DATA_FILE
+        _write_data(src, ext, data_path, profile, payload, roles, chunk_rows)
+
+        table = _with_derived(pq.read_table(data_path, memory_map=True), roles)
+        measures = _measures(payload, roles)
+        aggregates = {}
+        for name, key in (("by_month", "month" if roles["date"] else None),
+                          ("by_region", roles["region"]),
+                          ("by_cause", roles["cause"])):
+            if key:
+                aggregates[name] = _group(table, key, roles, measures)
+                pq.write_table(aggregates[name], store_dir / f"{name}.parquet", compression=PARQUET_COMPRESSION)
+
+        if aggregates or roles["customers"]:
+            payload.update(_headline(aggregates, payload["row_count"]))
+            payload.update(_reliability(table, roles))
+        payload["store"] = {
+            "columns": payload["columns"],
+            "roles": {k: v for k, v in roles.items() if v},
+            "measures": measures,
+            "aggregates": sorted(aggregates),
+            "size_bytes": sum(p.stat().st_size for p in store_dir.iterdir()),
+        }
+    except Exception as e:
+        logger.warning(f"Columnar conversion of {src.name} failed: {e}")
+        shutil.rmtree(store_dir, ignore_errors=True)
+    return payload
+
+
+async def build_dataset_async(src: Path, ext: str, store_dir: Path) -> dict:
+    """Run ``build_dataset`` in the profiling process pool."""
+    return await run_in_profile_pool(build_dataset, src, ext, store_dir)
+
+
+# --- Query API ---
+
+
+def resolve_store_path(store_path: str) -> Path:
+    """Absolute store directory of a snapshot's ``store_path``."""
+    return STORAGE_PATH.parent / store_path
+
+_tables: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def _load_table(store_dir: Path, name: str = DATA_FILE) -> Any:
+    """Memory-map a Parquet file of a store, caching the decoded table."""
+    import pyarrow.parquet as pq
+
+    path = store_dir / name
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        raise AnalyticsQueryError(f"No columnar data at {store_dir}") from None
+
+    with _tables_lock:
+        if key in _tables:
+            _tables.move_to_end(key)
+            return _tables[key]
+
+    table = pq.read_table(path, memory_map=True)
+    with _tables_lock:
+        _tables[key] = table
+        while len(_tables) > ANALYTICS_TABLE_CACHE_SIZE:
+            _tables.popitem(last=False)
+    return table
+
+
+def _roles(table: Any) -> dict:
+    metadata = table.schema.metadata or {}
+    return json.loads(metadata.get(METADATA_KEY, b"{}")).get("roles", {})
+
+
+def _column(table: Any, name: str) -> Any:
+    if name not in table.column_names:
+        raise AnalyticsQueryError(f"Unknown column: {name}")
+    return table[name]
+
+
+def _filter_value(value: Any, arrow_type: Any) -> Any:
+    import pyarrow as pa
+
+    if pa.types.is_timestamp(arrow_type) and isinstance(value, str):
+        return pa.scalar(value).cast(arrow_type)
+    return value
+
+
+def _filter_mask(table: Any, filters: Sequence[Tuple[str, str, Any]]) -> Any:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    operators = {
+        "==": pc.equal, "!=": pc.not_equal,
+        "<": pc.less, "<=": pc.less_equal,
+        ">": pc.greater, ">=": pc.greater_equal,
+    }
+    mask = None
+    for column, op, value in filters:
+        values = _column(table, column)
+        if op == "in":
+            if not isinstance(value, (list, tuple)):
+                raise AnalyticsQueryError("'in' filters take a list of values")
+            options = pa.array([_filter_value(v, values.type) for v in value], type=values.type)
+            condition = pc.is_in(values, value_set=options)
+        elif op in operators:
+            condition = operators[op](values, _filter_value(value, values.type))
+        else:
+            raise AnalyticsQueryError(f"Unknown filter operator: {op}")
+        mask = condition if mask is None else pc.and_kleene(mask, condition)
+    return mask
+
+
+def query_dataset(
+    store_dir: Path,
+    filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+    group_by: Optional[Sequence[str]] = None,
+    aggregates: Optional[Sequence[Tuple[str, str]]] = None,
+    order_by: Optional[str] = None,
+    descending: bool = True,
+    limit: int = 100,
+) -> dict:
+    """Filter and aggregate a dataset's rows.
+
+    Args:
+        store_dir: Dataset store directory
+        filters: ``(column, operator, value)`` triples, combined with AND;
+            operators are ==, !=, <, <=, >, >= and in. Timestamp columns
+            accept ISO date strings.
+        group_by: Columns to group by; ``month`` groups by the month of the
+            dataset's date column. ``customer_hours`` (customers affected
+            times duration in hours) can be aggregated like a column.
+        aggregates: ``(column, function)`` pairs (count, count_distinct,
+            sum, mean, min, max); defaults to a row count. Result columns
+            are named ``<column>_<function>``, or ``count`` for ``("*", "count")``.
+        order_by: Result column to sort by (default: first aggregate, or
+            the group keys when grouping by month only)
+        descending: Sort direction
+        limit: Maximum result rows
+
+    Returns:
+        Dict with ``columns``, ``rows`` (list of dicts), ``matched_rows``
+        (rows passing the filters) and ``elapsed_ms``
+
+    Raises:
+        AnalyticsQueryError: For unknown columns, operators or functions
+    """
+    import pyarrow.compute as pc
+
+    start = time.perf_counter()
+    table = _load_table(store_dir)
+    group_by = list(group_by or [])
+    aggregates = list(aggregates or [("*", "count")])
+
+    if filters:
+        table = table.filter(_filter_mask(table, filters))
+
+    derived = [c for c in ("month", "customer_hours") if c not in table.column_names]
+    referenced = set(group_by) | {column for column, _ in aggregates}
+    if referenced & set(derived):
+        roles = {k: None for k in ("date", "customers", "duration")}
+        roles.update(_roles(table))
+        table = _with_derived(table, roles)
+
+    specs: List[Tuple[Any, str]] = []
+    names: List[str] = []
+    for column, function in aggregates:
+        if function not in AGGREGATE_FUNCTIONS:
+            raise AnalyticsQueryError(f"Unknown aggregate function: {function}")
+        if column == "*":
+            if function != "count":
+                raise AnalyticsQueryError("'*' only supports count")
+            specs.append(([], "count_all"))
+            names.append("count")
+        else:
+            _column(table, column)
+            specs.append((column, function))
+            names.append(f"{column}_{function}")
+
+    for key in group_by:
+        _column(table, key)
+
+    if group_by:
+        result = table.group_by(group_by).aggregate(specs)
+        result = result.rename_columns(
+            ["count" if c == "count_all" else c for c in result.column_names]
+        ).select(group_by + names)
+    else:
+        import pyarrow as pa
+
+        values = []
+        for column, function in specs:
+            if function == "count_all":
+                values.append(table.num_rows)
+            else:
+                values.append(getattr(pc, function)(table[column]).as_py())
+        result = pa.table({name: [value] for name, value in zip(names, values)})
+
+    if order_by is None and group_by:
+        order_by = "month" if group_by == ["month"] else names[0]
+        if order_by == "month":
+            descending = False
+    if order_by:
+        if order_by not in result.column_names:
+            raise AnalyticsQueryError(f"Unknown order column: {order_by}")
+        result = result.sort_by([(order_by, "descending" if descending else "ascending")])
+
+    rows = result.slice(0, limit).to_pylist()
+    return {
+        "columns": result.column_names,
+        "rows": rows,
+        "matched_rows": table.num_rows,
+        "groups": result.num_rows,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+async def query_dataset_async(store_dir: Path, **kwargs: Any) -> dict:
+    """Run ``query_dataset`` in a worker thread (pyarrow releases the GIL)."""
+    return await asyncio.to_thread(query_dataset, store_dir, **kwargs)
+
+
+def read_aggregate(store_dir: Path, name: str) -> List[dict]:
+    """Rows of a precomputed aggregate (by_month, by_region, by_cause)."""
+    if name not in AGGREGATES:
+        raise AnalyticsQueryError(f"Unknown aggregate: {name}")
+    return _load_table(store_dir, f"{name}.parquet").to_pylist()
@@ -0,0 +1,658 @@
+"""Bulk ingestion of whole directories and archives.
+
+A bulk request (a server-side directory or an uploaded zip/tar archive)
+becomes one ``IngestionBatch`` plus one ingestion job per new PDF:
+
+- an optional manifest (``manifest.json`` or ``manifest.csv`` next to the
+  PDFs, or an explicit path) sets name, type and source per file; files
+  not listed fall back to the request defaults
+- each PDF is copied into ``STORAGE_PATH/docs`` while its SHA-256 is
+  computed, in one streaming pass; files without a PDF signature or larger
+  than MAX_PDF_UPLOAD_MB are skipped
+- an archive is rejected once its PDFs decompress to more than
+  MAX_ARCHIVE_EXTRACTED_MB, and manifests are limited to MAX_MANIFEST_BYTES
+- files identical to an indexed document, a queued or running job, or an
+  earlier file of the same batch are skipped; files whose job failed
+  resume that job instead
+- workers run at most ``max_parallel`` jobs of a batch at once (see
+  ``lease_job``), so a large batch leaves room for interactive uploads
+
+Server-side directories must lie under BULK_INGEST_ROOT; the HTTP endpoint
+is disabled when it is unset. The ``backend.ingest_bulk`` CLI is not
+restricted, since it already runs with shell access.
+"""
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+import tarfile
+import uuid
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+
+from backend.db import get_db_context
+from backend.models import (
+    Document,
+    DocumentSource,
+    DocumentStatus,
+    DocumentType,
+    IngestionBatch,
+    IngestionJobRecord,
+)
+from backend.services.ingestion_jobs import JobStatus, find_unfinished_jobs, wake_workers
+from backend.services.job_events import queue_job_events
+from backend.services.uploads import (
+    MAX_PDF_UPLOAD_BYTES,
+    MIB,
+    SavedUpload,
+    UploadError,
+    check_signature,
+)
+
+STORAGE_PATH = Path(os.getenv("STORAGE_PATH", "storage"))
+DOCS_PATH = STORAGE_PATH / "docs"
+
+# Server-side directories allowed for bulk ingestion over HTTP (unset = disabled)
+BULK_INGEST_ROOT = os.getenv("BULK_INGEST_ROOT")
+
+# Default jobs of one batch running at once
+BULK_INGEST_PARALLELISM = int(os.getenv("BULK_INGEST_PARALLELISM", "2"))
+
+# Decompressed PDF bytes staged from one archive
+MAX_ARCHIVE_EXTRACTED_BYTES = int(os.getenv("MAX_ARCHIVE_EXTRACTED_MB", "8192")) * MIB
+
+MANIFEST_NAMES = ("manifest.json", "manifest.csv")
+MAX_MANIFEST_BYTES = 4 * MIB
+COPY_CHUNK_BYTES = MIB
+
+
+class BulkIngestError(Exception):
+    """Raised when a bulk ingestion request is invalid."""
+    pass
+
+
+@dataclass
+class BulkFile:
+    """One PDF of a bulk request, staged under DOCS_PATH."""
+    relative_path: str
+    name: str
+    doc_type: str
+    source: str
+    file_path: Path
+    file_hash: str
+
+
+# --- Manifest ---
+
+
+def parse_manifest(content: str, filename: str) -> Dict[str, Dict[str, str]]:
+    """Parse a manifest into per-file settings keyed by relative path.
+
+    JSON manifests are a list of objects; CSV manifests have a header row.
+    Each entry has ``file`` (path relative to the directory or archive
+    root) and optionally ``name``, ``type`` (or ``doc_type``) and ``source``.
+
+    Raises:
+        BulkIngestError: If the manifest is malformed or has invalid values
+    """
+    try:
+        if filename.lower().endswith(".json"):
+            entries = json.loads(content)
+            if isinstance(entries, dict):
+                entries = entries.get("files", [])
+        else:
+            entries = list(csv.DictReader(io.StringIO(content)))
+    except (ValueError, csv.Error) as e:
+        raise BulkIngestError(f"Invalid manifest {filename}: {e}")
+
+    manifest: Dict[str, Dict[str, str]] = {}
+    errors: List[str] = []
+    for i, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or not entry.get("file"):
+            errors.append(f"entry {i}: missing 'file'")
+            continue
+        settings = {}
+        if entry.get("name"):
+            settings["name"] = str(entry["name"]).strip()
+        doc_type = entry.get("type") or entry.get("doc_type")
+        if doc_type:
+            try:
+                settings["doc_type"] = DocumentType(str(doc_type).strip()).value
+            except ValueError:
+                errors.append(f"entry {i}: invalid type '{doc_type}'")
+        if entry.get("source"):
+            try:
+                settings["source"] = DocumentSource(str(entry["source"]).strip()).value
+            except ValueError:
+                errors.append(f"entry {i}: invalid source '{entry['source']}'")
+        manifest[str(PurePosixPath(str(entry["file"]).strip()))] = settings
+
+    if errors:
+        raise BulkIngestError(f"Invalid manifest {filename}: {'; '.join(errors)}")
+    return manifest
+
+
+def _settings_for(
+    relative_path: str,
+    manifest: Dict[str, Dict[str, str]],
+    doc_type: str,
+    source: str,
+) -> Dict[str, str]:
+    """Manifest settings for a file (by path, then basename) over defaults."""
+    entry = manifest.get(relative_path) or manifest.get(PurePosixPath(relative_path).name) or {}
+    return {
+        "name": entry.get("name") or PurePosixPath(relative_path).name,
+        "doc_type": entry.get("doc_type", doc_type),
+        "source": entry.get("source", source),
+    }
+
+
+# --- Staging ---
+
+
+def _discard(files: List[BulkFile]) -> None:
+    for f in files:
+        f.file_path.unlink(missing_ok=True)
+
+
+def _too_large(max_bytes: int) -> UploadError:
+    return UploadError(f"file exceeds the maximum size of {max_bytes // MIB} MB", status_code=413)
+
+
+def _stage_stream(stream: IO[bytes], max_bytes: int = MAX_PDF_UPLOAD_BYTES) -> Optional[SavedUpload]:
+    """Copy a PDF stream into DOCS_PATH, hashing it on the way.
+
+    Copying stops as soon as more than ``max_bytes`` were read, so a
+    compressed archive member can't expand beyond it.
+
+    Returns:
+        The staged file, or None if the content is not a PDF
+
+    Raises:
+        UploadError: If the file is larger than ``max_bytes``
+    """
+    head = stream.read(COPY_CHUNK_BYTES)
+    try:
+        check_signature(head, ".pdf")
+    except UploadError:
+        return None
+
+    DOCS_PATH.mkdir(parents=True, exist_ok=True)
+    dest = DOCS_PATH / f"{uuid.uuid4()}.pdf"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest, "wb") as out:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = stream.read(COPY_CHUNK_BYTES)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return SavedUpload(path=dest, size=size, sha256=digest.hexdigest())
+
+
+def _stage_directory(
+    directory: Path,
+    manifest: Dict[str, Dict[str, str]],
+    doc_type: str,
+    source: str,
+    recursive: bool,
+) -> tuple[List[BulkFile], List[dict]]:
+    pattern = "**/*" if recursive else "*"
+    files: List[BulkFile] = []
+    rejected: List[dict] = []
+    try:
+        for path in sorted(directory.glob(pattern)):
+            if not path.is_file() or path.suffix.lower() != ".pdf":
+                continue
+            relative_path = path.relative_to(directory).as_posix()
+            try:
+                with open(path, "rb") as stream:
+                    staged = _stage_stream(stream)
+            except UploadError as e:
+                rejected.append({"file": relative_path, "reason": str(e)})
+                continue
+            if staged is None:
+                rejected.append({"file": relative_path, "reason": "not a PDF"})
+                continue
+            files.append(BulkFile(
+                relative_path=relative_path,
+                file_path=staged.path,
+                file_hash=staged.sha256,
+                **_settings_for(relative_path, manifest, doc_type, source),
+            ))
+    except Exception:
+        _discard(files)
+        raise
+    return files, rejected
+
+
+def _archive_members(archive_path: Path) -> tuple[List[tuple[str, Any]], Any]:
+    """List (relative_path, member) of regular files and an opener."""
+    if zipfile.is_zipfile(archive_path):
+        archive = zipfile.ZipFile(archive_path)
+        members = [(m.filename, m) for m in archive.infolist() if not m.is_dir()]
+        return members, archive
+    try:
+        archive = tarfile.open(archive_path, "r:*")
+    except tarfile.TarError:
+        raise BulkIngestError("Archive must be a zip or (optionally compressed) tar file")
+    members = [(m.name, m) for m in archive.getmembers() if m.isfile()]
+    return members, archive
+
+
+def _open_member(archive: Any, member: Any) -> IO[bytes]:
+    if isinstance(archive, zipfile.ZipFile):
+        return archive.open(member)
+    return archive.extractfile(member)
+
+
+def _member_size(member: Any) -> int:
+    """Uncompressed size recorded in the archive (enforced again while copying)."""
+    return member.file_size if isinstance(member, zipfile.ZipInfo) else member.size
+
+
+def _read_manifest(stream: IO[bytes], name: str) -> Dict[str, Dict[str, str]]:
+    content = stream.read(MAX_MANIFEST_BYTES + 1)
+    if len(content) > MAX_MANIFEST_BYTES:
+        raise BulkIngestError(
+            f"Manifest {name} exceeds the maximum size of {MAX_MANIFEST_BYTES // MIB} MB"
+        )
+    try:
+        return parse_manifest(content.decode("utf-8"), name)
+    except UnicodeDecodeError as e:
+        raise BulkIngestError(f"Invalid manifest {name}: {e}")
+
+
+def _stage_archive(
+    archive_path: Path,
+    manifest_override: Optional[Dict[str, Dict[str, str]]],
+    doc_type: str,
+    source: str,
+) -> tuple[List[BulkFile], List[dict]]:
+    members, archive = _archive_members(archive_path)
+    with archive:
+        manifest = manifest_override or {}
+        if manifest_override is None:
+            for name, member in members:
+                if PurePosixPath(name).name in MANIFEST_NAMES and "/" not in name.strip("/"):
+                    with _open_member(archive, member) as stream:
+                        manifest = _read_manifest(stream, name)
+                    break
+
+        files: List[BulkFile] = []
+        rejected: List[dict] = []
+        budget = MAX_ARCHIVE_EXTRACTED_BYTES
+        try:
+            for name, member in sorted(members, key=lambda m: m[0]):
+                # Member paths are only used as labels; staged names are generated
+                relative_path = str(PurePosixPath(name.lstrip("/")))
+                if PurePosixPath(relative_path).suffix.lower() != ".pdf":
+                    continue
+                if _member_size(member) > MAX_PDF_UPLOAD_BYTES:
+                    rejected.append({
+                        "file": relative_path,
+                        "reason": str(_too_large(MAX_PDF_UPLOAD_BYTES)),
+                    })
+                    continue
+                max_bytes = min(MAX_PDF_UPLOAD_BYTES, budget)
+                try:
+                    with _open_member(archive, member) as stream:
+                        staged = _stage_stream(stream, max_bytes)
+                except UploadError as e:
+                    if max_bytes < MAX_PDF_UPLOAD_BYTES:
+                        raise BulkIngestError(
+                            f"Archive PDFs exceed {MAX_ARCHIVE_EXTRACTED_BYTES // MIB} MB "
+                            "when extracted"
+                        )
+                    rejected.append({"file": relative_path, "reason": str(e)})
+                    continue
+                if staged is None:
+                    rejected.append({"file": relative_path, "reason": "not a PDF"})
+                    continue
+                budget -= staged.size
+                files.append(BulkFile(
+                    relative_path=relative_path,
+                    file_path=staged.path,
+                    file_hash=staged.sha256,
+                    **_settings_for(relative_path, manifest, doc_type, source),
+                ))
+        except Exception:
+            _discard(files)
+            raise
+    return files, rejected
+
+
+# --- Batches ---
+
+
+async def _dedupe(files: List[BulkFile]) -> tuple[List[BulkFile], List[dict]]:
+    """Split staged files into new ones and skipped duplicates."""
+    hashes = list({f.file_hash for f in files})
+    async with get_db_context() as db:
+        documents = await db.execute(
+            select(Document.file_hash, Document.id).where(
+                Document.file_hash.in_(hashes),
+                Document.status == DocumentStatus.INDEXED.value,
+            )
+        )
+        existing = {h: f"document {doc_id}" for h, doc_id in documents.all()}
+    # Files already owned by a queued, running or failed (now resumed) job
+    jobs = await find_unfinished_jobs([h for h in hashes if h not in existing])
+    for h, job in jobs.items():
+        existing[h] = f"job {job.job_id}"
+
+    unique: List[BulkFile] = []
+    skipped: List[dict] = []
+    duplicates: List[BulkFile] = []
+    seen: Dict[str, str] = {}
+    for f in files:
+        duplicate_of = existing.get(f.file_hash) or seen.get(f.file_hash)
+        if duplicate_of:
+            skipped.append({"file": f.relative_path, "reason": f"duplicate of {duplicate_of}"})
+            duplicates.append(f)
+            continue
+        seen[f.file_hash] = f"file {f.relative_path}"
+        unique.append(f)
+
+    await asyncio.to_thread(_discard, duplicates)
+    return unique, skipped
+
+
+async def create_batch(
+    files: List[BulkFile],
+    name: str,
+    origin: str,
+    max_parallel: Optional[int] = None,
+    rejected: Optional[List[dict]] = None,
+) -> dict:
+    """Dedupe staged files and queue one job per new file.
+
+    Args:
+        files: Staged files
+        name: Batch name
+        origin: Directory or archive the files came from
+        max_parallel: Jobs of this batch running at once
+        rejected: Files skipped while staging, with reason
+
+    Returns:
+        Dict with batch_id, files_total, queued count and skipped files
+    """
+    unique, skipped = await _dedupe(files)
+    skipped = (rejected or []) + skipped
+    files_total = len(files) + len(rejected or [])
+    batch = IngestionBatch(
+        id=uuid.uuid4(),
+        name=name,
+        origin=origin,
+        max_parallel=max(1, max_parallel or BULK_INGEST_PARALLELISM),
+        files_total=files_total,
+        skipped=skipped,
+    )
+    records = [
+        IngestionJobRecord(
+            id=uuid.uuid4(),
+            batch_id=batch.id,
+            document_name=f.name,
+            file_path=str(f.file_path),
+            doc_type=f.doc_type,
+            source=f.source,
+            file_hash=f.file_hash,
+            status=JobStatus.QUEUED.value,
+            progress=0,
+            chunks_count=0,
+            attempts=0,
+            checkpoint={},
+            metrics={},
+        )
+        for f in unique
+    ]
+
+    try:
+        async with get_db_context() as db:
+            db.add(batch)
+            await db.flush()
+            db.add_all(records)
+            await db.flush()
+            await queue_job_events(db, [
+                {"job_id": str(r.id), "event": "stage", "stage": JobStatus.QUEUED.value,
+                 "progress": 0, "batch_id": str(batch.id)}
+                for r in records
+            ])
+    except Exception:
+        await asyncio.to_thread(_discard, unique)
+        raise
+
+    if records:
+        wake_workers()
+    logger.info(
+        f"Created ingestion batch {batch.id} ({name}): {len(records)} jobs queued, "
+        f"{len(skipped)} files skipped"
+    )
+    return {
+        "batch_id": str(batch.id),
+        "name": name,
+        "files_total": files_total,
+        "queued": len(records),
+        "skipped": skipped,
+        "max_parallel": batch.max_parallel,
+    }
+
+
+def _validate_defaults(doc_type: str, source: str) -> None:
+    try:
+        DocumentType(doc_type)
+        DocumentSource(source)
+    except ValueError as e:
+        raise BulkIngestError(str(e))
+
+
+def resolve_server_path(path: str, restrict_to_root: bool = True) -> Path:
+    """Resolve a server-side path, enforcing BULK_INGEST_ROOT.
+
+    Raises:
+        BulkIngestError: If bulk directory ingestion is disabled or the path
+            escapes the root
+    """
+    resolved = Path(path).expanduser()
+    if not restrict_to_root:
+        return resolved.resolve()
+
+    if not BULK_INGEST_ROOT:
+        raise BulkIngestError("Directory ingestion is disabled (BULK_INGEST_ROOT is not set)")
+    root = Path(BULK_INGEST_ROOT).resolve()
+    resolved = (root / resolved).resolve()
+    if not resolved.is_relative_to(root):
+        raise BulkIngestError(f"Path must be inside BULK_INGEST_ROOT: {path}")
+    return resolved
+
+
+async def ingest_directory(
+    path: str,
+    doc_type: str = "other",
+    source: str = "other",
+    manifest_path: Optional[str] = None,
+    recursive: bool = True,
+    max_parallel: Optional[int] = None,
+    name: Optional[str] = None,
+    restrict_to_root: bool = True,
+) -> dict:
+    """Queue every PDF under a server-side directory as one batch.
+
+    Args:
+        path: Directory (relative paths resolve against BULK_INGEST_ROOT)
+        doc_type: Default document type
+        source: Default document source
+        manifest_path: Manifest file; defaults to a manifest in the directory
+        recursive: Include subdirectories
+        max_parallel: Jobs of this batch running at once
+        name: Batch name (defaults to the directory name)
+        restrict_to_root: Enforce BULK_INGEST_ROOT (off for the CLI)
+
+    Returns:
+        Batch summary (see ``create_batch``)
+
+    Raises:
+        BulkIngestError: If the request is invalid or no PDFs were found
+    """
+    _validate_defaults(doc_type, source)
+    directory = resolve_server_path(path, restrict_to_root)
+    if not directory.is_dir():
+        raise BulkIngestError(f"Not a directory: {path}")
+
+    manifest: Dict[str, Dict[str, str]] = {}
+    if manifest_path:
+        candidates = [resolve_server_path(manifest_path, restrict_to_root)]
+    else:
+        candidates = [directory / n for n in MANIFEST_NAMES]
+    for candidate in candidates:
+        if candidate.is_file():
+            if candidate.stat().st_size > MAX_MANIFEST_BYTES:
+                raise BulkIngestError(
+                    f"Manifest {candidate.name} exceeds the maximum size of "
+                    f"{MAX_MANIFEST_BYTES // MIB} MB"
+                )
+            content = await asyncio.to_thread(candidate.read_text, encoding="utf-8")
+            manifest = parse_manifest(content, candidate.name)
+            break
+    else:
+        if manifest_path:
+            raise BulkIngestError(f"Manifest not found: {manifest_path}")
+
+    files, rejected = await asyncio.to_thread(
+        _stage_directory, directory, manifest, doc_type, source, recursive
+    )
+    if not files:
+        raise BulkIngestError(f"No PDF files found in {path}")
+
+    return await create_batch(
+        files, name or directory.name, str(directory), max_parallel, rejected
+    )
+
+
+async def ingest_archive(
+    archive_path: Path,
+    filename: str,
+    doc_type: str = "other",
+    source: str = "other",
+    manifest: Optional[Dict[str, Dict[str, str]]] = None,
+    max_parallel: Optional[int] = None,
+    name: Optional[str] = None,
+) -> dict:
+    """Queue every PDF in a zip or tar archive as one batch.
+
+    Args:
+        archive_path: Archive on local disk
+        filename: Original archive name
+        doc_type: Default document type
+        source: Default document source
+        manifest: Parsed manifest; defaults to a manifest at the archive root
+        max_parallel: Jobs of this batch running at once
+        name: Batch name (defaults to the archive name)
+
+    Returns:
+        Batch summary (see ``create_batch``)
+
+    Raises:
+        BulkIngestError: If the archive is invalid or has no PDFs
+    """
+    _validate_defaults(doc_type, source)
+    try:
+        files, rejected = await asyncio.to_thread(
+            _stage_archive, archive_path, manifest, doc_type, source
+        )
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise BulkIngestError(f"Could not read archive {filename}: {e}")
+    if not files:
+        raise BulkIngestError(f"No PDF files found in {filename}")
+
+    return await create_batch(files, name or filename, filename, max_parallel, rejected)
+
+
+async def get_batch_progress(batch_id: str) -> Optional[dict]:
+    """Aggregate the progress of a batch's jobs.
+
+    Returns:
+        Dict with per-status counts, overall progress, chunk total and
+        failed jobs, or None if the batch doesn't exist
+    """
+    try:
+        batch_uuid = uuid.UUID(batch_id)
+    except ValueError:
+        return None
+
+    async with get_db_context() as db:
+        batch = await db.get(IngestionBatch, batch_uuid)
+        if batch is None:
+            return None
+
+        result = await db.execute(
+            select(
+                IngestionJobRecord.status,
+                func.count(),
+                func.coalesce(func.sum(IngestionJobRecord.progress), 0),
+                func.coalesce(func.sum(IngestionJobRecord.chunks_count), 0),
+            )
+            .where(IngestionJobRecord.batch_id == batch_uuid)
+            .group_by(IngestionJobRecord.status)
+        )
+        counts = {status.value: 0 for status in JobStatus}
+        progress_sum = 0
+        chunks = 0
+        for status, count, progress, chunk_count in result.all():
+            counts[status] = count
+            progress_sum += progress
+            chunks += chunk_count
+
+        failed = await db.execute(
+            select(
+                IngestionJobRecord.id,
+                IngestionJobRecord.document_name,
+                IngestionJobRecord.error_message,
+            ).where(
+                IngestionJobRecord.batch_id == batch_uuid,
+                IngestionJobRecord.status == JobStatus.FAILED.value,
+            )
+        )
+        failed_jobs = [
+            {"job_id": str(job_id), "document_name": doc_name, "error_message": error}
+            for job_id, doc_name, error in failed.all()
+        ]
+
+    jobs_total = sum(counts.values())
+    finished = counts[JobStatus.DONE.value] + counts[JobStatus.FAILED.value]
+    if jobs_total and finished == jobs_total:
+        status = "failed" if counts[JobStatus.FAILED.value] else JobStatus.DONE.value
+    elif counts[JobStatus.RUNNING.value] or finished:
+        status = JobStatus.RUNNING.value
+    else:
+        status = JobStatus.QUEUED.value if jobs_total else JobStatus.DONE.value
+
+    return {
+        "batch_id": str(batch.id),
+        "name": batch.name,
+        "origin": batch.origin,
+        "status": status,
+        "progress": int(progress_sum / jobs_total) if jobs_total else 100,
+        "files_total": batch.files_total,
+        "jobs_total": jobs_total,
+        "counts": counts,
+        "chunks_count": chunks,
+        "max_parallel": batch.max_parallel,
+        "skipped": batch.skipped,
+        "failed_jobs": failed_jobs,
+        "created_at": batch.created_at.isoformat(),
+    }
@@ -0,0 +1,122 @@
+"""Bulk loader for document chunk rows.
+
+All ingestion paths write hundreds to hundreds of thousands of
+``document_chunks`` rows per document. Adding them one ORM object at a
+time is dominated by per-row overhead, so this module writes them set-wise:
+
+- asyncpg sessions use the binary COPY protocol (``copy_records_to_table``)
+- any other driver falls back to multi-row ``INSERT ... VALUES`` batches
+
+``fts_vector`` is a STORED generated column (migration 002), so Postgres
+computes it inside the same COPY/INSERT without a per-row trigger.
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import DocumentChunk
+from backend.services.embedding_store import content_hash
+
+# Columns written by the loader, in COPY order
+CHUNK_COLUMNS = (
+    "id", "document_id", "chunk_index", "text", "source", "page", "content_hash",
+    "char_start", "char_end",
+)
+
+# Rows per multi-row INSERT statement (fallback path)
+INSERT_BATCH_SIZE = int(os.getenv("CHUNK_INSERT_BATCH_SIZE", "1000"))
+
+
+class BulkLoadError(Exception):
+    """Raised when a requested bulk load method is unavailable."""
+    pass
+
+
+def chunk_row(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a chunk dict (as passed to ``upsert_chunks``) to a table row.
+
+    Args:
+        chunk: Chunk dict with keys chunk_id, document_id, chunk_index,
+               text, source, page and optionally content_hash (computed
+               from the text if missing), char_start and char_end
+
+    Returns:
+        Dict keyed by ``document_chunks`` column names
+    """
+    return {
+        "id": chunk["chunk_id"],
+        "document_id": chunk["document_id"],
+        "chunk_index": chunk["chunk_index"],
+        "text": chunk["text"],
+        "source": chunk.get("source"),
+        "page": chunk.get("page"),
+        "content_hash": chunk.get("content_hash") or content_hash(chunk["text"]),
+        "char_start": chunk.get("char_start"),
+        "char_end": chunk.get("char_end"),
+    }
+
+
+async def _get_asyncpg_connection(db: AsyncSession) -> Optional[Any]:
+    """Return the raw asyncpg connection behind the session, if any.
+
+    The returned connection is the one the session's current transaction
+    runs on, so COPY participates in the same commit/rollback.
+    """
+    conn = await db.connection()
+    if conn.dialect.driver != "asyncpg":
+        return None
+
+    # The asyncpg adapter opens its transaction lazily on the first
+    # statement; make sure it has begun before COPY bypasses the adapter.
+    await conn.exec_driver_sql("SELECT 1")
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+async def bulk_insert_chunks(
+    db: AsyncSession,
+    chunks: List[Dict[str, Any]],
+    method: str = "auto",
+    batch_size: int = INSERT_BATCH_SIZE,
+) -> int:
+    """Insert chunk rows in bulk within the session's transaction.
+
+    Pending ORM objects (e.g. the parent ``Document``) are flushed first so
+    foreign keys resolve. The caller still owns the commit.
+
+    Args:
+        db: Database session
+        chunks: Chunk dicts (same shape as for ``upsert_chunks``)
+        method: "auto" (COPY when available), "copy" or "insert"
+        batch_size: Rows per INSERT statement for the fallback path
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        BulkLoadError: If method="copy" but the driver is not asyncpg
+    """
+    if not chunks:
+        return 0
+
+    await db.flush()
+    rows = [chunk_row(c) for c in chunks]
+
+    if method in ("auto", "copy"):
+        driver_conn = await _get_asyncpg_connection(db)
+        if driver_conn is not None:
+            await driver_conn.copy_records_to_table(
+                DocumentChunk.__tablename__,
+                records=[tuple(row[col] for col in CHUNK_COLUMNS) for row in rows],
+                columns=list(CHUNK_COLUMNS),
+            )
+            return len(rows)
+        if method == "copy":
+            raise BulkLoadError("COPY requires an asyncpg-backed session")
+
+    for i in range(0, len(rows), batch_size):
+        await db.execute(insert(DocumentChunk).values(rows[i:i + batch_size]))
+
+    return len(rows)
@@ -1,6 +1,17 @@
-"""Text chunking utilities for document ingestion."""
+"""Text chunking utilities for document ingestion.
+
+Documents are chunked with a named profile (CHUNK_PROFILE, stored per
+document):
+
+- standard: 600-token chunks, embedded and returned as they are
+- small: 150-token chunks for precise vector matching; retrieval expands
+  each hit to a window of its neighbouring chunks (CHUNK_WINDOW) so the
+  prompt still gets a coherent passage (small-to-big retrieval)
+"""
+import os
 import re
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
 try:
     import tiktoken
@@ -11,6 +22,39 @@ except ImportError:
     USE_TIKTOKEN = False
 
 
+@dataclass(frozen=True)
+class ChunkProfile:
+    """Chunk size settings of an indexing mode."""
+
+    name: str
+    chunk_size: int
+    chunk_overlap: int
+    expand: bool = False  # expand hits to neighbour windows at query time
+
+
+CHUNK_PROFILES = {
+    "standard": ChunkProfile("standard", chunk_size=600, chunk_overlap=100),
+    "small": ChunkProfile("small", chunk_size=150, chunk_overlap=30, expand=True),
+}
+
+# Profile used for newly ingested documents
+CHUNK_PROFILE = os.getenv("CHUNK_PROFILE", "standard")
+
+
+def get_chunk_profile(name: Optional[str] = None) -> ChunkProfile:
+    """Look up a chunk profile by name (default: CHUNK_PROFILE).
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    name = name or CHUNK_PROFILE
+    if name not in CHUNK_PROFILES:
+        raise ValueError(
+            f"Unknown chunk profile '{name}'. Must be one of: {list(CHUNK_PROFILES)}"
+        )
+    return CHUNK_PROFILES[name]
+
+
 def count_tokens(text: str) -> int:
     """Count tokens in text using tiktoken or word approximation."""
     if USE_TIKTOKEN and TOKENIZER:
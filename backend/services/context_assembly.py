@@ -0,0 +1,167 @@
+"""Context assembly: merging neighbouring retrieved chunks into passages.
+
+Chunks overlap by design (``chunk_overlap`` tokens), so when retrieval
+returns neighbouring chunks of one document the prompt carries the shared
+text twice and cites the same passage under several numbers. Before the
+context is formatted, hits are grouped by document and runs of consecutive
+``chunk_index`` values are merged into one contiguous passage:
+
+- the overlap is cut using the stored character offsets (``char_start``);
+  chunks indexed before offsets were stored fall back to matching the
+  longest suffix/prefix shared by the two texts
+- a passage keeps the best score of its members, the page range they span
+  (``page``..``page_end``) and a citation covering it
+- a passage takes the position of its best-ranked member, so the context
+  order still follows relevance
+
+Chunks without ``document_id`` or ``chunk_index`` pass through unchanged.
+Already merged passages (``chunk_index``..``chunk_index_end``) can be merged
+again, e.g. small-to-big windows (``rag.expand_chunk_windows``).
+"""
+import os
+from typing import Any, Optional
+
+CONTEXT_MERGE_ENABLED = os.getenv("CONTEXT_MERGE_ENABLED", "true").lower() == "true"
+
+# Shortest shared text accepted as an overlap when offsets are missing
+MIN_TEXT_OVERLAP = 20
+
+
+def _text_overlap(previous: str, following: str) -> int:
+    """Length of the longest suffix of ``previous`` that starts ``following``."""
+    for size in range(min(len(previous), len(following)) - 1, MIN_TEXT_OVERLAP - 1, -1):
+        if previous.endswith(following[:size]):
+            return size
+    return 0
+
+
+def chunk_overlap(previous: dict[str, Any], following: dict[str, Any]) -> int:
+    """Number of leading characters of ``following`` already in ``previous``.
+
+    Args:
+        previous: Chunk with the lower chunk_index
+        following: Chunk directly after it
+
+    Returns:
+        Overlap length in characters (0 when the chunks only touch)
+    """
+    previous_text = previous.get("text", "")
+    following_text = following.get("text", "")
+    previous_start = previous.get("char_start")
+    following_start = following.get("char_start")
+
+    if previous_start is not None and following_start is not None:
+        overlap = previous_start + len(previous_text) - following_start
+        if overlap <= 0:
+            return 0
+        # Trust the offsets only when the texts agree with them
+        if overlap < len(following_text) and previous_text.endswith(following_text[:overlap]):
+            return overlap
+
+    return _text_overlap(previous_text, following_text)
+
+
+def _format_citation(source: str, page: Optional[int], page_end: Optional[int]) -> str:
+    if page and page_end and page_end != page:
+        return f"[{source} pp.{page}-{page_end}]"
+    if page:
+        return f"[{source} p.{page}]"
+    return f"[{source}]"
+
+
+def _merge_run(run: list[dict[str, Any]], best: dict[str, Any]) -> dict[str, Any]:
+    """Merge consecutive chunks (sorted by chunk_index) into one passage."""
+    text = run[0].get("text", "")
+    for previous, following in zip(run, run[1:]):
+        overlap = chunk_overlap(previous, following)
+        following_text = following.get("text", "")
+        text += following_text[overlap:] if overlap else " " + following_text
+
+    pages = [chunk["page"] for chunk in run if chunk.get("page")]
+    page = min(pages) if pages else None
+    page_end = max(pages) if pages else None
+
+    passage = dict(best)
+    passage.update({
+        "text": text,
+        "chunk_index": run[0].get("chunk_index"),
+        "chunk_index_end": _last_index(run[-1]),
+        "chunk_ids": [
+            chunk_id
+            for chunk in run
+            for chunk_id in chunk.get("chunk_ids", [chunk.get("chunk_id")])
+        ],
+        "char_start": run[0].get("char_start"),
+        "char_end": run[-1].get("char_end"),
+        "page": page,
+        "page_end": page_end,
+        "citation": _format_citation(best.get("source", "Unknown"), page, page_end),
+    })
+    for score_key in ("score", "rrf_score"):
+        scores = [chunk[score_key] for chunk in run if chunk.get(score_key) is not None]
+        if scores:
+            passage[score_key] = max(scores)
+    return passage
+
+
+def _last_index(chunk: dict[str, Any]) -> int:
+    end = chunk.get("chunk_index_end")
+    return chunk["chunk_index"] if end is None else end
+
+
+def _place_run(chunks: list[dict[str, Any]], run: list[int]) -> tuple[int, dict[str, Any]]:
+    best = min(run)
+    if len(run) == 1:
+        return best, chunks[best]
+    return best, _merge_run([chunks[p] for p in run], chunks[best])
+
+
+def merge_adjacent_chunks(chunks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge retrieved chunks that are neighbours in their document.
+
+    Args:
+        chunks: Retrieved chunks, best first, with text, document_id,
+                chunk_index and optionally char_start, char_end, page,
+                source, score, rrf_score
+
+    Returns:
+        Passages (merged or unchanged chunks), best first; the input is
+        not modified
+    """
+    if not CONTEXT_MERGE_ENABLED:
+        return list(chunks)
+    return merge_runs(chunks)
+
+
+def merge_runs(chunks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge neighbouring chunks regardless of CONTEXT_MERGE_ENABLED.
+
+    Used where merging is part of the retrieval result itself (small-to-big
+    windows); see ``merge_adjacent_chunks`` for arguments.
+    """
+    if len(chunks) < 2:
+        return list(chunks)
+
+    # Best rank of each (document_id, chunk_index); duplicates are dropped
+    by_document: dict[str, dict[int, int]] = {}
+    standalone: list[int] = []
+    for position, chunk in enumerate(chunks):
+        document_id = chunk.get("document_id")
+        chunk_index = chunk.get("chunk_index")
+        if document_id is None or chunk_index is None:
+            standalone.append(position)
+            continue
+        by_document.setdefault(str(document_id), {}).setdefault(chunk_index, position)
+
+    placed: list[tuple[int, dict[str, Any]]] = [(p, chunks[p]) for p in standalone]
+    for positions in by_document.values():
+        run: list[int] = []
+        for chunk_index in sorted(positions):
+            if run and chunk_index != _last_index(chunks[run[-1]]) + 1:
+                placed.append(_place_run(chunks, run))
+                run = []
+            run.append(positions[chunk_index])
+        placed.append(_place_run(chunks, run))
+
+    placed.sort(key=lambda item: item[0])
+    return [passage for _, passage in placed]
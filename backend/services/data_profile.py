@@ -0,0 +1,414 @@
+"""One-pass streaming profiler for tabular analytics uploads.
+
+Builds the analytics snapshot payload of ``POST /api/ingest/data`` without
+loading the whole file:
+
+- CSV is read in chunks of PROFILE_CHUNK_ROWS rows (pandas chunksize)
+- XLSX is parsed by calamine (Rust) and converted to rows lazily, several
+  times faster than openpyxl; values are normalized the way ``read_excel``
+  does (empty cells to None, whole floats to int, dates to datetimes)
+- each chunk updates mergeable per-column stats: null counts, dtype kinds,
+  min/max and Welford mean/variance, heavy hitters and date ranges, so
+  memory stays bounded by the chunk size
+- profiling runs in a process pool, off the API's event loop and GIL
+
+The payload has the same shape as the former whole-file pandas summary:
+row/column counts, column names and dtypes, the first date range found,
+top-5 counts of the first 3 object columns, mean/min/max of the first 5
+numeric columns and 5 preview rows. Category counts are exact while a
+column has at most HEAVY_HITTER_CAPACITY distinct values; beyond that they
+are Misra-Gries lower bounds.
+
+pandas and python-calamine are imported inside the functions, so importing
+this module (and spawning pool workers) stays cheap.
+"""
+import asyncio
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Rows per chunk
+PROFILE_CHUNK_ROWS = int(os.getenv("PROFILE_CHUNK_ROWS", "100000"))
+
+# Worker processes for profiling
+PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", "2"))
+
+# Distinct values tracked per column for category counts
+HEAVY_HITTER_CAPACITY = 1000
+
+# Payload limits (unchanged from the whole-file summary)
+MAX_CATEGORY_COLUMNS = 3
+MAX_CATEGORY_VALUES = 5
+MAX_NUMERIC_COLUMNS = 5
+PREVIEW_ROWS = 5
+
+
+# --- Mergeable stats ---
+
+
+@dataclass
+class NumericStats:
+    """Count, min/max and Welford mean/M2, mergeable across chunks."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def merge(self, other: "NumericStats") -> None:
+        """Combine with another partition (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @classmethod
+    def from_series(cls, series: Any) -> "NumericStats":
+        """Stats of one chunk's non-null numeric values."""
+        values = series.dropna()
+        if values.empty:
+            return cls()
+        mean = float(values.mean())
+        return cls(
+            count=int(values.size),
+            mean=mean,
+            m2=float(((values - mean) ** 2).sum()),
+            min=float(values.min()),
+            max=float(values.max()),
+        )
+
+
+@dataclass
+class HeavyHitters:
+    """Misra-Gries frequent-items summary, mergeable across chunks."""
+    capacity: int = HEAVY_HITTER_CAPACITY
+    counts: Counter = field(default_factory=Counter)
+
+    def merge_counts(self, counts: Dict[str, int]) -> None:
+        """Add counts and prune back to ``capacity`` entries."""
+        self.counts.update(counts)
+        if len(self.counts) > self.capacity:
+            threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = Counter(
+                {k: v - threshold for k, v in self.counts.items() if v > threshold}
+            )
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.merge_counts(other.counts)
+
+    def top(self, n: int) -> Dict[str, int]:
+        return dict(self.counts.most_common(n))
+
+
+@dataclass
+class ColumnProfile:
+    """Running stats of one column."""
+    label: str
+    non_null: int = 0
+    nulls: int = 0
+    kinds: set = field(default_factory=set)
+    numeric: NumericStats = field(default_factory=NumericStats)
+    hitters: HeavyHitters = field(default_factory=HeavyHitters)
+    date_min: Any = None
+    date_max: Any = None
+
+    @property
+    def dtype(self) -> str:
+        """pandas dtype the whole column would have been read with."""
+        kinds = self.kinds
+        if not kinds:
+            return "float64"  # all-null
+        if kinds == {"datetime"}:
+            return "datetime64[ns]"
+        if kinds == {"bool"} and not self.nulls:
+            return "bool"
+        if kinds <= {"int", "float"}:
+            return "float64" if "float" in kinds or self.nulls else "int64"
+        return "object"
+
+    def merge(self, other: "ColumnProfile") -> None:
+        self.non_null += other.non_null
+        self.nulls += other.nulls
+        self.kinds |= other.kinds
+        self.numeric.merge(other.numeric)
+        self.hitters.merge(other.hitters)
+        if other.date_min is not None:
+            self.date_min = other.date_min if self.date_min is None else min(self.date_min, other.date_min)
+            self.date_max = other.date_max if self.date_max is None else max(self.date_max, other.date_max)
+
+
+_KINDS = {"i": "int", "u": "int", "f": "float", "b": "bool", "M": "datetime"}
+
+
+def _is_date_candidate(label: str) -> bool:
+    lower = label.lower()
+    return "date" in lower or "time" in lower
+
+
+@dataclass
+class DatasetProfile:
+    """Running stats of a whole dataset."""
+    rows: int = 0
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+    preview: Any = None  # DataFrame of the first rows
+
+    def update(self, chunk: Any) -> None:
+        """Fold one DataFrame chunk into the profile."""
+        import pandas as pd
+
+        if self.preview is None:
+            self.preview = chunk.head(PREVIEW_ROWS)
+        self.rows += len(chunk)
+
+        for label in chunk.columns:
+            series = chunk[label]
+            column = self.columns.setdefault(str(label), ColumnProfile(label=str(label)))
+            non_null = int(series.count())
+            column.non_null += non_null
+            column.nulls += len(series) - non_null
+            if not non_null:
+                continue
+
+            column.kinds.add(_KINDS.get(series.dtype.kind, "object"))
+            if series.dtype.kind in "iuf":
+                column.numeric.merge(NumericStats.from_series(series))
+            column.hitters.merge_counts(
+                {str(k): int(v) for k, v in series.value_counts().items()}
+            )
+            if _is_date_candidate(column.label):
+                try:
+                    dates = pd.to_datetime(series, errors="coerce").dropna()
+                except Exception:
+                    continue
+                if not dates.empty:
+                    column.merge(ColumnProfile(
+                        label=column.label,
+                        date_min=dates.min(),
+                        date_max=dates.max(),
+                    ))
+
+    def merge(self, other: "DatasetProfile") -> None:
+        """Combine with the profile of a later partition of the rows."""
+        if self.preview is None:
+            self.preview = other.preview
+        self.rows += other.rows
+        for label, column in other.columns.items():
+            if label in self.columns:
+                self.columns[label].merge(column)
+            else:
+                self.columns[label] = column
+
+    def column_names(self) -> Dict[str, str]:
+        """Map source labels of non-empty columns to their cleaned names.
+
+        All-empty columns are dropped, then unnamed ones are named by position.
+        """
+        kept = [c for c in self.columns.values() if c.non_null]
+        names: Dict[str, str] = {}
+        for idx, column in enumerate(kept):
+            name = column.label
+            if name.startswith("Unnamed") or name.strip() == "":
+                name = f"column_{idx+1}"
+            names[column.label] = name
+        return names
+
+    def to_payload(self) -> dict:
+        """Build the analytics snapshot payload."""
+        names = self.column_names()
+        kept = [self.columns[label] for label in names]
+
+        payload: dict = {
+            "row_count": self.rows,
+            "column_count": len(kept),
+            "columns": list(names.values()),
+            "column_types": {names[c.label]: c.dtype for c in kept},
+        }
+
+        for column in kept:
+            if _is_date_candidate(names[column.label]) and column.date_min is not None:
+                payload["date_range"] = {
+                    "column": names[column.label],
+                    "min": str(column.date_min),
+                    "max": str(column.date_max),
+                }
+                break
+
+        for column in [c for c in kept if c.dtype == "object"][:MAX_CATEGORY_COLUMNS]:
+            value_counts = column.hitters.top(MAX_CATEGORY_VALUES)
+            if value_counts:
+                payload.setdefault("category_counts", {})[names[column.label]] = value_counts
+
+        numeric = [c for c in kept if c.dtype in ("int64", "float64")]
+        if numeric:
+            payload["numeric_summary"] = {}
+            for column in numeric[:MAX_NUMERIC_COLUMNS]:
+                stats = column.numeric
+                payload["numeric_summary"][names[column.label]] = {
+                    "mean": stats.mean if stats.count else None,
+                    "min": stats.min,
+                    "max": stats.max,
+                }
+
+        preview_rows: List[dict] = []
+        if self.preview is not None and kept:
+            preview = self.preview[[c.label for c in kept]].rename(columns=names)
+            preview_rows = preview.fillna("").to_dict(orient="records")
+        payload["preview_rows"] = preview_rows
+
+        return payload
+
+
+# --- Readers ---
+
+
+def iter_csv_chunks(path: Path, chunk_rows: int = PROFILE_CHUNK_ROWS) -> Iterator[Any]:
+    """Yield DataFrame chunks of a CSV file."""
+    import pandas as pd
+
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def _header_labels(header: tuple) -> List[str]:
+    """Column labels as pandas read_excel names them."""
+    labels: List[str] = []
+    seen: Dict[str, int] = {}
+    for idx, value in enumerate(header):
+        label = f"Unnamed: {idx}" if value is None or str(value).strip() == "" else str(value)
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        else:
+            seen[label] = 0
+        labels.append(label)
+    return labels
+
+
+def _cell_value(value: Any) -> Any:
+    """A calamine cell value as ``read_excel`` returns it."""
+    if isinstance(value, str):
+        return value if value != "" else None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time())
+    return value
+
+
+def iter_xlsx_chunks(path: Path, chunk_rows: int = PROFILE_CHUNK_ROWS) -> Iterator[Any]:
+    """Yield DataFrame chunks of the first sheet of an XLSX file.
+
+    calamine holds the parsed sheet in compact native form; rows become
+    Python values one at a time, so only the current chunk is expanded.
+    Trailing empty rows are dropped, like ``read_excel``.
+    """
+    import pandas as pd
+    from python_calamine import CalamineWorkbook
+
+    sheet = CalamineWorkbook.from_path(str(path)).get_sheet_by_index(0)
+    if sheet.start is None:  # empty sheet
+        return
+    # Rows start at the top of the sheet but leave out leading empty columns
+    padding = (None,) * sheet.start[1]
+    rows = (padding + tuple(_cell_value(v) for v in row) for row in sheet.iter_rows())
+    header = next(rows, None)
+    if header is None:
+        return
+    labels = _header_labels(header)
+    width = len(labels)
+
+    buffer: List[tuple] = []
+    empty_run: List[tuple] = []
+    for row in rows:
+        row = tuple(row[:width]) + (None,) * (width - len(row))
+        if all(v is None for v in row):
+            empty_run.append(row)
+            continue
+        buffer.extend(empty_run)
+        empty_run = []
+        buffer.append(row)
+        if len(buffer) >= chunk_rows:
+            yield pd.DataFrame.from_records(buffer, columns=labels)
+            buffer = []
+    if buffer:
+        yield pd.DataFrame.from_records(buffer, columns=labels)
+
+
+def iter_chunks(path: Path, ext: str, chunk_rows: int = PROFILE_CHUNK_ROWS) -> Iterator[Any]:
+    """Yield DataFrame chunks of a CSV or XLSX file."""
+    if ext == ".csv":
+        return iter_csv_chunks(path, chunk_rows)
+    return iter_xlsx_chunks(path, chunk_rows)
+
+
+def profile_dataset(path: Path, ext: str, chunk_rows: int = PROFILE_CHUNK_ROWS) -> DatasetProfile:
+    """Profile a CSV or XLSX file in one streaming pass."""
+    profile = DatasetProfile()
+    for chunk in iter_chunks(path, ext, chunk_rows):
+        profile.update(chunk)
+    return profile
+
+
+def profile_file(path: Path, ext: str, chunk_rows: int = PROFILE_CHUNK_ROWS) -> dict:
+    """Profile a CSV or XLSX file in one streaming pass.
+
+    Args:
+        path: File to profile
+        ext: ".csv" or ".xlsx"
+        chunk_rows: Rows per chunk
+
+    Returns:
+        Analytics snapshot payload
+    """
+    return profile_dataset(path, ext, chunk_rows).to_payload()
+
+
+# --- Worker pool ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: never fork the API process with its event loop and threads
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, PROFILE_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def run_in_profile_pool(func: Callable[..., T], *args: Any) -> T:
+    """Run a picklable function in the profiling process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), func, *args)
+
+
+async def profile_file_async(path: Path, ext: str) -> dict:
+    """Run ``profile_file`` in the profiling process pool."""
+    return await run_in_profile_pool(profile_file, path, ext)
+
+
+def shutdown_profile_pool() -> None:
+    """Stop the profiling worker processes, if started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -1,20 +1,33 @@
 """Document lifecycle operations service.
 
 Provides delete and reindex operations for documents with proper
-cleanup of both database records and Qdrant vectors.
+cleanup of both database records and Qdrant vectors. Reindex is
+incremental: only chunks whose content changed are re-embedded.
 """
 import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import Document, DocumentChunk
-from backend.services.chunking import chunk_text
-from backend.services.embeddings import get_embeddings
-from backend.services.qdrant import delete_by_document_id, upsert_chunks
+from backend.models import Document, DocumentChunk, DocumentStatus
+from backend.services.chunk_loader import bulk_insert_chunks
+from backend.services.chunking import chunk_text, get_chunk_profile
+from backend.services.document_summaries import wake_summary_worker
+from backend.services.embedding_store import content_hash, embed_chunks
+from backend.services.embeddings import EmbeddingStats
+from backend.services.extraction import determine_page, extract_pdf_text_async
+from backend.services.qdrant import (
+    delete_by_document_id,
+    delete_document_summary,
+    delete_points,
+    update_chunk_payloads,
+    upsert_chunks,
+)
 
 
 class DocumentNotFoundError(Exception):
@@ -73,9 +86,12 @@ async def delete_document(
     # Get file path before deletion
     file_path = document.file_path
     
-    # Delete from Qdrant first (so we can rollback DB if this fails)
+    # Delete vectors before the rows: if this fails nothing has changed yet.
+    # If the commit below fails, the rows outlive their vectors and deleting
+    # the document again completes the cleanup.
     try:
         vectors_deleted = await delete_by_document_id(document_id)
+        await delete_document_summary(document_id)
         logger.debug(f"{log_prefix}Deleted {vectors_deleted} vectors from Qdrant")
     except Exception as e:
         logger.error(f"{log_prefix}Failed to delete vectors from Qdrant: {e}")
@@ -99,30 +115,96 @@ async def delete_document(
     }
 
 
+@dataclass
+class ChunkDiff:
+    """Result of diffing a document's re-chunked text against stored chunks."""
+    kept: List[Dict[str, Any]] = field(default_factory=list)
+    moved: List[Dict[str, Any]] = field(default_factory=list)
+    backfill: List[Dict[str, Any]] = field(default_factory=list)
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed_ids: List[uuid.UUID] = field(default_factory=list)
+
+
+def diff_chunks(old_rows: List[Any], new_chunks: List[Dict[str, Any]]) -> ChunkDiff:
+    """Match new chunks to existing rows by content hash and position.
+
+    A new chunk reuses an existing row (and its Qdrant point) when the
+    content hash matches, preferring the row already at the same
+    chunk_index. Kept chunks get ``chunk_id`` set to the reused row id.
+
+    Args:
+        old_rows: Existing rows with id, chunk_index, page, source,
+                  content_hash, text and char_start attributes
+        new_chunks: New chunk dicts with chunk_index, text, source, page,
+                    content_hash and char_start
+
+    Returns:
+        ChunkDiff with kept, moved (kept but position, page, source or
+        character offset changed), backfill (kept with no stored hash), added and removed
+    """
+    diff = ChunkDiff()
+    candidates: Dict[str, List[Any]] = defaultdict(list)
+    stored_hash: Dict[uuid.UUID, Optional[str]] = {}
+    for row in sorted(old_rows, key=lambda r: r.chunk_index):
+        stored_hash[row.id] = row.content_hash
+        candidates[row.content_hash or content_hash(row.text)].append(row)
+
+    for chunk in new_chunks:
+        rows = candidates.get(chunk["content_hash"])
+        if not rows:
+            diff.added.append(chunk)
+            continue
+
+        match = next((r for r in rows if r.chunk_index == chunk["chunk_index"]), rows[0])
+        rows.remove(match)
+        chunk["chunk_id"] = match.id
+        diff.kept.append(chunk)
+
+        if (match.chunk_index, match.page, match.source, match.char_start) != (
+            chunk["chunk_index"], chunk["page"], chunk["source"], chunk.get("char_start")
+        ):
+            diff.moved.append(chunk)
+        elif stored_hash[match.id] is None:
+            diff.backfill.append(chunk)
+
+    diff.removed_ids = [row.id for rows in candidates.values() for row in rows]
+    return diff
+
+
 async def reindex_document(
     db: AsyncSession,
     document_id: uuid.UUID,
     trace_id: Optional[str] = None,
+    full: bool = False,
+    chunk_profile: Optional[str] = None,
 ) -> dict:
-    """Reindex a document by re-chunking and re-embedding.
+    """Incrementally reindex a document from its stored file.
+    
+    Re-extracts and re-chunks the file, then diffs the result against the
+    stored chunks by content hash and position:
     
-    Preserves the document record but regenerates all chunks
-    and vectors from the stored file.
+    - unchanged chunks keep their rows and Qdrant points
+    - moved chunks get their row and point payload updated in place
+    - removed chunks are deleted in one statement and one Qdrant call
+    - only new chunks are embedded (via the embedding store) and upserted
     
     Args:
         db: Database session
         document_id: Document UUID
         trace_id: Optional trace ID for logging
+        full: Replace every chunk and vector instead of diffing (e.g.
+              after an embedding model change)
+        chunk_profile: Re-chunk with this profile (standard, small)
+                       instead of the document's current one
         
     Returns:
-        Dict with reindex summary
+        Dict with reindex summary (kept, added, removed, moved counts)
         
     Raises:
         DocumentNotFoundError: If document doesn't exist
-        DocumentOperationError: If file is missing or reindex fails
+        DocumentOperationError: If file is missing, the chunk profile is
+                                unknown or reindex fails
     """
-    from backend.routers.ingest import extract_pdf_text, determine_page
-    
     log_prefix = f"[{trace_id}] " if trace_id else ""
     logger.info(f"{log_prefix}Reindexing document {document_id}")
     
@@ -134,6 +216,10 @@ async def reindex_document(
     
     if not document:
         raise DocumentNotFoundError(f"Document {document_id} not found")
+    if document.status != DocumentStatus.INDEXED.value:
+        raise DocumentOperationError(
+            f"Document is {document.status}; resume or delete its ingestion job instead"
+        )
     
     # Verify file exists
     file_path = Path(document.file_path)
@@ -147,29 +233,9 @@ async def reindex_document(
             f"Source file not found: {document.file_path}"
         )
     
-    # Delete existing vectors from Qdrant
-    try:
-        vectors_deleted = await delete_by_document_id(document_id)
-        logger.debug(f"{log_prefix}Deleted {vectors_deleted} old vectors")
-    except Exception as e:
-        logger.warning(f"{log_prefix}Could not delete old vectors: {e}")
-        vectors_deleted = 0
-    
-    # Delete existing chunks from database
-    old_chunks_result = await db.execute(
-        select(DocumentChunk).where(DocumentChunk.document_id == document_id)
-    )
-    old_chunks = old_chunks_result.scalars().all()
-    old_chunk_count = len(old_chunks)
-    
-    for chunk in old_chunks:
-        await db.delete(chunk)
-    
-    logger.debug(f"{log_prefix}Deleted {old_chunk_count} old chunks")
-    
     # Extract text from file
     try:
-        full_text, page_breaks = extract_pdf_text(file_path)
+        full_text, page_breaks = await extract_pdf_text_async(file_path)
     except Exception as e:
         raise DocumentOperationError(f"PDF extraction failed: {e}")
     
@@ -177,57 +243,148 @@ async def reindex_document(
         raise DocumentOperationError("No text could be extracted from PDF")
     
     # Re-chunk
-    chunks = chunk_text(full_text, chunk_size=600, chunk_overlap=100)
+    try:
+        profile = get_chunk_profile(chunk_profile or document.chunk_profile)
+    except ValueError as e:
+        raise DocumentOperationError(str(e))
+    chunks = chunk_text(
+        full_text, chunk_size=profile.chunk_size, chunk_overlap=profile.chunk_overlap
+    )
     if not chunks:
         raise DocumentOperationError("No chunks generated from document")
     
-    # Get embeddings
-    chunk_texts = [c[0] for c in chunks]
-    embeddings = await get_embeddings(chunk_texts)
-    
-    # Create new chunk records
     source_ref = f"{document.source.value} - {document.name}"
-    qdrant_chunks = []
-    
-    for idx, (chunk_text_content, char_start, char_end) in enumerate(chunks):
-        page_num = determine_page(char_start, page_breaks)
-        chunk_id = uuid.uuid4()
-        
-        chunk = DocumentChunk(
-            id=chunk_id,
-            document_id=document_id,
-            chunk_index=idx,
-            text=chunk_text_content,
-            source=source_ref,
-            page=page_num,
-        )
-        db.add(chunk)
-        
-        qdrant_chunks.append({
-            "chunk_id": chunk_id,
+    new_chunks = [
+        {
             "document_id": document_id,
             "chunk_index": idx,
             "text": chunk_text_content,
             "source": source_ref,
-            "page": page_num,
-        })
+            "page": determine_page(char_start, page_breaks),
+            "content_hash": content_hash(chunk_text_content),
+            "char_start": char_start,
+            "char_end": char_end,
+        }
+        for idx, (chunk_text_content, char_start, char_end) in enumerate(chunks)
+    ]
+    
+    # Diff against stored chunks
+    old_rows_result = await db.execute(
+        select(
+            DocumentChunk.id,
+            DocumentChunk.chunk_index,
+            DocumentChunk.page,
+            DocumentChunk.source,
+            DocumentChunk.content_hash,
+            DocumentChunk.text,
+            DocumentChunk.char_start,
+        ).where(DocumentChunk.document_id == document_id)
+    )
+    old_rows = old_rows_result.all()
+    if full:
+        diff = ChunkDiff(added=new_chunks, removed_ids=[row.id for row in old_rows])
+    else:
+        diff = diff_chunks(old_rows, new_chunks)
+    
+    for chunk in diff.added:
+        chunk["chunk_id"] = uuid.uuid4()
+    
+    # Embed only new chunks
+    stats = EmbeddingStats()
+    embeddings = await embed_chunks([c["text"] for c in diff.added], stats=stats)
     
-    # Upsert to Qdrant
-    await upsert_chunks(qdrant_chunks, embeddings)
+    # Delete removed rows in one statement
+    if diff.removed_ids:
+        await db.execute(
+            delete(DocumentChunk).where(DocumentChunk.id.in_(diff.removed_ids))
+        )
+    
+    # Rewrite positions in two phases so (document_id, chunk_index) stays
+    # unique: first park rows at negative indexes, then flip them back.
+    rewritten = diff.moved + diff.backfill
+    if rewritten:
+        await db.execute(
+            update(DocumentChunk),
+            [
+                {
+                    "id": c["chunk_id"],
+                    "chunk_index": -(c["chunk_index"] + 1),
+                    "page": c["page"],
+                    "source": c["source"],
+                    "content_hash": c["content_hash"],
+                    "char_start": c.get("char_start"),
+                    "char_end": c.get("char_end"),
+                }
+                for c in rewritten
+            ],
+        )
+        await db.execute(
+            update(DocumentChunk)
+            .where(
+                DocumentChunk.document_id == document_id,
+                DocumentChunk.chunk_index < 0,
+            )
+            .values(chunk_index=-DocumentChunk.chunk_index - 1)
+        )
+    
+    # Bulk-load new chunk rows
+    await bulk_insert_chunks(db, diff.added)
+    document.chunk_profile = profile.name
+    # Content changed: the summary worker rebuilds the summary
+    if diff.added or diff.removed_ids:
+        document.summary = None
+    
+    # Apply the same diff to Qdrant. New points and payloads go first and
+    # removed points last, so a failure never leaves the document with
+    # fewer vectors than its committed rows.
+    try:
+        await update_chunk_payloads([
+            {
+                "chunk_id": c["chunk_id"],
+                "chunk_index": c["chunk_index"],
+                "page": c["page"],
+                "source": c["source"],
+                "char_start": c.get("char_start"),
+                "char_end": c.get("char_end"),
+            }
+            for c in diff.moved
+        ])
+        await upsert_chunks(diff.added, embeddings)
+        vectors_deleted = await delete_points(diff.removed_ids)
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"{log_prefix}Failed to update vectors in Qdrant: {e}")
+        # New points have no rows after the rollback
+        try:
+            await delete_points([c["chunk_id"] for c in diff.added])
+        except Exception as cleanup_error:
+            logger.warning(f"{log_prefix}Could not remove new vectors: {cleanup_error}")
+        raise DocumentOperationError(f"Failed to update vectors: {e}")
     
     # Commit database changes
     await db.commit()
+    if document.summary is None:
+        wake_summary_worker()
     
     logger.info(
         f"{log_prefix}✅ Reindexed document {document_id}: "
-        f"{old_chunk_count} → {len(chunks)} chunks"
+        f"{len(old_rows)} → {len(new_chunks)} chunks "
+        f"(kept {len(diff.kept)}, moved {len(diff.moved)}, "
+        f"added {len(diff.added)}, removed {len(diff.removed_ids)}; "
+        f"{stats.api_calls} embedding calls)"
     )
     
     return {
         "document_id": str(document_id),
         "name": document.name,
-        "old_chunks": old_chunk_count,
-        "new_chunks": len(chunks),
+        "chunk_profile": profile.name,
+        "old_chunks": len(old_rows),
+        "new_chunks": len(new_chunks),
+        "kept": len(diff.kept),
+        "added": len(diff.added),
+        "removed": len(diff.removed_ids),
+        "moved": len(diff.moved),
+        "embedding_calls": stats.api_calls,
         "vectors_deleted": vectors_deleted,
-        "vectors_created": len(chunks),
+        "vectors_created": len(diff.added),
     }
@@ -0,0 +1,351 @@
+"""Document-level summary index for two-stage retrieval.
+
+Every document gets one generated summary, stored in ``documents.summary``
+and embedded into its own Qdrant collection (QDRANT_SUMMARY_COLLECTION):
+
+- summaries are built off the request path by ``summary_worker`` (started
+  with the ingestion workers). It picks up every indexed document without
+  a summary: new uploads, documents ingested before the index existed and
+  reindexed documents whose content changed, so it is also the backfill.
+  Documents of unfinished ingestion jobs wait until they are indexed
+- ``select_documents`` is the first retrieval stage: once at least
+  DOCUMENT_INDEX_MIN_DOCS documents are summarized, chunk search is
+  narrowed to the DOCUMENT_TOP_M documents whose summaries match the query
+  best (plus documents still waiting for a summary)
+- summary-style questions ("summarize the grid development plan") are
+  answered from the best-matching summaries instead of scattered chunks
+"""
+import asyncio
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import get_db_context
+from backend.models import Document, DocumentChunk, DocumentStatus
+from backend.services import llm_gateway
+from backend.services.chunking import count_tokens
+from backend.services.embeddings import get_embeddings
+from backend.services.qdrant import search_document_summaries, upsert_document_summary
+from backend.services.rate_limiter import Priority
+
+SUMMARY_INDEX_ENABLED = os.getenv("SUMMARY_INDEX_ENABLED", "true").lower() == "true"
+
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-4o-mini")
+# Document text sent to the summary call; longer documents are sampled
+SUMMARY_INPUT_TOKENS = int(os.getenv("SUMMARY_INPUT_TOKENS", "6000"))
+SUMMARY_MAX_TOKENS = 400
+
+# Summarized documents needed before chunk search is narrowed
+DOCUMENT_INDEX_MIN_DOCS = int(os.getenv("DOCUMENT_INDEX_MIN_DOCS", "30"))
+# Documents whose chunks are searched when narrowing
+DOCUMENT_TOP_M = int(os.getenv("DOCUMENT_TOP_M", "8"))
+# Summaries returned for summary-style questions
+SUMMARY_PASSAGES = 3
+
+# Seconds between summary worker polls, and between refreshes of the
+# summarized document count used by retrieval
+SUMMARY_INTERVAL_SECONDS = float(os.getenv("SUMMARY_INTERVAL_SECONDS", "30"))
+DOCUMENT_INDEX_TTL_SECONDS = 60.0
+# Documents summarized per worker round
+SUMMARY_BATCH_SIZE = 5
+# Failed attempts per document before this process stops retrying it
+SUMMARY_MAX_ATTEMPTS = 3
+
+SUMMARY_PROMPT = """You summarize documents for a search index of energy sector \
+strategy and regulatory documents (UETCL, ERA, MEMD, World Bank).
+
+Write a summary of at most 200 words covering:
+- what the document is (type, issuer, period covered)
+- its scope and main subjects
+- its key points, targets, figures and obligations
+
+Use plain prose, no headings. Only use information from the excerpts."""
+
+SUMMARY_QUERY = re.compile(
+    r"\b(summari[sz]\w*|summary|overview|outline|gist|main points|key points|"
+    r"key takeaways|what is (the|this) .{1,80}\babout)\b",
+    re.IGNORECASE,
+)
+
+_failures: Dict[uuid.UUID, int] = {}
+_summaries_pending: Optional[asyncio.Event] = None
+_index_state: Optional["DocumentIndexState"] = None
+
+
+@dataclass
+class DocumentIndexState:
+    """How many documents retrieval can find through the summary index."""
+
+    summarized: int
+    loaded_at: float
+
+
+@dataclass
+class DocumentSelection:
+    """Outcome of the document stage of a retrieval."""
+
+    stage: str  # summaries, narrowed, full
+    document_ids: Optional[List[uuid.UUID]] = None
+    passages: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def is_summary_query(query: str) -> bool:
+    """Whether a question asks for a summary or overview."""
+    return bool(SUMMARY_QUERY.search(query))
+
+
+def sample_texts(texts: List[str], budget: int = SUMMARY_INPUT_TOKENS) -> List[str]:
+    """Chunk texts fitting the token budget, evenly spread over the document."""
+    counts = [count_tokens(t) for t in texts]
+    total = sum(counts)
+    if total <= budget:
+        return texts
+    keep = max(1, int(len(texts) * budget / total))
+    step = len(texts) / keep
+    return [texts[int(i * step)] for i in range(keep)]
+
+
+def _get_pending_event() -> asyncio.Event:
+    global _summaries_pending
+    if _summaries_pending is None:
+        _summaries_pending = asyncio.Event()
+    return _summaries_pending
+
+
+def wake_summary_worker() -> None:
+    """Wake the summary worker in this process after documents changed."""
+    global _index_state
+    _index_state = None
+    _get_pending_event().set()
+
+
+async def generate_summary(name: str, texts: List[str]) -> str:
+    """Summarize a document from its chunk texts (sampled to fit the budget).
+
+    Args:
+        name: Document name
+        texts: Chunk texts in document order
+
+    Returns:
+        Summary text
+    """
+    excerpts = "\n\n".join(sample_texts(texts))
+    summary = await llm_gateway.complete(
+        [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"Document: {name}\n\nExcerpts:\n{excerpts}"},
+        ],
+        model=SUMMARY_MODEL,
+        temperature=0.2,
+        max_tokens=SUMMARY_MAX_TOKENS,
+        priority=Priority.BACKGROUND,
+        purpose="summary",
+    )
+    return summary.strip()
+
+
+async def summarize_document(db: AsyncSession, document_id: uuid.UUID) -> Optional[str]:
+    """Generate, embed and store the summary of one document.
+
+    Args:
+        db: Database session
+        document_id: Document UUID
+
+    Returns:
+        The summary, or None if the document is gone or has no chunks
+    """
+    document = await db.get(Document, document_id)
+    if document is None:
+        return None
+    result = await db.execute(
+        select(DocumentChunk.text)
+        .where(DocumentChunk.document_id == document_id)
+        .order_by(DocumentChunk.chunk_index)
+    )
+    texts = list(result.scalars().all())
+    if not texts:
+        return None
+
+    summary = await generate_summary(document.name, texts)
+    [embedding] = await get_embeddings(
+        [f"{document.name}\n\n{summary}"], priority=Priority.BACKGROUND
+    )
+    await upsert_document_summary(
+        document.id,
+        embedding,
+        {
+            "name": document.name,
+            "source": f"{document.source.value} - {document.name}",
+            "summary": summary,
+        },
+    )
+    document.summary = summary
+    await db.commit()
+    return summary
+
+
+async def summarize_pending(limit: int = SUMMARY_BATCH_SIZE) -> int:
+    """Summarize up to ``limit`` indexed documents that have no summary yet.
+
+    Documents failing SUMMARY_MAX_ATTEMPTS times are skipped until the
+    process restarts.
+
+    Returns:
+        Number of documents summarized
+    """
+    exhausted = [doc_id for doc_id, n in _failures.items() if n >= SUMMARY_MAX_ATTEMPTS]
+    async with get_db_context() as db:
+        stmt = select(Document.id).where(
+            Document.summary.is_(None),
+            Document.status == DocumentStatus.INDEXED.value,
+        )
+        if exhausted:
+            stmt = stmt.where(Document.id.not_in(exhausted))
+        result = await db.execute(stmt.order_by(Document.created_at).limit(limit))
+        document_ids = list(result.scalars().all())
+
+    summarized = 0
+    for document_id in document_ids:
+        try:
+            async with get_db_context() as db:
+                if await summarize_document(db, document_id) is not None:
+                    summarized += 1
+                    _failures.pop(document_id, None)
+                else:
+                    _failures[document_id] = SUMMARY_MAX_ATTEMPTS
+        except Exception as e:
+            _failures[document_id] = _failures.get(document_id, 0) + 1
+            logger.warning(f"Summary of document {document_id} failed: {e}")
+
+    if summarized:
+        global _index_state
+        _index_state = None
+    return summarized
+
+
+async def summary_worker() -> None:
+    """Background worker building missing document summaries."""
+    pending = _get_pending_event()
+    while True:
+        try:
+            summarized = await summarize_pending()
+            if summarized:
+                logger.info(f"Summary index: {summarized} documents summarized")
+                continue
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Summary worker error: {e}")
+        try:
+            await asyncio.wait_for(pending.wait(), timeout=SUMMARY_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        pending.clear()
+
+
+async def get_index_state(db: AsyncSession) -> DocumentIndexState:
+    """Summarized document count (cached briefly)."""
+    global _index_state
+    now = time.monotonic()
+    if _index_state is None or now - _index_state.loaded_at > DOCUMENT_INDEX_TTL_SECONDS:
+        summarized = await db.scalar(
+            select(func.count())
+            .select_from(Document)
+            .where(
+                Document.status == DocumentStatus.INDEXED.value,
+                Document.summary.is_not(None),
+            )
+        )
+        _index_state = DocumentIndexState(summarized=summarized or 0, loaded_at=now)
+    return _index_state
+
+
+async def get_unsummarized_ids(db: AsyncSession, limit: int) -> List[uuid.UUID]:
+    """Indexed documents still waiting for a summary, at most ``limit``.
+
+    Not cached: documents indexed by another process (e.g. the standalone
+    worker) must be searchable as soon as they are committed.
+    """
+    result = await db.execute(
+        select(Document.id)
+        .where(
+            Document.status == DocumentStatus.INDEXED.value,
+            Document.summary.is_(None),
+        )
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+def summary_passage(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """A summary search hit as a context passage."""
+    return {
+        "chunk_id": f"summary:{hit['document_id']}",
+        "document_id": hit["document_id"],
+        "chunk_index": None,
+        "text": hit["summary"],
+        "source": hit["source"],
+        "page": None,
+        "score": hit["score"],
+        "citation": f"[{hit['name']} summary]",
+        "search_type": "summary",
+    }
+
+
+async def select_documents(
+    query: str,
+    query_vector: List[float],
+    db: AsyncSession,
+) -> DocumentSelection:
+    """First retrieval stage: pick the documents worth searching.
+
+    Args:
+        query: User query
+        query_vector: Query embedding
+        db: Database session
+
+    Returns:
+        DocumentSelection: ``summaries`` with summary passages for
+        summary-style questions, ``narrowed`` with the documents to search,
+        or ``full`` to search every document
+    """
+    if not SUMMARY_INDEX_ENABLED:
+        return DocumentSelection(stage="full")
+
+    state = await get_index_state(db)
+    summary_query = is_summary_query(query)
+    if not state.summarized:
+        return DocumentSelection(stage="full")
+    pending_ids: List[uuid.UUID] = []
+    if not summary_query:
+        if state.summarized < DOCUMENT_INDEX_MIN_DOCS:
+            return DocumentSelection(stage="full")
+        pending_ids = await get_unsummarized_ids(db, limit=state.summarized + 1)
+        if len(pending_ids) > state.summarized:
+            return DocumentSelection(stage="full")
+
+    try:
+        hits = await search_document_summaries(query_vector, top_k=DOCUMENT_TOP_M)
+    except Exception as e:
+        logger.warning(f"Summary index search failed, searching all documents: {e}")
+        return DocumentSelection(stage="full")
+    if not hits:
+        return DocumentSelection(stage="full")
+
+    if summary_query:
+        return DocumentSelection(
+            stage="summaries",
+            passages=[summary_passage(hit) for hit in hits[:SUMMARY_PASSAGES]],
+        )
+    # Documents without a summary yet can't be ranked, so they stay searchable
+    return DocumentSelection(
+        stage="narrowed",
+        document_ids=[uuid.UUID(hit["document_id"]) for hit in hits] + pending_ids,
+    )
@@ -0,0 +1,187 @@
+"""Persistent, content-addressed embedding store.
+
+Embeddings are cached in the ``embedding_cache`` table keyed by
+(model, dimensions, sha256 of the normalized chunk text). All ingestion
+paths embed through ``embed_chunks``, which:
+
+1. hashes every text and de-duplicates within the request
+2. looks the hashes up in one query per ``LOOKUP_BATCH_SIZE`` keys
+3. calls the embeddings API only for misses
+4. writes the new vectors back with ``ON CONFLICT DO NOTHING``
+
+Re-uploads, no-op reindexes and boilerplate repeated across reports
+therefore cost no API calls. The store is an optimization only: if it
+cannot be read or written, embedding falls back to the API.
+"""
+import hashlib
+import re
+import sys
+import unicodedata
+from array import array
+from typing import Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from backend.db import get_db_context
+from backend.models import EmbeddingCacheEntry
+from backend.observability.metrics import EMBEDDING_STORE_LOOKUPS
+from backend.services.embeddings import (
+    EMBED_DIMENSIONS,
+    EMBED_MODEL,
+    EmbeddingStats,
+    get_embeddings,
+)
+from backend.services.rate_limiter import Priority
+
+# Hashes per SELECT ... WHERE content_hash IN (...)
+LOOKUP_BATCH_SIZE = 1000
+
+# Rows per INSERT ... ON CONFLICT DO NOTHING
+WRITE_BATCH_SIZE = 500
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing (Unicode NFC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    """Pack a vector as little-endian float32."""
+    packed = array("f", vector)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    """Inverse of ``pack_vector``."""
+    packed = array("f")
+    packed.frombytes(data)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+
+async def lookup_embeddings(
+    hashes: List[str],
+    model: str = EMBED_MODEL,
+    dimensions: int = EMBED_DIMENSIONS,
+) -> Dict[str, List[float]]:
+    """Fetch stored embeddings for the given content hashes.
+
+    Args:
+        hashes: Content hashes to look up (should be unique)
+        model: Embedding model name
+        dimensions: Vector dimensions
+
+    Returns:
+        Mapping of content hash to vector for every hit
+    """
+    found: Dict[str, List[float]] = {}
+    async with get_db_context() as db:
+        for i in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            batch = hashes[i:i + LOOKUP_BATCH_SIZE]
+            result = await db.execute(
+                select(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding).where(
+                    EmbeddingCacheEntry.model == model,
+                    EmbeddingCacheEntry.dimensions == dimensions,
+                    EmbeddingCacheEntry.content_hash.in_(batch),
+                )
+            )
+            for digest, data in result.all():
+                found[digest] = unpack_vector(data)
+    return found
+
+
+async def store_embeddings(
+    vectors: Dict[str, List[float]],
+    model: str = EMBED_MODEL,
+    dimensions: int = EMBED_DIMENSIONS,
+) -> None:
+    """Persist embeddings, ignoring hashes that are already stored.
+
+    Args:
+        vectors: Mapping of content hash to vector
+        model: Embedding model name
+        dimensions: Vector dimensions
+    """
+    rows = [
+        {
+            "model": model,
+            "dimensions": dimensions,
+            "content_hash": digest,
+            "embedding": pack_vector(vector),
+        }
+        for digest, vector in vectors.items()
+    ]
+    async with get_db_context() as db:
+        for i in range(0, len(rows), WRITE_BATCH_SIZE):
+            stmt = pg_insert(EmbeddingCacheEntry).values(rows[i:i + WRITE_BATCH_SIZE])
+            await db.execute(stmt.on_conflict_do_nothing())
+
+
+async def embed_chunks(
+    texts: List[str],
+    stats: Optional[EmbeddingStats] = None,
+    priority: Priority = Priority.BACKGROUND,
+) -> List[List[float]]:
+    """Embed chunk texts, reusing stored embeddings where possible.
+
+    Args:
+        texts: Chunk texts to embed
+        stats: Optional stats object; ``cache_hits`` counts reused texts
+        priority: Rate scheduler class for API calls on misses
+
+    Returns:
+        Embedding vectors in the same order as ``texts``
+    """
+    stats = stats if stats is not None else EmbeddingStats()
+    if not texts:
+        return []
+
+    hashes = [content_hash(t) for t in texts]
+
+    # First occurrence of each hash is the one sent to the API
+    first_index: Dict[str, int] = {}
+    for idx, digest in enumerate(hashes):
+        first_index.setdefault(digest, idx)
+
+    try:
+        vectors = await lookup_embeddings(list(first_index))
+    except Exception as e:
+        logger.warning(f"Embedding store lookup failed, embedding all texts: {e}")
+        vectors = {}
+
+    misses = [digest for digest in first_index if digest not in vectors]
+    stats.cache_hits += sum(1 for digest in hashes if digest in vectors)
+    EMBEDDING_STORE_LOOKUPS.labels(result="hit").inc(len(first_index) - len(misses))
+    EMBEDDING_STORE_LOOKUPS.labels(result="miss").inc(len(misses))
+
+    if misses:
+        new_vectors = await get_embeddings(
+            [texts[first_index[digest]] for digest in misses],
+            stats=stats,
+            priority=priority,
+        )
+        fresh = dict(zip(misses, new_vectors))
+        vectors.update(fresh)
+        try:
+            await store_embeddings(fresh)
+        except Exception as e:
+            logger.warning(f"Could not persist {len(fresh)} embeddings: {e}")
+
+    logger.info(
+        f"Embedding store: {len(texts)} texts, {len(first_index)} unique, "
+        f"{len(misses)} embedded via API"
+    )
+
+    return [vectors[digest] for digest in hashes]
@@ -1,70 +1,315 @@
-"""OpenAI embeddings service for RAG."""
+"""OpenAI embeddings service for RAG.
+
+Bulk embedding goes through a token-aware batcher:
+
+- batches are packed by token count as well as item count, so long chunks
+  never push a request over the API's per-request token limit
+- up to ``EMBED_CONCURRENCY`` batches are in flight at once
+- each batch is retried independently with backoff (``services/retry.py``);
+  a batch rejected as too large is split in half and retried, any other
+  rejected request fails at once with an ``EmbeddingRequestError`` naming
+  the inputs
+- output order always matches input order
+
+All calls are admitted through the process-wide rate scheduler: query
+embeddings are interactive, bulk embeddings default to background. Requests
+use the gateway's pooled client (``services/llm_gateway.py``).
+"""
+import asyncio
 import os
+import time
+from dataclasses import dataclass
 from typing import List, Optional
 
-from openai import AsyncOpenAI
+from loguru import logger
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
 
-# Lazy-load client to allow startup without API key
-_client: Optional[AsyncOpenAI] = None
+from backend.observability.metrics import (
+    EMBEDDING_BATCH_DURATION,
+    EMBEDDING_RETRIES,
+    EMBEDDING_THROUGHPUT,
+    EMBEDDINGS_CREATED,
+)
+from backend.services.chunking import count_tokens
+from backend.services.llm_gateway import get_client
+from backend.services.rate_limiter import Priority, get_rate_scheduler
+from backend.services.retry import retry_async
+from backend.services.singleflight import fingerprint, get_singleflight
 
 EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
 EMBED_DIMENSIONS = 1536  # text-embedding-3-small default
 
+# Batching limits (the API allows 2048 inputs / 300k tokens per request)
+EMBED_MAX_BATCH_ITEMS = int(os.getenv("EMBED_MAX_BATCH_ITEMS", "256"))
+EMBED_MAX_BATCH_TOKENS = int(os.getenv("EMBED_MAX_BATCH_TOKENS", "100000"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+
+# Transient errors worth retrying; anything else fails the batch
+RETRYABLE_ERRORS = (
+    RateLimitError,
+    APITimeoutError,
+    APIConnectionError,
+    InternalServerError,
+)
+
+# Error code and message fragments of requests over a size or token limit
+REQUEST_TOO_LARGE_CODES = ("max_tokens_per_request",)
+REQUEST_TOO_LARGE_MESSAGES = (
+    "tokens per request",
+    "maximum context length",
+    "too many tokens",
+    "too many inputs",
+    "maximum request size",
+)
+
+
+class EmbeddingRequestError(Exception):
+    """Raised when the API rejects an embedding request for its inputs."""
+    pass
+
 
-def _get_client() -> AsyncOpenAI:
-    """Get or create the OpenAI client (lazy initialization)."""
-    global _client
-    if _client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key or api_key.startswith("sk-placeholder"):
-            raise ValueError(
-                "OPENAI_API_KEY environment variable is required for embeddings. "
-                "Set a valid API key to use RAG features."
-            )
-        _client = AsyncOpenAI(api_key=api_key)
-    return _client
+def is_request_too_large(error: BadRequestError) -> bool:
+    """Whether a rejected request was over a size or token limit."""
+    if error.code in REQUEST_TOO_LARGE_CODES:
+        return True
+    message = str(error.message).lower()
+    return any(fragment in message for fragment in REQUEST_TOO_LARGE_MESSAGES)
+
+
+@dataclass
+class EmbeddingStats:
+    """Counters for one batched embedding run."""
+
+    texts: int = 0
+    tokens: int = 0
+    api_calls: int = 0
+    retries: int = 0
+    splits: int = 0
+    cache_hits: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def embeddings_per_second(self) -> float:
+        """Throughput of the run."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.texts / self.elapsed_seconds
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "texts": self.texts,
+            "tokens": self.tokens,
+            "api_calls": self.api_calls,
+            "retries": self.retries,
+            "splits": self.splits,
+            "cache_hits": self.cache_hits,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "embeddings_per_second": round(self.embeddings_per_second, 1),
+        }
 
 
 async def get_embedding(text: str) -> List[float]:
     """
     Get embedding vector for a single text.
 
+    Concurrent calls for the same text share one API request.
+
     Args:
         text: Text to embed
 
     Returns:
         Embedding vector as list of floats
     """
-    client = _get_client()
-    response = await client.embeddings.create(
-        model=EMBED_MODEL,
-        input=text,
+    async def create() -> List[float]:
+        client = get_client()
+        await get_rate_scheduler("embeddings").acquire(count_tokens(text), Priority.INTERACTIVE)
+        response = await client.embeddings.create(
+            model=EMBED_MODEL,
+            input=text,
+        )
+        return response.data[0].embedding
+
+    return await get_singleflight("embeddings").do(fingerprint(EMBED_MODEL, text), create)
+
+
+def pack_batches(
+    token_counts: List[int],
+    max_items: int = EMBED_MAX_BATCH_ITEMS,
+    max_tokens: int = EMBED_MAX_BATCH_TOKENS,
+) -> List[List[int]]:
+    """
+    Greedily pack consecutive texts into batches under both limits.
+
+    A single text larger than ``max_tokens`` gets a batch of its own.
+
+    Args:
+        token_counts: Token count per text
+        max_items: Maximum texts per batch
+        max_tokens: Maximum total tokens per batch
+
+    Returns:
+        List of batches, each a list of indexes into the input
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for idx, tokens in enumerate(token_counts):
+        if current and (
+            len(current) >= max_items or current_tokens + tokens > max_tokens
+        ):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(idx)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+async def _embed_batch(
+    texts: List[str],
+    indexes: List[int],
+    token_counts: List[int],
+    results: List[Optional[List[float]]],
+    stats: EmbeddingStats,
+    priority: Priority,
+) -> None:
+    """Embed one batch, writing vectors into ``results`` by input index."""
+    client = get_client()
+    scheduler = get_rate_scheduler("embeddings")
+    batch = [texts[i] for i in indexes]
+    batch_tokens = sum(token_counts[i] for i in indexes)
+
+    async def create():
+        await scheduler.acquire(batch_tokens, priority)
+        stats.api_calls += 1
+        start = time.perf_counter()
+        response = await client.embeddings.create(model=EMBED_MODEL, input=batch)
+        EMBEDDING_BATCH_DURATION.observe(time.perf_counter() - start)
+        return response
+
+    def on_retry(attempt: int, error: Exception) -> None:
+        stats.retries += 1
+        EMBEDDING_RETRIES.inc()
+        if isinstance(error, RateLimitError):
+            scheduler.rate_limited()
+
+    try:
+        response = await retry_async(
+            create,
+            retryable_exceptions=RETRYABLE_ERRORS,
+            on_retry=on_retry,
+        )
+    except BadRequestError as e:
+        # Over the per-request limit: split and retry the halves
+        if len(indexes) > 1 and is_request_too_large(e):
+            stats.splits += 1
+            mid = len(indexes) // 2
+            await _embed_batch(texts, indexes[:mid], token_counts, results, stats, priority)
+            await _embed_batch(texts, indexes[mid:], token_counts, results, stats, priority)
+            return
+        if len(indexes) == 1:
+            inputs = f"input {indexes[0]} ({batch_tokens} tokens)"
+        else:
+            inputs = f"{len(indexes)} inputs from {indexes[0]} ({batch_tokens} tokens)"
+        raise EmbeddingRequestError(f"Embedding request rejected for {inputs}: {e.message}") from e
+
+    for item in response.data:
+        results[indexes[item.index]] = item.embedding
+
+    stats.texts += len(indexes)
+    stats.tokens += batch_tokens
+
+
+async def embed_batched(
+    texts: List[str],
+    token_counts: Optional[List[int]] = None,
+    max_items: int = EMBED_MAX_BATCH_ITEMS,
+    max_tokens: int = EMBED_MAX_BATCH_TOKENS,
+    concurrency: int = EMBED_CONCURRENCY,
+    stats: Optional[EmbeddingStats] = None,
+    priority: Priority = Priority.BACKGROUND,
+) -> List[List[float]]:
+    """
+    Embed many texts with token-aware batches and bounded concurrency.
+
+    Args:
+        texts: Texts to embed
+        token_counts: Precomputed token count per text (counted if omitted)
+        max_items: Maximum texts per API request
+        max_tokens: Maximum total tokens per API request
+        concurrency: Maximum API requests in flight
+        stats: Optional stats object to accumulate counters into
+        priority: Rate scheduler class for the API requests
+
+    Returns:
+        Embedding vectors in the same order as ``texts``
+    """
+    stats = stats if stats is not None else EmbeddingStats()
+    if not texts:
+        return []
+
+    if token_counts is None:
+        token_counts = [count_tokens(t) for t in texts]
+
+    batches = pack_batches(token_counts, max_items=max_items, max_tokens=max_tokens)
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(indexes: List[int]) -> None:
+        async with semaphore:
+            await _embed_batch(texts, indexes, token_counts, results, stats, priority)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(b) for b in batches))
+    stats.elapsed_seconds += time.perf_counter() - start
+
+    EMBEDDINGS_CREATED.inc(len(texts))
+    EMBEDDING_THROUGHPUT.observe(stats.embeddings_per_second)
+    logger.info(
+        f"Embedded {len(texts)} texts ({stats.tokens} tokens) in "
+        f"{stats.elapsed_seconds:.2f}s: {stats.embeddings_per_second:.1f} emb/s, "
+        f"{stats.api_calls} calls, {stats.retries} retries"
     )
-    return response.data[0].embedding
 
+    return results  # type: ignore[return-value]
 
-async def get_embeddings(texts: List[str], batch_size: int = 100) -> List[List[float]]:
+
+async def get_embeddings(
+    texts: List[str],
+    batch_size: int = EMBED_MAX_BATCH_ITEMS,
+    token_counts: Optional[List[int]] = None,
+    stats: Optional[EmbeddingStats] = None,
+    priority: Priority = Priority.BACKGROUND,
+) -> List[List[float]]:
     """
     Get embedding vectors for multiple texts.
 
     Args:
         texts: List of texts to embed
-        batch_size: Number of texts to process per API call
+        batch_size: Maximum number of texts per API call
+        token_counts: Optional precomputed token count per text
+        stats: Optional stats object to accumulate counters into
+        priority: Rate scheduler class (bulk ingestion is background)
 
     Returns:
         List of embedding vectors
     """
-    embeddings = []
-    client = _get_client()
-
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-        response = await client.embeddings.create(
-            model=EMBED_MODEL,
-            input=batch,
-        )
-        # Sort by index to maintain order
-        batch_embeddings = sorted(response.data, key=lambda x: x.index)
-        embeddings.extend([e.embedding for e in batch_embeddings])
-
-    return embeddings
+    return await embed_batched(
+        texts,
+        token_counts=token_counts,
+        max_items=batch_size,
+        stats=stats,
+        priority=priority,
+    )
@@ -0,0 +1,123 @@
+"""PDF text extraction.
+
+The PDF/OCR stack (pypdf, pdfplumber, pdf2image, pytesseract) is imported
+lazily inside the extractor, so processes that never extract text (the API
+when ingestion runs in ``backend.worker``) don't pay for loading it.
+
+Extraction is CPU-bound and blocking; async callers should use
+``extract_pdf_text_async``, which runs it in a worker thread instead of on
+the event loop.
+"""
+import asyncio
+import gc
+from pathlib import Path
+from typing import Callable, Optional
+
+# Called after each page with (extractor, pages_done, total_pages)
+PageCallback = Callable[[str, int, int], None]
+
+
+def extract_pdf_text(
+    file_path: Path,
+    on_page: Optional[PageCallback] = None,
+) -> tuple[str, list[int]]:
+    """
+    Extract text from PDF file using pypdf, pdfplumber, or OCR as fallback.
+
+    Args:
+        file_path: Path to PDF file
+        on_page: Optional progress callback, called from the extracting
+                 thread after each page with (extractor, pages_done, total)
+
+    Returns:
+        Tuple of (full_text, page_breaks) where page_breaks is list of char positions
+    """
+    full_text = ""
+    page_breaks = []
+
+    # Try pypdf first (fastest for embedded text)
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(file_path)
+        total_pages = len(reader.pages)
+        for i, page in enumerate(reader.pages, 1):
+            page_breaks.append(len(full_text))
+            page_text = page.extract_text() or ""
+            full_text += page_text + "\n\n"
+            if on_page:
+                on_page("pypdf", i, total_pages)
+    except Exception:
+        pass  # Fall through to pdfplumber
+
+    # If pypdf didn't extract much text, try pdfplumber
+    if len(full_text.strip()) < 100:
+        full_text = ""
+        page_breaks = []
+        try:
+            import pdfplumber
+
+            with pdfplumber.open(file_path) as pdf:
+                total_pages = len(pdf.pages)
+                for i, page in enumerate(pdf.pages, 1):
+                    page_breaks.append(len(full_text))
+                    page_text = page.extract_text() or ""
+                    full_text += page_text + "\n\n"
+                    if on_page:
+                        on_page("pdfplumber", i, total_pages)
+        except Exception:
+            pass  # Fall through to OCR
+
+    # If still no text, try OCR (for scanned PDFs)
+    if len(full_text.strip()) < 100:
+        full_text = ""
+        page_breaks = []
+        try:
+            # Process one page at a time to reduce memory usage
+            # Use lower DPI (150 instead of 200) to save memory
+            import pytesseract
+            from pdf2image import convert_from_path
+            from pdf2image.pdf2image import pdfinfo_from_path
+
+            info = pdfinfo_from_path(file_path)
+            num_pages = info.get("Pages", 1)
+
+            for page_num in range(1, num_pages + 1):
+                page_breaks.append(len(full_text))
+                # Convert single page at a time
+                images = convert_from_path(
+                    file_path,
+                    dpi=150,  # Lower DPI to reduce memory
+                    first_page=page_num,
+                    last_page=page_num
+                )
+                if images:
+                    page_text = pytesseract.image_to_string(images[0]) or ""
+                    full_text += page_text + "\n\n"
+                    # Explicitly free memory
+                    del images
+                    gc.collect()
+                if on_page:
+                    on_page("ocr", page_num, num_pages)
+        except Exception as e:
+            raise RuntimeError(f"OCR extraction failed: {e}")
+
+    return full_text.strip(), page_breaks
+
+
+async def extract_pdf_text_async(
+    file_path: Path,
+    on_page: Optional[PageCallback] = None,
+) -> tuple[str, list[int]]:
+    """Run ``extract_pdf_text`` in a worker thread."""
+    return await asyncio.to_thread(extract_pdf_text, file_path, on_page)
+
+
+def determine_page(char_start: int, page_breaks: list[int]) -> int | None:
+    """Determine page number from character position."""
+    if not page_breaks:
+        return None
+    for i, break_pos in enumerate(page_breaks):
+        if char_start < break_pos:
+            return i  # 0-indexed page before this break
+    return len(page_breaks)  # Last page
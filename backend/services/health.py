@@ -15,10 +15,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from openai import AsyncOpenAI
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.services.llm_gateway import get_client as get_openai_client
 from backend.services.qdrant import get_client
 
 
@@ -139,7 +139,7 @@ async def check_openai() -> ServiceHealth:
                 last_checked=datetime.utcnow(),
             )
 
-        client = AsyncOpenAI(api_key=api_key)
+        client = get_openai_client()
 
         # Minimal API call to verify connectivity
         await asyncio.wait_for(
@@ -1,23 +1,98 @@
 """Background ingestion job service.
 
 Handles async document ingestion with job tracking and status polling.
-Jobs are stored in PostgreSQL for persistence across restarts.
+Jobs are stored in the ``ingestion_jobs`` table, so they survive restarts
+and are visible from every API replica:
+
+- workers lease queued jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+  any number of workers (tasks, processes, replicas) can run side by side
+- jobs of a bulk batch (``services/bulk_ingest.py``) are leased only while
+  fewer than the batch's ``max_parallel`` of them are running
+- a leased job is kept alive by heartbeats; if a worker dies, its lease
+  expires and another worker re-runs the job (up to INGESTION_MAX_ATTEMPTS).
+  A worker that loses its lease stops the job, and its progress and status
+  updates are fenced on ``worker_id`` so they can't overwrite the new owner's
+- each stage (extract, chunk, store, embed+upsert per batch) records a
+  checkpoint plus on-disk artifacts (``services/job_checkpoints.py``), so
+  retried or resumed jobs continue where they stopped
+- each job records stage wall times, page/chunk/token counts and peak
+  extraction RSS (``services/job_metrics.py``)
+- stage transitions and fine-grained progress are published as job events
+  (``services/job_events.py``) for the SSE endpoints
+- finished jobs are purged after INGESTION_JOB_RETENTION_DAYS
 """
 import asyncio
+import os
+import socket
+import time
 import uuid
-from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from loguru import logger
 from pydantic import BaseModel
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import aliased
 
 from backend.db import get_db_context
-from backend.models import Document, DocumentChunk, DocumentSource, DocumentType
-from backend.services.chunking import chunk_text
-from backend.services.embeddings import get_embeddings
-from backend.services.qdrant import upsert_chunks
+from backend.models import (
+    Document,
+    DocumentChunk,
+    DocumentSource,
+    DocumentStatus,
+    DocumentType,
+    IngestionBatch,
+    IngestionJobRecord,
+)
+from backend.services.chunk_loader import bulk_insert_chunks
+from backend.services.chunking import chunk_text, get_chunk_profile
+from backend.services.document_summaries import (
+    SUMMARY_INDEX_ENABLED,
+    summary_worker,
+    wake_summary_worker,
+)
+from backend.services.embedding_store import embed_chunks
+from backend.services.embeddings import EmbeddingStats
+from backend.services.extraction import PageCallback, determine_page, extract_pdf_text_async
+from backend.services.job_checkpoints import (
+    load_chunks,
+    load_embedding_batch,
+    load_extracted,
+    remove_artifacts,
+    save_chunks,
+    save_embedding_batch,
+    save_extracted,
+    stage_done,
+)
+from backend.services.job_events import publish_job_event
+from backend.services.job_metrics import JobMetrics
+from backend.services.qdrant import mark_document_indexed, upsert_chunks
+
+STORAGE_PATH = Path(os.getenv("STORAGE_PATH", "storage"))
+
+# Concurrent ingestion workers per process
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+
+# Lease handling
+LEASE_SECONDS = int(os.getenv("INGESTION_LEASE_SECONDS", "300"))
+HEARTBEAT_SECONDS = int(os.getenv("INGESTION_HEARTBEAT_SECONDS", "30"))
+MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+
+# Idle workers poll for new jobs at this interval
+POLL_INTERVAL_SECONDS = float(os.getenv("INGESTION_POLL_INTERVAL", "2.0"))
+
+# Chunks embedded and upserted per checkpointed batch
+INGESTION_BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "256"))
+
+# Minimum interval between page progress events of one job
+PAGE_EVENT_INTERVAL_SECONDS = 1.0
+
+# Finished jobs older than this are deleted
+JOB_RETENTION_DAYS = int(os.getenv("INGESTION_JOB_RETENTION_DAYS", "14"))
+MAINTENANCE_INTERVAL_SECONDS = 3600
 
 
 class JobStatus(str, Enum):
@@ -28,6 +103,10 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+class LeaseLostError(Exception):
+    """The worker's lease on a job expired and another worker took it over."""
+
+
 class IngestionJob(BaseModel):
     """Ingestion job state."""
     job_id: str
@@ -35,73 +114,151 @@ class IngestionJob(BaseModel):
     file_path: str
     doc_type: str
     source: str
+    file_hash: Optional[str] = None
+    batch_id: Optional[str] = None
     status: JobStatus = JobStatus.QUEUED
     progress: int = 0  # Percentage 0-100
     chunks_count: int = 0
     document_id: Optional[str] = None
     error_message: Optional[str] = None
-    created_at: datetime = datetime.now(timezone.utc)
-    updated_at: datetime = datetime.now(timezone.utc)
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    checkpoint: Dict[str, Any] = {}
+    metrics: Dict[str, Any] = {}
+    created_at: datetime
+    updated_at: datetime
     completed_at: Optional[datetime] = None
-    
+
     class Config:
         use_enum_values = True
 
 
-# In-memory job storage (for demo - production would use Redis or DB table)
-# This is sufficient for single-instance demos
-_jobs: Dict[str, IngestionJob] = {}
+# Worker tasks running in this process
+_worker_tasks: List[asyncio.Task] = []
+
+# Wakes idle workers in this process when a job is created here
+_work_available: Optional[asyncio.Event] = None
+
+
+def _get_work_event() -> asyncio.Event:
+    global _work_available
+    if _work_available is None:
+        _work_available = asyncio.Event()
+    return _work_available
 
-# Background task queue
-_task_queue: asyncio.Queue = asyncio.Queue()
-_worker_task: Optional[asyncio.Task] = None
 
+def wake_workers() -> None:
+    """Wake idle workers in this process after queueing jobs."""
+    _get_work_event().set()
 
-def create_job(
+
+def _to_job(record: IngestionJobRecord) -> IngestionJob:
+    """Convert a job row to the API model."""
+    return IngestionJob(
+        job_id=str(record.id),
+        document_name=record.document_name,
+        file_path=record.file_path,
+        doc_type=record.doc_type,
+        source=record.source,
+        file_hash=record.file_hash,
+        batch_id=str(record.batch_id) if record.batch_id else None,
+        status=JobStatus(record.status),
+        progress=record.progress,
+        chunks_count=record.chunks_count,
+        document_id=str(record.document_id) if record.document_id else None,
+        error_message=record.error_message,
+        attempts=record.attempts,
+        worker_id=record.worker_id,
+        checkpoint=record.checkpoint or {},
+        metrics=record.metrics or {},
+        created_at=record.created_at,
+        updated_at=record.updated_at,
+        completed_at=record.completed_at,
+    )
+
+
+async def create_job(
     document_name: str,
     file_path: str,
     doc_type: str,
     source: str,
+    file_hash: Optional[str] = None,
+    existing_document_id: Optional[str] = None,
+    existing_chunks_count: int = 0,
 ) -> IngestionJob:
     """Create a new ingestion job.
-    
+
     Args:
         document_name: Name of the document
         file_path: Path to the uploaded file
         doc_type: Document type enum value
         source: Document source enum value
-        
+        file_hash: SHA-256 of the uploaded file
+        existing_document_id: If set, the file is a duplicate of this
+            document and the job is created already done
+        existing_chunks_count: Chunk count of the existing document
+
     Returns:
         Created IngestionJob
     """
-    job = IngestionJob(
-        job_id=str(uuid.uuid4()),
+    record = IngestionJobRecord(
+        id=uuid.uuid4(),
         document_name=document_name,
         file_path=file_path,
         doc_type=doc_type,
         source=source,
-        status=JobStatus.QUEUED,
+        file_hash=file_hash,
+        status=JobStatus.QUEUED.value,
+        progress=0,
+        chunks_count=0,
+        attempts=0,
+        checkpoint={},
+        metrics={},
     )
-    _jobs[job.job_id] = job
+    if existing_document_id:
+        record.status = JobStatus.DONE.value
+        record.progress = 100
+        record.document_id = uuid.UUID(existing_document_id)
+        record.chunks_count = existing_chunks_count
+        record.completed_at = datetime.now(timezone.utc)
+
+    async with get_db_context() as db:
+        db.add(record)
+        await db.flush()
+        job = _to_job(record)
+
+    if not existing_document_id:
+        _get_work_event().set()
+    await publish_job_event(job.job_id, "stage", stage=job.status, progress=job.progress)
     logger.info(f"Created ingestion job {job.job_id} for {document_name}")
     return job
 
 
-def get_job(job_id: str) -> Optional[IngestionJob]:
+async def get_job(job_id: str) -> Optional[IngestionJob]:
     """Get job by ID."""
-    return _jobs.get(job_id)
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        return None
 
+    async with get_db_context() as db:
+        record = await db.get(IngestionJobRecord, job_uuid)
+        return _to_job(record) if record else None
 
-def update_job(
+
+async def update_job(
     job_id: str,
     status: Optional[JobStatus] = None,
     progress: Optional[int] = None,
     error_message: Optional[str] = None,
     document_id: Optional[str] = None,
     chunks_count: Optional[int] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    worker_id: Optional[str] = None,
 ) -> Optional[IngestionJob]:
     """Update job status.
-    
+
     Args:
         job_id: Job ID
         status: New status
@@ -109,193 +266,830 @@ def update_job(
         error_message: Error message if failed
         document_id: Created document ID if done
         chunks_count: Number of chunks created
-        
+        checkpoint: Replacement checkpoint
+        metrics: Replacement job metrics
+        worker_id: Only update the job while this worker holds its lease
+
     Returns:
-        Updated job or None if not found
+        Updated job or None if not found (or the lease was lost)
     """
-    job = _jobs.get(job_id)
-    if not job:
-        return None
-    
+    values: dict = {"updated_at": func.now()}
     if status:
-        job.status = status
+        values["status"] = JobStatus(status).value
     if progress is not None:
-        job.progress = progress
+        values["progress"] = progress
     if error_message:
-        job.error_message = error_message
+        values["error_message"] = error_message
     if document_id:
-        job.document_id = document_id
+        values["document_id"] = uuid.UUID(document_id)
     if chunks_count is not None:
-        job.chunks_count = chunks_count
-    
-    job.updated_at = datetime.now(timezone.utc)
-    
+        values["chunks_count"] = chunks_count
+    if checkpoint is not None:
+        values["checkpoint"] = checkpoint
+    if metrics is not None:
+        values["metrics"] = metrics
+
     if status in (JobStatus.DONE, JobStatus.FAILED):
-        job.completed_at = datetime.now(timezone.utc)
-    
-    _jobs[job_id] = job
-    return job
+        values["completed_at"] = func.now()
+        values["lease_expires_at"] = None
+
+    conditions = [IngestionJobRecord.id == uuid.UUID(job_id)]
+    if worker_id is not None:
+        conditions += [
+            IngestionJobRecord.worker_id == worker_id,
+            IngestionJobRecord.status == JobStatus.RUNNING.value,
+        ]
+
+    async with get_db_context() as db:
+        result = await db.execute(
+            update(IngestionJobRecord)
+            .where(*conditions)
+            .values(**values)
+            .returning(IngestionJobRecord)
+            .execution_options(synchronize_session=False)
+        )
+        record = result.scalar_one_or_none()
+        return _to_job(record) if record else None
+
+
+async def list_jobs(
+    limit: int = 50,
+    statuses: Optional[List[JobStatus]] = None,
+) -> list[IngestionJob]:
+    """List recent jobs, newest first, optionally filtered by status."""
+    stmt = select(IngestionJobRecord)
+    if statuses:
+        stmt = stmt.where(IngestionJobRecord.status.in_([JobStatus(s).value for s in statuses]))
+
+    async with get_db_context() as db:
+        result = await db.execute(
+            stmt.order_by(IngestionJobRecord.created_at.desc()).limit(limit)
+        )
+        return [_to_job(r) for r in result.scalars().all()]
+
+
+# --- Leasing ---
+
+
+async def lease_job(worker_id: str) -> Optional[IngestionJob]:
+    """Atomically lease the oldest runnable job.
 
+    Runnable means queued, or running with an expired lease (its worker
+    died) and attempts left. Concurrent workers skip rows locked by each
+    other instead of blocking. A batch job is only runnable while fewer
+    than ``max_parallel`` jobs of its batch hold a live lease; concurrent
+    leases can overshoot this by at most the number of leasing workers.
 
-def list_jobs(limit: int = 50) -> list[IngestionJob]:
-    """List recent jobs, newest first."""
-    jobs = sorted(
-        _jobs.values(),
-        key=lambda j: j.created_at,
-        reverse=True,
+    Args:
+        worker_id: Identifier of the leasing worker
+
+    Returns:
+        Leased job, or None if nothing is runnable
+    """
+    sibling = aliased(IngestionJobRecord)
+    batch_running = (
+        select(func.count())
+        .where(
+            sibling.batch_id == IngestionJobRecord.batch_id,
+            sibling.status == JobStatus.RUNNING.value,
+            sibling.lease_expires_at >= func.now(),
+        )
+        .scalar_subquery()
+    )
+    batch_limit = (
+        select(IngestionBatch.max_parallel)
+        .where(IngestionBatch.id == IngestionJobRecord.batch_id)
+        .scalar_subquery()
     )
-    return jobs[:limit]
+    runnable = (
+        select(IngestionJobRecord.id)
+        .where(
+            or_(
+                IngestionJobRecord.status == JobStatus.QUEUED.value,
+                and_(
+                    IngestionJobRecord.status == JobStatus.RUNNING.value,
+                    IngestionJobRecord.lease_expires_at < func.now(),
+                    IngestionJobRecord.attempts < MAX_ATTEMPTS,
+                ),
+            ),
+            or_(
+                IngestionJobRecord.batch_id.is_(None),
+                batch_running < batch_limit,
+            ),
+        )
+        .order_by(IngestionJobRecord.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    async with get_db_context() as db:
+        result = await db.execute(
+            update(IngestionJobRecord)
+            .where(IngestionJobRecord.id == runnable)
+            .values(
+                status=JobStatus.RUNNING.value,
+                worker_id=worker_id,
+                attempts=IngestionJobRecord.attempts + 1,
+                lease_expires_at=func.now() + timedelta(seconds=LEASE_SECONDS),
+                heartbeat_at=func.now(),
+                updated_at=func.now(),
+            )
+            .returning(IngestionJobRecord)
+            .execution_options(synchronize_session=False)
+        )
+        record = result.scalar_one_or_none()
+        return _to_job(record) if record else None
+
+
+async def heartbeat(job_id: str, worker_id: str) -> bool:
+    """Extend the lease on a job held by this worker.
+
+    Returns:
+        False if the lease was lost (another worker took the job over)
+    """
+    async with get_db_context() as db:
+        result = await db.execute(
+            update(IngestionJobRecord)
+            .where(
+                IngestionJobRecord.id == uuid.UUID(job_id),
+                IngestionJobRecord.worker_id == worker_id,
+                IngestionJobRecord.status == JobStatus.RUNNING.value,
+            )
+            .values(
+                heartbeat_at=func.now(),
+                lease_expires_at=func.now() + timedelta(seconds=LEASE_SECONDS),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+
+async def _heartbeat_loop(job_id: str, worker_id: str, processing: asyncio.Task) -> None:
+    """Heartbeat a job until cancelled; stop ``processing`` if the lease is lost.
 
+    Returns only when the lease was lost.
+    """
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        try:
+            if not await heartbeat(job_id, worker_id):
+                logger.warning(f"Worker {worker_id} lost lease on job {job_id}, stopping it")
+                processing.cancel()
+                return
+        except Exception as e:
+            logger.warning(f"Heartbeat for job {job_id} failed: {e}")
 
-async def queue_job(job: IngestionJob) -> None:
-    """Add job to processing queue."""
-    await _task_queue.put(job)
-    logger.info(f"Queued ingestion job {job.job_id}")
 
+async def fail_exhausted_jobs() -> int:
+    """Mark jobs whose lease expired on their last attempt as failed."""
+    async with get_db_context() as db:
+        result = await db.execute(
+            update(IngestionJobRecord)
+            .where(
+                IngestionJobRecord.status == JobStatus.RUNNING.value,
+                IngestionJobRecord.lease_expires_at < func.now(),
+                IngestionJobRecord.attempts >= MAX_ATTEMPTS,
+            )
+            .values(
+                status=JobStatus.FAILED.value,
+                error_message=f"Worker lease expired on all {MAX_ATTEMPTS} attempts",
+                completed_at=func.now(),
+                updated_at=func.now(),
+            )
+            .returning(IngestionJobRecord.id, IngestionJobRecord.error_message)
+            .execution_options(synchronize_session=False)
+        )
+        failed = result.all()
 
-async def process_ingestion_job(job: IngestionJob) -> None:
-    """Process a single ingestion job.
-    
-    This runs in the background worker.
+    for job_id, error_message in failed:
+        await _mark_document_failed(job_id)
+        await publish_job_event(
+            str(job_id), "stage", stage=JobStatus.FAILED.value, error_message=error_message
+        )
+    return len(failed)
+
+
+async def purge_old_jobs(retention_days: int = JOB_RETENTION_DAYS) -> int:
+    """Delete finished jobs older than the retention period.
+
+    Returns:
+        Number of jobs deleted
     """
-    from backend.routers.ingest import extract_pdf_text, determine_page, STORAGE_PATH
-    
-    job_id = job.job_id
-    logger.info(f"Starting ingestion job {job_id} for {job.document_name}")
-    
-    try:
-        update_job(job_id, status=JobStatus.RUNNING, progress=0)
-        
-        file_path = Path(job.file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        # Step 1: Extract text (20%)
-        update_job(job_id, progress=10)
-        logger.debug(f"Job {job_id}: Extracting PDF text...")
-        full_text, page_breaks = extract_pdf_text(file_path)
-        
-        if not full_text.strip():
-            raise ValueError("Could not extract text from PDF - empty content")
-        
-        update_job(job_id, progress=20)
-        
-        # Step 2: Chunk text (40%)
-        logger.debug(f"Job {job_id}: Chunking text...")
-        chunks = chunk_text(full_text, chunk_size=600, chunk_overlap=100)
-        
-        if not chunks:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    async with get_db_context() as db:
+        result = await db.execute(
+            delete(IngestionJobRecord)
+            .where(
+                IngestionJobRecord.status.in_([JobStatus.DONE.value, JobStatus.FAILED.value]),
+                IngestionJobRecord.completed_at < cutoff,
+            )
+            .returning(IngestionJobRecord.id)
+        )
+        purged = [str(row[0]) for row in result.all()]
+
+        # Batches whose jobs are all gone
+        await db.execute(
+            delete(IngestionBatch).where(
+                IngestionBatch.created_at < cutoff,
+                ~select(IngestionJobRecord.id)
+                .where(IngestionJobRecord.batch_id == IngestionBatch.id)
+                .exists(),
+            )
+        )
+
+    # Failed jobs keep their artifacts for resuming until purged
+    for job_id in purged:
+        await remove_artifacts(job_id)
+    return len(purged)
+
+
+# --- Processing ---
+
+
+async def _save_progress(job: IngestionJob, **values: Any) -> None:
+    """Update a job held by this worker.
+
+    Raises:
+        LeaseLostError: Another worker took the job over
+    """
+    if await update_job(job.job_id, worker_id=job.worker_id, **values) is None:
+        raise LeaseLostError(f"Lease on job {job.job_id} was lost")
+
+
+async def _emit_stage(job: IngestionJob, stage: str, progress: int, **data: Any) -> None:
+    """Publish a stage transition event."""
+    await publish_job_event(job.job_id, "stage", stage=stage, progress=progress, **data)
+
+
+@asynccontextmanager
+async def _timed_stage(job: IngestionJob, metrics: JobMetrics, stage: str) -> AsyncIterator[None]:
+    """Time a stage and persist that the job is in it."""
+    async with metrics.stage(stage):
+        await _save_progress(job, metrics=metrics.to_dict())
+        yield
+
+
+def _page_progress_callback(job: IngestionJob, metrics: JobMetrics) -> PageCallback:
+    """Build a page callback for the extraction thread.
+
+    Page counts are recorded on every call; events are throttled.
+    """
+    loop = asyncio.get_running_loop()
+    last_sent = 0.0
+
+    def on_page(extractor: str, pages_done: int, total_pages: int) -> None:
+        nonlocal last_sent
+        metrics.record_page(extractor, pages_done)
+        now = time.monotonic()
+        if pages_done < total_pages and now - last_sent < PAGE_EVENT_INTERVAL_SECONDS:
+            return
+        last_sent = now
+        asyncio.run_coroutine_threadsafe(
+            publish_job_event(
+                job.job_id,
+                "progress",
+                stage="extracting",
+                extractor=extractor,
+                pages_extracted=pages_done,
+                pages_total=total_pages,
+            ),
+            loop,
+        )
+
+    return on_page
+
+
+def _advance(checkpoint: Dict[str, Any], stage: str, **values: Any) -> Dict[str, Any]:
+    """Merge ``values`` into a checkpoint, moving it forward to ``stage`` (never back)."""
+    current = checkpoint["stage"] if stage_done(checkpoint, stage) else stage
+    return {**checkpoint, **values, "stage": current}
+
+
+async def _load_stored_chunks(file_id: uuid.UUID) -> Optional[tuple[list[dict], str]]:
+    """Chunks already committed for a job's document, and its chunk profile.
+
+    Returns:
+        (chunks, chunk profile), or None if the document isn't stored yet
+    """
+    async with get_db_context() as db:
+        document = await db.get(Document, file_id)
+        if document is None:
+            return None
+        result = await db.execute(
+            select(
+                DocumentChunk.id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.text,
+                DocumentChunk.source,
+                DocumentChunk.page,
+                DocumentChunk.char_start,
+                DocumentChunk.char_end,
+            )
+            .where(DocumentChunk.document_id == file_id)
+            .order_by(DocumentChunk.chunk_index)
+        )
+        chunks = [
+            {
+                "chunk_id": row.id,
+                "document_id": file_id,
+                "chunk_index": row.chunk_index,
+                "text": row.text,
+                "source": row.source,
+                "page": row.page,
+                "char_start": row.char_start,
+                "char_end": row.char_end,
+            }
+            for row in result.all()
+        ]
+        return chunks, document.chunk_profile
+
+
+async def _load_or_extract(
+    job: IngestionJob,
+    metrics: JobMetrics,
+    file_path: Path,
+) -> tuple[str, list[int]]:
+    """Stage 1: extract text, or reload it from the job's checkpoint."""
+    if stage_done(job.checkpoint, "extracted"):
+        extracted = await load_extracted(job.job_id)
+        if extracted is not None:
+            logger.debug(f"Job {job.job_id}: Reusing extracted text from checkpoint")
+            return extracted
+
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    logger.debug(f"Job {job.job_id}: Extracting PDF text...")
+    await _emit_stage(job, "extracting", 10)
+    async with _timed_stage(job, metrics, "extract"), metrics.sample_rss():
+        full_text, page_breaks = await extract_pdf_text_async(
+            file_path, on_page=_page_progress_callback(job, metrics)
+        )
+    if not full_text.strip():
+        raise ValueError("Could not extract text from PDF - empty content")
+
+    await save_extracted(job.job_id, full_text, page_breaks)
+    metrics.pages = len(page_breaks)
+    # Artifacts can be lost after later stages completed: keep their progress
+    job.checkpoint = _advance(job.checkpoint, "extracted", pages=len(page_breaks))
+    await _save_progress(
+        job, progress=20, checkpoint=job.checkpoint, metrics=metrics.to_dict()
+    )
+    return full_text, page_breaks
+
+
+async def _load_or_chunk(
+    job: IngestionJob,
+    metrics: JobMetrics,
+    file_id: uuid.UUID,
+    full_text: str,
+    page_breaks: list[int],
+) -> list[dict]:
+    """Stage 2: chunk text with stable chunk ids, or reload the chunks.
+
+    Chunks are reloaded from the checkpoint or, if that artifact is gone,
+    from already committed rows, so their ids always match the rows and
+    any points already upserted.
+    """
+    if stage_done(job.checkpoint, "chunked"):
+        chunks = await load_chunks(job.job_id)
+        if chunks is not None:
+            logger.debug(f"Job {job.job_id}: Reusing {len(chunks)} chunks from checkpoint")
+            return chunks
+
+    stored = await _load_stored_chunks(file_id)
+    if stored is not None:
+        chunks, chunk_profile = stored
+        logger.info(f"Job {job.job_id}: Reusing {len(chunks)} chunks already stored")
+        await save_chunks(job.job_id, chunks)
+        metrics.chunks = len(chunks)
+        job.checkpoint = _advance(
+            job.checkpoint, "stored", chunks=len(chunks), chunk_profile=chunk_profile
+        )
+        await _save_progress(
+            job, progress=30, checkpoint=job.checkpoint, metrics=metrics.to_dict()
+        )
+        return chunks
+
+    logger.debug(f"Job {job.job_id}: Chunking text...")
+    await _emit_stage(job, "chunking", 20)
+    async with _timed_stage(job, metrics, "chunk"):
+        profile = get_chunk_profile()
+        raw_chunks = chunk_text(
+            full_text, chunk_size=profile.chunk_size, chunk_overlap=profile.chunk_overlap
+        )
+        if not raw_chunks:
             raise ValueError("No chunks generated from document")
-        
-        update_job(job_id, progress=40)
-        
-        # Step 3: Get embeddings (60%)
-        logger.debug(f"Job {job_id}: Generating embeddings for {len(chunks)} chunks...")
-        chunk_texts = [c[0] for c in chunks]
-        embeddings = await get_embeddings(chunk_texts)
-        update_job(job_id, progress=60)
-        
-        # Step 4: Store in database (80%)
-        logger.debug(f"Job {job_id}: Storing in database...")
+
+        source_ref = f"{DocumentSource(job.source).value} - {job.document_name}"
+        chunks = [
+            {
+                "chunk_id": uuid.uuid4(),
+                "document_id": file_id,
+                "chunk_index": idx,
+                "text": chunk_text_content,
+                "source": source_ref,
+                "page": determine_page(char_start, page_breaks),
+                "char_start": char_start,
+                "char_end": char_end,
+            }
+            for idx, (chunk_text_content, char_start, char_end) in enumerate(raw_chunks)
+        ]
+
+        await save_chunks(job.job_id, chunks)
+
+    metrics.chunks = len(chunks)
+    # New chunk ids: nothing stored or upserted before applies to them
+    job.checkpoint = {
+        "stage": "chunked",
+        "pages": job.checkpoint.get("pages"),
+        "chunks": len(chunks),
+        "chunk_profile": profile.name,
+    }
+    await _save_progress(
+        job, progress=30, checkpoint=job.checkpoint, metrics=metrics.to_dict()
+    )
+    return chunks
+
+
+async def _store_rows(
+    job: IngestionJob,
+    metrics: JobMetrics,
+    file_id: uuid.UUID,
+    file_path: Path,
+    chunks: list[dict],
+) -> None:
+    """Stage 3: write the document and chunk rows in one transaction.
+
+    The document stays ``pending`` (hidden from search, listings and
+    duplicate checks) until ``_mark_indexed`` runs after the last upsert.
+    """
+    if not stage_done(job.checkpoint, "stored"):
+        await _emit_stage(job, "storing", 30, chunks_total=len(chunks))
+        async with _timed_stage(job, metrics, "store"), get_db_context() as db:
+            # The commit may have landed before a crash lost the checkpoint
+            if await db.get(Document, file_id) is None:
+                logger.debug(f"Job {job.job_id}: Storing in database...")
+                db.add(Document(
+                    id=file_id,
+                    name=job.document_name,
+                    type=DocumentType(job.doc_type),
+                    source=DocumentSource(job.source),
+                    file_path=str(file_path.relative_to(STORAGE_PATH.parent)),
+                    file_hash=job.file_hash,
+                    chunk_profile=job.checkpoint.get("chunk_profile", "standard"),
+                    status=DocumentStatus.PENDING.value,
+                ))
+                await bulk_insert_chunks(db, chunks)
+                await db.commit()
+
+        job.checkpoint = {**job.checkpoint, "stage": "stored", "batches_upserted": 0}
+        await _save_progress(
+            job, progress=40, checkpoint=job.checkpoint, metrics=metrics.to_dict()
+        )
+
+
+async def _embed_and_upsert(job: IngestionJob, metrics: JobMetrics, chunks: list[dict]) -> None:
+    """Stage 4: embed and upsert chunks batch by batch.
+
+    Each batch's vectors are saved before the upsert and the checkpoint
+    advances after it, so a resumed job starts at the first batch not yet
+    in Qdrant and never re-embeds a batch it already paid for. Upserts
+    use the stable chunk ids, so repeating one is harmless.
+    """
+    total_batches = (len(chunks) + INGESTION_BATCH_SIZE - 1) // INGESTION_BATCH_SIZE
+    start_batch = job.checkpoint.get("batches_upserted", 0)
+    if start_batch:
+        logger.info(f"Job {job.job_id}: Resuming at batch {start_batch + 1}/{total_batches}")
+    await _emit_stage(
+        job,
+        "embedding",
+        40 + int(60 * start_batch / total_batches),
+        chunks_total=len(chunks),
+        batches_total=total_batches,
+    )
+
+    for batch in range(start_batch, total_batches):
+        batch_chunks = chunks[batch * INGESTION_BATCH_SIZE:(batch + 1) * INGESTION_BATCH_SIZE]
+
+        embeddings = await load_embedding_batch(job.job_id, batch)
+        if embeddings is None or len(embeddings) != len(batch_chunks):
+            stats = EmbeddingStats()
+            async with _timed_stage(job, metrics, "embed"):
+                embeddings = await embed_chunks([c["text"] for c in batch_chunks], stats=stats)
+            metrics.add_embedding_stats(stats)
+            await save_embedding_batch(job.job_id, batch, embeddings)
+
+        done_chunks = batch * INGESTION_BATCH_SIZE + len(batch_chunks)
+        await publish_job_event(
+            job.job_id,
+            "progress",
+            stage="embedding",
+            chunks_embedded=done_chunks,
+            chunks_total=len(chunks),
+        )
+
+        async with metrics.stage("upsert"):
+            await upsert_chunks(batch_chunks, embeddings, indexing=True)
+
+        job.checkpoint = {
+            **job.checkpoint,
+            "batches_upserted": batch + 1,
+            "batches_total": total_batches,
+        }
+        progress = 40 + int(60 * (batch + 1) / total_batches)
+        await _save_progress(
+            job, progress=progress, checkpoint=job.checkpoint, metrics=metrics.to_dict()
+        )
+        await publish_job_event(
+            job.job_id,
+            "progress",
+            stage="embedding",
+            progress=progress,
+            points_upserted=done_chunks,
+            chunks_total=len(chunks),
+            batches_upserted=batch + 1,
+            batches_total=total_batches,
+        )
+
+    job.checkpoint = {**job.checkpoint, "stage": "upserted"}
+
+
+async def _mark_indexed(file_id: uuid.UUID) -> None:
+    """Stage 5: make the document and its vectors searchable.
+
+    Idempotent, so a job resumed after a crash here simply repeats it.
+    """
+    await mark_document_indexed(file_id)
+    async with get_db_context() as db:
+        await db.execute(
+            update(Document)
+            .where(Document.id == file_id)
+            .values(status=DocumentStatus.INDEXED.value)
+        )
+
+
+async def _mark_document_failed(file_id: uuid.UUID) -> None:
+    """Flag the job's document (if already stored) as failed; it stays hidden."""
+    try:
         async with get_db_context() as db:
-            # Create document
-            file_id = uuid.UUID(job_id)  # Use job_id as document ID
-            doc_type_enum = DocumentType(job.doc_type)
-            source_enum = DocumentSource(job.source)
-            source_ref = f"{source_enum.value} - {job.document_name}"
-            
-            document = Document(
-                id=file_id,
-                name=job.document_name,
-                type=doc_type_enum,
-                source=source_enum,
-                file_path=str(file_path.relative_to(STORAGE_PATH.parent)),
+            await db.execute(
+                update(Document)
+                .where(Document.id == file_id, Document.status != DocumentStatus.INDEXED.value)
+                .values(status=DocumentStatus.FAILED.value)
             )
-            db.add(document)
-            
-            # Create chunks
-            qdrant_chunks = []
-            for idx, (chunk_text_content, char_start, char_end) in enumerate(chunks):
-                page_num = determine_page(char_start, page_breaks)
-                chunk_id = uuid.uuid4()
-                
-                chunk = DocumentChunk(
-                    id=chunk_id,
-                    document_id=file_id,
-                    chunk_index=idx,
-                    text=chunk_text_content,
-                    source=source_ref,
-                    page=page_num,
-                )
-                db.add(chunk)
-                
-                qdrant_chunks.append({
-                    "chunk_id": chunk_id,
-                    "document_id": file_id,
-                    "chunk_index": idx,
-                    "text": chunk_text_content,
-                    "source": source_ref,
-                    "page": page_num,
-                })
-            
-            await db.commit()
-        
-        update_job(job_id, progress=80)
-        
-        # Step 5: Upsert to Qdrant (100%)
-        logger.debug(f"Job {job_id}: Upserting to Qdrant...")
-        await upsert_chunks(qdrant_chunks, embeddings)
-        
+    except Exception as e:
+        logger.warning(f"Could not mark document {file_id} as failed: {e}")
+
+
+def _lease_lost(heartbeat_task: asyncio.Task) -> bool:
+    """Whether the heartbeat loop stopped because the lease was lost."""
+    return heartbeat_task.done() and not heartbeat_task.cancelled()
+
+
+async def process_ingestion_job(job: IngestionJob, worker_id: str = "local") -> None:
+    """Process a single leased ingestion job.
+
+    This runs in the background worker. Stages are checkpointed, so a
+    retried or resumed job continues after the last completed stage/batch.
+    Progress is only saved while ``worker_id`` holds the lease; once it is
+    lost, processing stops and the job is left to the worker that took it.
+    """
+    job_id = job.job_id
+    logger.info(
+        f"Worker {worker_id} starting ingestion job {job_id} for {job.document_name} "
+        f"(attempt {job.attempts}, checkpoint {job.checkpoint.get('stage') or 'none'})"
+    )
+    processing = asyncio.current_task()
+    heartbeat_task = asyncio.create_task(_heartbeat_loop(job_id, worker_id, processing))
+    metrics = JobMetrics.from_dict(job.metrics)
+
+    try:
+        file_id = uuid.UUID(job_id)  # Use job_id as document ID
+        file_path = Path(job.file_path)
+
+        full_text, page_breaks = await _load_or_extract(job, metrics, file_path)
+        chunks = await _load_or_chunk(job, metrics, file_id, full_text, page_breaks)
+        await _store_rows(job, metrics, file_id, file_path, chunks)
+        await _embed_and_upsert(job, metrics, chunks)
+        await _mark_indexed(file_id)
+
         # Done!
-        update_job(
-            job_id,
+        metrics.observe_finished()
+        await _save_progress(
+            job,
             status=JobStatus.DONE,
             progress=100,
             document_id=str(file_id),
             chunks_count=len(chunks),
+            checkpoint=job.checkpoint,
+            metrics=metrics.to_dict(),
+        )
+        wake_summary_worker()
+        await remove_artifacts(job_id)
+        await _emit_stage(
+            job, JobStatus.DONE.value, 100,
+            document_id=str(file_id),
+            chunks_count=len(chunks),
+        )
+        logger.info(
+            f"✅ Completed ingestion job {job_id}: {len(chunks)} chunks, "
+            f"stages {metrics.stage_seconds}"
         )
-        logger.info(f"✅ Completed ingestion job {job_id}: {len(chunks)} chunks")
-        
+
+    except asyncio.CancelledError:
+        # Stopped by the heartbeat after losing the lease: the job now
+        # belongs to another worker. Any other cancellation propagates.
+        if not _lease_lost(heartbeat_task) or processing.uncancel():
+            raise
+    except LeaseLostError as e:
+        logger.warning(f"Worker {worker_id} stopped job {job_id}: {e}")
     except Exception as e:
         logger.error(f"❌ Ingestion job {job_id} failed: {e}")
-        update_job(
+        metrics.observe_finished()
+        failed = await update_job(
             job_id,
             status=JobStatus.FAILED,
             error_message=str(e),
+            metrics=metrics.to_dict(),
+            worker_id=worker_id,
         )
+        if failed is None:
+            logger.warning(f"Worker {worker_id} lost lease on job {job_id}; not marking it failed")
+            return
+        await _mark_document_failed(uuid.UUID(job_id))
+        await _emit_stage(job, JobStatus.FAILED.value, job.progress, error_message=str(e))
+    finally:
+        heartbeat_task.cancel()
+
+
+async def resume_jobs(job_ids: Optional[List[str]] = None) -> List[str]:
+    """Requeue failed jobs so workers continue them from their checkpoints.
+
+    Args:
+        job_ids: Jobs to resume; all failed jobs if omitted
+
+    Returns:
+        IDs of the jobs that were requeued
+    """
+    conditions = [IngestionJobRecord.status == JobStatus.FAILED.value]
+    if job_ids is not None:
+        conditions.append(IngestionJobRecord.id.in_([uuid.UUID(j) for j in job_ids]))
+
+    async with get_db_context() as db:
+        result = await db.execute(
+            update(IngestionJobRecord)
+            .where(*conditions)
+            .values(
+                status=JobStatus.QUEUED.value,
+                attempts=0,
+                error_message=None,
+                completed_at=None,
+                worker_id=None,
+                lease_expires_at=None,
+                updated_at=func.now(),
+            )
+            .returning(IngestionJobRecord.id)
+            .execution_options(synchronize_session=False)
+        )
+        resumed = [str(row[0]) for row in result.all()]
+        if resumed:
+            # Documents of resumed jobs are pending again (still hidden)
+            await db.execute(
+                update(Document)
+                .where(
+                    Document.id.in_([uuid.UUID(j) for j in resumed]),
+                    Document.status == DocumentStatus.FAILED.value,
+                )
+                .values(status=DocumentStatus.PENDING.value)
+            )
 
+    for job_id in resumed:
+        await publish_job_event(job_id, "stage", stage=JobStatus.QUEUED.value)
+    if resumed:
+        _get_work_event().set()
+        logger.info(f"Resumed {len(resumed)} failed ingestion jobs")
+    return resumed
+
+
+async def find_unfinished_jobs(file_hashes: List[str]) -> Dict[str, IngestionJob]:
+    """Unfinished jobs of files with these hashes; failed ones are resumed.
+
+    A file uploaded again while its job is queued or running, or after it
+    failed, continues that job (from its checkpoint) instead of being
+    ingested twice or reported as done. Failed jobs whose file is gone
+    can't be resumed and are ignored.
+
+    Args:
+        file_hashes: SHA-256 hashes of the uploaded files
+
+    Returns:
+        Latest unfinished job per matching hash
+    """
+    if not file_hashes:
+        return {}
+    async with get_db_context() as db:
+        result = await db.execute(
+            select(IngestionJobRecord)
+            .where(
+                IngestionJobRecord.file_hash.in_(file_hashes),
+                IngestionJobRecord.status.in_([
+                    JobStatus.QUEUED.value,
+                    JobStatus.RUNNING.value,
+                    JobStatus.FAILED.value,
+                ]),
+            )
+            .order_by(IngestionJobRecord.created_at)
+        )
+        records = result.scalars().all()
+
+    jobs: Dict[str, IngestionJob] = {}
+    for record in records:
+        job = _to_job(record)
+        if job.status == JobStatus.FAILED.value and not Path(job.file_path).exists():
+            continue
+        jobs[record.file_hash] = job
+
+    failed = [job.job_id for job in jobs.values() if job.status == JobStatus.FAILED.value]
+    if failed:
+        resumed = set(await resume_jobs(failed))
+        for file_hash, job in list(jobs.items()):
+            if job.job_id in resumed:
+                job.status = JobStatus.QUEUED.value
+                job.error_message = None
+            elif job.status == JobStatus.FAILED.value:
+                del jobs[file_hash]
+    return jobs
+
+
+# --- Workers ---
+
+
+async def ingestion_worker(worker_id: str) -> None:
+    """Background worker that leases and processes ingestion jobs."""
+    logger.info(f"Ingestion worker {worker_id} started")
+    work_available = _get_work_event()
 
-async def ingestion_worker() -> None:
-    """Background worker that processes ingestion jobs."""
-    logger.info("Ingestion worker started")
-    
     while True:
         try:
-            job = await _task_queue.get()
-            await process_ingestion_job(job)
-            _task_queue.task_done()
+            job = await lease_job(worker_id)
+            if job is None:
+                try:
+                    await asyncio.wait_for(work_available.wait(), timeout=POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                work_available.clear()
+                continue
+            await process_ingestion_job(job, worker_id)
         except asyncio.CancelledError:
-            logger.info("Ingestion worker cancelled")
+            logger.info(f"Ingestion worker {worker_id} cancelled")
             break
         except Exception as e:
-            logger.error(f"Ingestion worker error: {e}")
+            logger.error(f"Ingestion worker {worker_id} error: {e}")
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
 
 
-def start_worker() -> asyncio.Task:
-    """Start the background ingestion worker."""
-    global _worker_task
-    if _worker_task is None or _worker_task.done():
-        _worker_task = asyncio.create_task(ingestion_worker())
-    return _worker_task
+async def maintenance_worker() -> None:
+    """Periodically fail exhausted jobs and purge expired ones."""
+    while True:
+        try:
+            failed = await fail_exhausted_jobs()
+            purged = await purge_old_jobs()
+            if failed or purged:
+                logger.info(f"Ingestion maintenance: {failed} jobs failed, {purged} jobs purged")
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Ingestion maintenance error: {e}")
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
+def start_workers(count: int = INGESTION_WORKERS) -> List[asyncio.Task]:
+    """Start ``count`` ingestion workers plus the maintenance and summary tasks."""
+    if any(not t.done() for t in _worker_tasks):
+        return _worker_tasks
 
+    _worker_tasks.clear()
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    for i in range(count):
+        _worker_tasks.append(asyncio.create_task(ingestion_worker(f"{prefix}-{i}")))
+    _worker_tasks.append(asyncio.create_task(maintenance_worker()))
+    if SUMMARY_INDEX_ENABLED:
+        _worker_tasks.append(asyncio.create_task(summary_worker()))
+    return _worker_tasks
 
-async def stop_worker() -> None:
-    """Stop the background ingestion worker."""
-    global _worker_task
-    if _worker_task and not _worker_task.done():
-        _worker_task.cancel()
+
+async def stop_workers() -> None:
+    """Stop all ingestion workers in this process.
+
+    Jobs interrupted here keep their lease until it expires and are then
+    picked up again by a running worker.
+    """
+    for task in _worker_tasks:
+        task.cancel()
+    for task in _worker_tasks:
         try:
-            await _worker_task
+            await task
         except asyncio.CancelledError:
             pass
-    _worker_task = None
+    _worker_tasks.clear()
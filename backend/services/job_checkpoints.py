@@ -0,0 +1,126 @@
+"""On-disk artifacts for resumable ingestion jobs.
+
+Each ingestion stage leaves an artifact under ``STORAGE_PATH/jobs/{job_id}``
+and records its completion in the job's ``checkpoint`` column:
+
+- ``extracted.json``: full text and page breaks
+- ``chunks.json``: chunk dicts with their final (stable) chunk ids
+- ``embeddings/{batch}.f32``: float32 vectors of one embedding batch
+
+A retried or resumed job reloads these instead of re-running extraction or
+re-embedding. The directory is removed once the job completes.
+
+File I/O runs in a worker thread to keep the event loop free.
+"""
+import asyncio
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.services.embedding_store import pack_vector, unpack_vector
+from backend.services.embeddings import EMBED_DIMENSIONS
+
+STORAGE_PATH = Path(os.getenv("STORAGE_PATH", "storage"))
+JOBS_PATH = STORAGE_PATH / "jobs"
+
+# Stages in execution order; a checkpoint's "stage" is the last completed one
+STAGES = ("extracted", "chunked", "stored", "upserted")
+
+
+def stage_done(checkpoint: Dict[str, Any], stage: str) -> bool:
+    """Whether ``stage`` (or a later stage) has completed."""
+    current = checkpoint.get("stage")
+    if current not in STAGES:
+        return False
+    return STAGES.index(current) >= STAGES.index(stage)
+
+
+def job_dir(job_id: str) -> Path:
+    """Artifact directory of a job."""
+    return JOBS_PATH / job_id
+
+
+def _write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+async def save_extracted(job_id: str, full_text: str, page_breaks: List[int]) -> None:
+    """Persist extraction output."""
+    await asyncio.to_thread(
+        _write_json,
+        job_dir(job_id) / "extracted.json",
+        {"text": full_text, "page_breaks": page_breaks},
+    )
+
+
+async def load_extracted(job_id: str) -> Optional[tuple[str, List[int]]]:
+    """Load extraction output, or None if missing."""
+    data = await asyncio.to_thread(_read_json, job_dir(job_id) / "extracted.json")
+    if data is None:
+        return None
+    return data["text"], data["page_breaks"]
+
+
+async def save_chunks(job_id: str, chunks: List[Dict[str, Any]]) -> None:
+    """Persist chunk dicts (UUIDs stored as strings)."""
+    serializable = [
+        {**c, "chunk_id": str(c["chunk_id"]), "document_id": str(c["document_id"])}
+        for c in chunks
+    ]
+    await asyncio.to_thread(_write_json, job_dir(job_id) / "chunks.json", serializable)
+
+
+async def load_chunks(job_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Load chunk dicts, or None if missing."""
+    data = await asyncio.to_thread(_read_json, job_dir(job_id) / "chunks.json")
+    if data is None:
+        return None
+    return [
+        {**c, "chunk_id": uuid.UUID(c["chunk_id"]), "document_id": uuid.UUID(c["document_id"])}
+        for c in data
+    ]
+
+
+def _batch_path(job_id: str, batch: int) -> Path:
+    return job_dir(job_id) / "embeddings" / f"{batch:05d}.f32"
+
+
+def _write_batch(path: Path, vectors: List[List[float]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(b"".join(pack_vector(v) for v in vectors))
+    tmp.replace(path)
+
+
+def _read_batch(path: Path) -> Optional[List[List[float]]]:
+    if not path.exists():
+        return None
+    flat = unpack_vector(path.read_bytes())
+    return [flat[i:i + EMBED_DIMENSIONS] for i in range(0, len(flat), EMBED_DIMENSIONS)]
+
+
+async def save_embedding_batch(job_id: str, batch: int, vectors: List[List[float]]) -> None:
+    """Persist the vectors of one embedding batch."""
+    await asyncio.to_thread(_write_batch, _batch_path(job_id, batch), vectors)
+
+
+async def load_embedding_batch(job_id: str, batch: int) -> Optional[List[List[float]]]:
+    """Load the vectors of one embedding batch, or None if missing."""
+    return await asyncio.to_thread(_read_batch, _batch_path(job_id, batch))
+
+
+async def remove_artifacts(job_id: str) -> None:
+    """Delete a job's artifact directory."""
+    await asyncio.to_thread(shutil.rmtree, job_dir(job_id), True)
@@ -0,0 +1,193 @@
+"""Ingestion job progress events over Postgres LISTEN/NOTIFY.
+
+Workers publish job events with ``pg_notify`` on the ``ingestion_job_events``
+channel, so events reach every API replica no matter which process runs the
+job. Each API process holds a single listening connection and fans the
+events out to in-memory subscriber queues (one per open SSE stream), so the
+number of clients doesn't change the load on Postgres.
+
+Event payload (JSON)::
+
+    {"job_id": "...", "event": "stage", "stage": "extracting", "progress": 10, ...}
+
+Event types:
+
+- ``stage``: the job entered a stage (queued, extracting, chunking, storing,
+  embedding, done, failed)
+- ``progress``: fine-grained progress within a stage (pages extracted,
+  chunks embedded, points upserted)
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db import DATABASE_URL, get_db_context
+
+CHANNEL = "ingestion_job_events"
+
+# Events buffered per subscriber before the oldest are dropped
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Interval between liveness checks of the listening connection
+LISTENER_CHECK_SECONDS = 30.0
+
+# Max wait for the listening connection when subscribing
+LISTENER_READY_TIMEOUT = 5.0
+
+# Terminal stages; per-job streams close after these
+TERMINAL_STAGES = ("done", "failed")
+
+
+def _payload(job_id: str, event: str, data: Dict[str, Any]) -> str:
+    return json.dumps({"job_id": job_id, "event": event, **data}, default=str)
+
+
+async def publish_job_event(job_id: str, event: str, **data: Any) -> None:
+    """Publish a job event to all listening API processes.
+
+    Publishing is best-effort: a failure is logged and never fails the job.
+
+    Args:
+        job_id: Job ID
+        event: Event type ("stage" or "progress")
+        **data: Event fields (stage, progress, pages, chunks_embedded, ...)
+    """
+    try:
+        async with get_db_context() as db:
+            await db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": _payload(job_id, event, data)},
+            )
+    except Exception as e:
+        logger.debug(f"Failed to publish event for job {job_id}: {e}")
+
+
+async def queue_job_events(db: AsyncSession, events: List[Dict[str, Any]]) -> None:
+    """Queue job events in an open transaction.
+
+    Postgres delivers them when the transaction commits, and drops them if
+    it rolls back.
+
+    Args:
+        db: Session whose transaction should carry the events
+        events: Dicts with job_id, event and the event fields
+    """
+    for e in events:
+        data = {k: v for k, v in e.items() if k not in ("job_id", "event")}
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": _payload(e["job_id"], e["event"], data)},
+        )
+
+
+class JobEventHub:
+    """Fans out NOTIFY events from one listening connection to subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: Set[tuple[Optional[str], asyncio.Queue]] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        for job_id, queue in list(self._subscribers):
+            if job_id is not None and job_id != event.get("job_id"):
+                continue
+            if queue.full():
+                queue.get_nowait()  # Slow client: drop its oldest event
+            queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        """Hold the LISTEN connection, reconnecting if it drops."""
+        dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+        def on_notify(connection, pid, channel, payload):
+            self._dispatch(payload)
+
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                await conn.add_listener(CHANNEL, on_notify)
+                self._ready.set()
+                logger.debug(f"Listening on {CHANNEL}")
+                while True:
+                    await asyncio.sleep(LISTENER_CHECK_SECONDS)
+                    await conn.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job event listener error, reconnecting: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                self._ready.clear()
+                if conn is not None:
+                    try:
+                        await conn.close()
+                    except Exception:
+                        pass
+
+    def _ensure_listening(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: Optional[str] = None) -> AsyncIterator[asyncio.Queue]:
+        """Subscribe to events of one job, or of all jobs if ``job_id`` is None.
+
+        Waits briefly for the listening connection, so a snapshot read after
+        subscribing doesn't miss events published in between.
+        """
+        self._ensure_listening()
+        entry = (job_id, asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+        self._subscribers.add(entry)
+        try:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=LISTENER_READY_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Job event listener not ready; events may be delayed")
+            yield entry[1]
+        finally:
+            self._subscribers.discard(entry)
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global hub instance
+_hub: Optional[JobEventHub] = None
+
+
+def get_job_event_hub() -> JobEventHub:
+    """Get the process-wide job event hub."""
+    global _hub
+    if _hub is None:
+        _hub = JobEventHub()
+    return _hub
+
+
+async def close_job_event_hub() -> None:
+    """Stop the process-wide job event hub, if started."""
+    if _hub is not None:
+        await _hub.close()
+
+
+def event_to_sse(event: Dict[str, Any]) -> dict:
+    """Format a job event for ``EventSourceResponse``."""
+    return {"event": event.get("event", "progress"), "data": json.dumps(event)}
@@ -0,0 +1,163 @@
+"""Per-job timing and resource accounting for ingestion jobs.
+
+``JobMetrics`` is stored as JSON in the job's ``metrics`` column and
+returned by the job status endpoints:
+
+- ``stage_seconds``: wall time per stage (extract, chunk, store, embed,
+  upsert); embed and upsert are summed over batches
+- ``pages_by_extractor``: pages parsed by pypdf, pdfplumber and OCR; an
+  extractor whose output was discarded for a fallback still counts
+- ``chunks``, ``tokens``, ``embedding_calls``, ``embedding_retries`` and
+  ``embedding_cache_hits`` from the job's ``EmbeddingStats``
+- ``extraction_peak_rss_bytes``: peak process RSS while extracting
+
+Metrics survive retries: a resumed job continues from the stored values.
+When the job is done or fails, what it added since the last export is
+observed in Prometheus histograms (``exported`` keeps the totals already
+observed), so a failed job that is resumed is never counted twice.
+"""
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+from backend.observability.metrics import (
+    INGESTION_EXTRACTION_PEAK_RSS,
+    INGESTION_JOB_CHUNKS,
+    INGESTION_JOB_PAGES,
+    INGESTION_STAGE_DURATION,
+)
+from backend.services.embeddings import EmbeddingStats
+
+# Interval between RSS samples while extracting
+RSS_SAMPLE_INTERVAL_SECONDS = 0.1
+
+_PROC_STATUS = Path("/proc/self/status")
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process.
+
+    Reads ``/proc/self/status``; elsewhere falls back to the lifetime peak
+    from ``getrusage`` (kilobytes on Linux, bytes on macOS).
+    """
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+@dataclass
+class JobMetrics:
+    """Timing and resource counters of one ingestion job."""
+
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    pages: int = 0
+    pages_by_extractor: Dict[str, int] = field(default_factory=dict)
+    ocr_pages: int = 0
+    chunks: int = 0
+    tokens: int = 0
+    embedding_calls: int = 0
+    embedding_retries: int = 0
+    embedding_cache_hits: int = 0
+    extraction_peak_rss_bytes: int = 0
+    current_stage: Optional[str] = None
+    stage_started_at: Optional[str] = None
+    exported: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "JobMetrics":
+        """Restore metrics stored by an earlier attempt."""
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in (data or {}).items() if k in known})
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    def add_embedding_stats(self, stats: EmbeddingStats) -> None:
+        """Accumulate the counters of one embedding run."""
+        self.tokens += stats.tokens
+        self.embedding_calls += stats.api_calls
+        self.embedding_retries += stats.retries
+        self.embedding_cache_hits += stats.cache_hits
+
+    def record_page(self, extractor: str, pages_done: int) -> None:
+        """Record extraction progress (called from the extraction thread)."""
+        if pages_done > self.pages_by_extractor.get(extractor, 0):
+            self.pages_by_extractor[extractor] = pages_done
+        if extractor == "ocr":
+            self.ocr_pages = self.pages_by_extractor[extractor]
+
+    @asynccontextmanager
+    async def stage(self, name: str) -> AsyncIterator[None]:
+        """Time a stage, adding to earlier time spent in it."""
+        self.current_stage = name
+        self.stage_started_at = datetime.now(timezone.utc).isoformat()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_seconds[name] = round(self.stage_seconds.get(name, 0.0) + elapsed, 3)
+            self.current_stage = None
+            self.stage_started_at = None
+
+    @asynccontextmanager
+    async def sample_rss(self) -> AsyncIterator[None]:
+        """Sample process RSS until the block exits and keep the peak.
+
+        The event loop stays free while extraction runs in a worker thread,
+        so a sampling task is enough. RSS is process-wide, so concurrent
+        workers in the same process are included.
+        """
+        peak = current_rss_bytes()
+
+        async def sample() -> None:
+            nonlocal peak
+            while True:
+                await asyncio.sleep(RSS_SAMPLE_INTERVAL_SECONDS)
+                peak = max(peak, current_rss_bytes())
+
+        task = asyncio.create_task(sample())
+        try:
+            yield
+        finally:
+            task.cancel()
+            peak = max(peak, current_rss_bytes())
+            self.extraction_peak_rss_bytes = max(self.extraction_peak_rss_bytes, peak)
+            INGESTION_EXTRACTION_PEAK_RSS.observe(peak)
+
+    def observe_finished(self) -> None:
+        """Export the job's totals when it is done or failed.
+
+        Only the part not exported by an earlier (failed) attempt is
+        observed; call before storing the metrics so ``exported`` persists.
+        """
+        exported_seconds = self.exported.get("stage_seconds", {})
+        for stage, seconds in self.stage_seconds.items():
+            delta = seconds - exported_seconds.get(stage, 0.0)
+            if delta > 0:
+                INGESTION_STAGE_DURATION.labels(stage=stage).observe(delta)
+        exported_pages = self.exported.get("pages_by_extractor", {})
+        for extractor, pages in self.pages_by_extractor.items():
+            delta = pages - exported_pages.get(extractor, 0)
+            if delta > 0:
+                INGESTION_JOB_PAGES.labels(extractor=extractor).observe(delta)
+        if self.chunks > self.exported.get("chunks", 0):
+            INGESTION_JOB_CHUNKS.observe(self.chunks - self.exported.get("chunks", 0))
+        self.exported = {
+            "stage_seconds": dict(self.stage_seconds),
+            "pages_by_extractor": dict(self.pages_by_extractor),
+            "chunks": self.chunks,
+        }
@@ -5,21 +5,21 @@ prompt building and chat completion functionality.
 
 Note: Prompt templates have been moved to backend/prompts/ module.
 This module re-exports the prompt builders for backward compatibility.
+API calls go through the shared gateway (backend/services/llm_gateway.py).
 """
 
-import os
 from typing import List, Optional
 
-from openai import AsyncOpenAI
-
 # Import from new prompts module for centralized prompt management
-from backend.prompts import build_context
+from backend.prompts import build_context, build_messages
 from backend.prompts import build_system_prompt as _build_system_prompt
-
-# Initialize async OpenAI client
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o")
+from backend.services import llm_gateway
+from backend.services.llm_gateway import (  # noqa: F401  (re-exported)
+    CHAT_MODEL,
+    MAX_COMPLETION_TOKENS,
+    estimate_request_tokens,
+)
+from backend.services.rate_limiter import Priority
 
 
 def build_system_prompt(mode: str, has_analytics: bool = False) -> str:
@@ -62,6 +62,8 @@ async def chat_completion(
     system_prompt: str,
     context: str,
     temperature: float = 0.3,
+    priority: Priority = Priority.INTERACTIVE,
+    purpose: str = "chat",
 ) -> str:
     """
     Call OpenAI chat completion.
@@ -71,28 +73,18 @@ async def chat_completion(
         system_prompt: System prompt for the mode
         context: Retrieved context
         temperature: Model temperature
+        priority: Rate scheduler class for the call
+        purpose: Metrics label of the call (agent name, "synthesis", ...)
 
     Returns:
         Assistant response text
     """
-    # Build full messages list
-    full_messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "system", "content": f"CONTEXT:\n{context}"},
-    ]
-
-    # Add conversation history (limit to recent messages)
-    for msg in messages[-10:]:  # Last 10 messages
-        full_messages.append({
-            "role": msg["role"],
-            "content": msg["content"],
-        })
-
-    response = await client.chat.completions.create(
-        model=CHAT_MODEL,
-        messages=full_messages,
+    # Static prefix first (system prompt, history), then context and question
+    full_messages = build_messages(system_prompt, context, messages)
+
+    return await llm_gateway.complete(
+        full_messages,
         temperature=temperature,
-        max_tokens=2000,
+        priority=priority,
+        purpose=purpose,
     )
-
-    return response.choices[0].message.content or ""
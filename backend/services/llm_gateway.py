@@ -0,0 +1,365 @@
+"""Process-wide gateway for OpenAI calls.
+
+Every OpenAI call of the backend goes through one pooled client:
+
+- a single ``AsyncOpenAI`` over a tuned httpx client (HTTP/2 when ``h2`` is
+  installed, keep-alive pool, connect/read timeouts), created lazily
+- chat calls are admitted by the rate scheduler (``services/rate_limiter.py``)
+  and then by a per-process concurrency limit (LLM_MAX_CONCURRENCY); time
+  waiting for a slot is exported as a histogram
+- prompt/completion tokens (and prompt tokens served from the provider's
+  prompt cache), time to first token and duration are recorded per call,
+  and the scheduler is reconciled with the real usage
+
+``complete`` returns the full text, ``stream`` yields tokens; both take the
+full messages list. Identical concurrent calls (same model, prompt and
+parameters, temperature up to SINGLEFLIGHT_MAX_TEMPERATURE) are coalesced
+(``services/singleflight.py``). Embeddings use ``get_client`` for the shared
+pool.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncGenerator, List, Optional
+
+import httpx
+from loguru import logger
+from openai import AsyncOpenAI, RateLimitError
+
+from backend.observability.metrics import (
+    LLM_CONCURRENCY_WAIT,
+    LLM_DURATION,
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS,
+)
+from backend.services.chunking import count_tokens
+from backend.services.rate_limiter import Priority, get_rate_scheduler
+from backend.services.singleflight import (
+    SINGLEFLIGHT_MAX_TEMPERATURE,
+    fingerprint,
+    get_singleflight,
+)
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o")
+
+MAX_COMPLETION_TOKENS = 2000
+
+# Connection pool and timeouts of the shared client
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "true").lower() == "true"
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# Chat calls in flight at once per process (0 = unlimited)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+_client: Optional[AsyncOpenAI] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+@dataclass
+class LLMUsage:
+    """Accounting of one chat call."""
+
+    model: str
+    purpose: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    queued_seconds: float = 0.0
+    ttft_seconds: Optional[float] = None
+    duration_seconds: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "model": self.model,
+            "purpose": self.purpose,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "queued_seconds": round(self.queued_seconds, 4),
+            "ttft_seconds": round(self.ttft_seconds, 4) if self.ttft_seconds is not None else None,
+            "duration_seconds": round(self.duration_seconds, 4),
+        }
+
+
+def estimate_request_tokens(messages: List[dict], max_tokens: int) -> int:
+    """Estimate the rate-limit cost of a chat request.
+
+    OpenAI counts prompt tokens plus ``max_tokens`` against the TPM limit.
+
+    Args:
+        messages: Full messages list sent to the API
+        max_tokens: Completion token cap
+
+    Returns:
+        Estimated token cost
+    """
+    return sum(count_tokens(m["content"]) for m in messages) + max_tokens
+
+
+def get_client() -> AsyncOpenAI:
+    """Get or create the shared OpenAI client (lazy initialization).
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not configured
+    """
+    global _client
+    if _client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key or api_key.startswith("sk-placeholder"):
+            raise ValueError(
+                "OPENAI_API_KEY environment variable is required. "
+                "Set a valid API key to use chat and RAG features."
+            )
+        http_client = httpx.AsyncClient(
+            http2=OPENAI_HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+        )
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=http_client,
+            max_retries=OPENAI_MAX_RETRIES,
+        )
+    return _client
+
+
+async def close_gateway() -> None:
+    """Close the shared client's connection pool (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _get_semaphore() -> Optional[asyncio.Semaphore]:
+    # Created lazily so it binds to the running event loop
+    global _semaphore
+    if LLM_MAX_CONCURRENCY <= 0:
+        return None
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def _admit(messages: List[dict], max_tokens: int, priority: Priority) -> tuple[int, float]:
+    """Wait for rate-limit capacity and a concurrency slot.
+
+    Returns:
+        Tuple of (estimated tokens, seconds spent queued)
+    """
+    estimated = estimate_request_tokens(messages, max_tokens)
+    queued = await get_rate_scheduler("chat").acquire(estimated, priority)
+
+    semaphore = _get_semaphore()
+    if semaphore is not None:
+        start = time.monotonic()
+        await semaphore.acquire()
+        waited = time.monotonic() - start
+        LLM_CONCURRENCY_WAIT.labels(priority=priority.name.lower()).observe(waited)
+        queued += waited
+    return estimated, queued
+
+
+def _release() -> None:
+    semaphore = _get_semaphore()
+    if semaphore is not None:
+        semaphore.release()
+
+
+def _record(usage: LLMUsage, estimated: int, unreported: int = 0) -> None:
+    """Export a call's usage and correct the scheduler's estimate.
+
+    Args:
+        usage: Usage of the call (token counts stay 0 if none was reported)
+        estimated: Tokens charged when the call was admitted
+        unreported: Tokens to charge when the API reported no usage (0 for
+            a rejected request, so its whole estimate is credited back)
+    """
+    LLM_TOKENS.labels(model=usage.model, type="prompt").inc(usage.prompt_tokens)
+    LLM_TOKENS.labels(model=usage.model, type="completion").inc(usage.completion_tokens)
+    LLM_TOKENS.labels(model=usage.model, type="cached").inc(usage.cached_tokens)
+    LLM_DURATION.labels(mode=usage.purpose, model=usage.model).observe(usage.duration_seconds)
+    if usage.ttft_seconds is not None:
+        LLM_TIME_TO_FIRST_TOKEN.labels(model=usage.model).observe(usage.ttft_seconds)
+    get_rate_scheduler("chat").reconcile(estimated, usage.total_tokens or unreported)
+    logger.debug(f"LLM call: {usage.to_dict()}")
+
+
+def _apply_usage(usage: LLMUsage, api_usage) -> None:
+    """Copy token counts from the API's usage object."""
+    usage.prompt_tokens = api_usage.prompt_tokens
+    usage.completion_tokens = api_usage.completion_tokens
+    details = getattr(api_usage, "prompt_tokens_details", None)
+    usage.cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+
+def _flight_key(
+    messages: List[dict],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> Optional[str]:
+    """Singleflight key of a call, or None when it must not be shared."""
+    if temperature > SINGLEFLIGHT_MAX_TEMPERATURE:
+        return None
+    return fingerprint(model, messages, temperature, max_tokens)
+
+
+async def complete(
+    messages: List[dict],
+    model: str = CHAT_MODEL,
+    temperature: float = 0.3,
+    max_tokens: int = MAX_COMPLETION_TOKENS,
+    priority: Priority = Priority.INTERACTIVE,
+    purpose: str = "chat",
+) -> str:
+    """Run a chat completion through the gateway.
+
+    Args:
+        messages: Full messages list (system prompts included)
+        model: Chat model
+        temperature: Model temperature
+        max_tokens: Completion token cap
+        priority: Rate scheduler class for the call
+        purpose: Label for metrics (chat mode, "synthesis", "tips", ...)
+
+    Returns:
+        Assistant response text
+    """
+    key = _flight_key(messages, model, temperature, max_tokens)
+    call = partial(_complete, messages, model, temperature, max_tokens, priority, purpose)
+    if key is None:
+        return await call()
+    return await get_singleflight("llm").do(key, call)
+
+
+async def _complete(
+    messages: List[dict],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    priority: Priority,
+    purpose: str,
+) -> str:
+    client = get_client()
+    estimated, queued = await _admit(messages, max_tokens, priority)
+    usage = LLMUsage(model=model, purpose=purpose, queued_seconds=queued)
+    start = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+    except Exception as e:
+        if isinstance(e, RateLimitError):
+            get_rate_scheduler("chat").rate_limited()
+        usage.duration_seconds = time.perf_counter() - start
+        _record(usage, estimated)
+        raise
+    finally:
+        _release()
+
+    usage.duration_seconds = time.perf_counter() - start
+    usage.ttft_seconds = usage.duration_seconds
+    if response.usage:
+        _apply_usage(usage, response.usage)
+    _record(usage, estimated, unreported=estimated)
+
+    return response.choices[0].message.content or ""
+
+
+async def stream(
+    messages: List[dict],
+    model: str = CHAT_MODEL,
+    temperature: float = 0.3,
+    max_tokens: int = MAX_COMPLETION_TOKENS,
+    priority: Priority = Priority.INTERACTIVE,
+    purpose: str = "chat",
+) -> AsyncGenerator[str, None]:
+    """Stream a chat completion through the gateway.
+
+    The concurrency slot is held until the stream ends (or the consumer
+    stops iterating). Usage comes from the API's final usage chunk.
+
+    Args:
+        messages: Full messages list (system prompts included)
+        model: Chat model
+        temperature: Model temperature
+        max_tokens: Completion token cap
+        priority: Rate scheduler class for the call
+        purpose: Label for metrics (chat mode, "synthesis", ...)
+
+    Yields:
+        String tokens as they are received
+    """
+    key = _flight_key(messages, model, temperature, max_tokens)
+    call = partial(_stream, messages, model, temperature, max_tokens, priority, purpose)
+    tokens = call() if key is None else get_singleflight("llm").stream(key, call)
+    async for token in tokens:
+        yield token
+
+
+async def _stream(
+    messages: List[dict],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    priority: Priority,
+    purpose: str,
+) -> AsyncGenerator[str, None]:
+    client = get_client()
+    estimated, queued = await _admit(messages, max_tokens, priority)
+    usage = LLMUsage(model=model, purpose=purpose, queued_seconds=queued)
+    start = time.perf_counter()
+    accepted = False
+    try:
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except RateLimitError:
+            get_rate_scheduler("chat").rate_limited()
+            raise
+        accepted = True
+
+        async for chunk in response:
+            if chunk.usage:
+                _apply_usage(usage, chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                if usage.ttft_seconds is None:
+                    usage.ttft_seconds = time.perf_counter() - start
+                yield chunk.choices[0].delta.content
+    finally:
+        _release()
+        usage.duration_seconds = time.perf_counter() - start
+        # No usage chunk: a rejected request cost nothing, an interrupted
+        # stream at least its prompt
+        _record(usage, estimated, unreported=estimated - max_tokens if accepted else 0)
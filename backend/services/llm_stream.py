@@ -4,17 +4,11 @@ This module provides async generators for streaming chat completions
 from OpenAI, enabling real-time token streaming to the frontend.
 """
 
-import os
 from typing import AsyncGenerator, Optional
 
-from openai import AsyncOpenAI
-
-from backend.prompts import build_context, build_system_prompt
-
-# Initialize async OpenAI client
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o")
+from backend.prompts import build_context, build_messages, build_system_prompt
+from backend.services import llm_gateway
+from backend.services.rate_limiter import Priority
 
 
 async def stream_chat_completion(
@@ -22,6 +16,8 @@ async def stream_chat_completion(
     system_prompt: str,
     context: str,
     temperature: float = 0.3,
+    priority: Priority = Priority.INTERACTIVE,
+    purpose: str = "chat",
 ) -> AsyncGenerator[str, None]:
     """Stream chat completion tokens from OpenAI.
 
@@ -33,36 +29,23 @@ async def stream_chat_completion(
         system_prompt: System prompt for the mode
         context: Retrieved RAG context
         temperature: Model temperature (default 0.3)
+        priority: Rate scheduler class for the call
+        purpose: Metrics label of the call (chat mode, "synthesis", ...)
 
     Yields:
         String tokens as they are received from OpenAI
     """
-    # Build full messages list
-    full_messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "system", "content": f"CONTEXT:\n{context}"},
-    ]
-
-    # Add conversation history (limit to recent messages)
-    for msg in messages[-10:]:
-        full_messages.append({
-            "role": msg["role"],
-            "content": msg["content"],
-        })
-
-    # Create streaming completion
-    stream = await client.chat.completions.create(
-        model=CHAT_MODEL,
-        messages=full_messages,
-        temperature=temperature,
-        max_tokens=2000,
-        stream=True,
-    )
+    # Static prefix first (system prompt, history), then context and question
+    full_messages = build_messages(system_prompt, context, messages)
 
     # Yield tokens as they arrive
-    async for chunk in stream:
-        if chunk.choices and chunk.choices[0].delta.content:
-            yield chunk.choices[0].delta.content
+    async for token in llm_gateway.stream(
+        full_messages,
+        temperature=temperature,
+        priority=priority,
+        purpose=purpose,
+    ):
+        yield token
 
 
 async def stream_with_metadata(
@@ -116,6 +99,7 @@ async def stream_with_metadata(
         system_prompt=system_prompt,
         context=context,
         temperature=temperature,
+        purpose=mode,
     ):
         full_response += token
         yield {"type": "token", "data": {"content": token}}
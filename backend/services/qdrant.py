@@ -1,4 +1,9 @@
-"""Qdrant vector database service."""
+"""Qdrant vector database service.
+
+Two collections: chunk vectors (QDRANT_COLLECTION) and one summary vector
+per document (QDRANT_SUMMARY_COLLECTION, point id = document id) used to
+narrow chunk search to the most relevant documents.
+"""
 import asyncio
 import os
 import uuid
@@ -10,8 +15,12 @@ from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    MatchAny,
     MatchValue,
+    PointIdsList,
     PointStruct,
+    SetPayload,
+    SetPayloadOperation,
     VectorParams,
 )
 
@@ -21,11 +30,30 @@ _qdrant_host = os.getenv("QDRANT_HOST", "localhost")
 _qdrant_port = os.getenv("QDRANT_PORT", "6333")
 QDRANT_URL = os.getenv("QDRANT_URL", f"http://{_qdrant_host}:{_qdrant_port}")
 QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "sisuiq_chunks")
+QDRANT_SUMMARY_COLLECTION = os.getenv("QDRANT_SUMMARY_COLLECTION", "sisuiq_document_summaries")
 VECTOR_SIZE = 1536  # text-embedding-3-small
 
 # Async client singleton
 _client: Optional[AsyncQdrantClient] = None
 
+# Bumped on every index write in this process (see corpus_generation)
+_corpus_generation = 0
+
+
+def corpus_generation() -> int:
+    """Counter of index writes made by this process.
+
+    Part of the retrieval singleflight key, so a retrieval started before a
+    write isn't shared with callers arriving after it.
+    """
+    return _corpus_generation
+
+
+def _bump_corpus_generation() -> None:
+    global _corpus_generation
+    _corpus_generation += 1
+
+
 async def get_client() -> AsyncQdrantClient:
     """Get or create async Qdrant client."""
     global _client
@@ -34,9 +62,26 @@ async def get_client() -> AsyncQdrantClient:
     return _client
 
 
+async def _ensure_one(client: AsyncQdrantClient, name: str) -> None:
+    # Raises UnexpectedResponse (404) if missing, ResponseHandlingException
+    # if Qdrant can't be reached
+    try:
+        await client.get_collection(name)
+        print(f"✅ Qdrant collection '{name}' exists")
+    except UnexpectedResponse:
+        await client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(
+                size=VECTOR_SIZE,
+                distance=Distance.COSINE,
+            ),
+        )
+        print(f"✅ Created Qdrant collection '{name}'")
+
+
 async def ensure_collection(max_retries: int = 10, retry_delay: float = 2.0) -> None:
     """
-    Ensure the collection exists, create if missing.
+    Ensure the chunk and summary collections exist, create if missing.
 
     Called on startup to auto-create collection.
     Includes retry logic for container startup timing.
@@ -50,24 +95,9 @@ async def ensure_collection(max_retries: int = 10, retry_delay: float = 2.0) ->
     for attempt in range(1, max_retries + 1):
         try:
             client = await get_client()
-            
-            # Try to get collection - will raise UnexpectedResponse if doesn't exist
-            # or ResponseHandlingException if can't connect
-            try:
-                await client.get_collection(QDRANT_COLLECTION)
-                print(f"✅ Qdrant collection '{QDRANT_COLLECTION}' exists")
-                return  # Collection exists, we're done
-            except UnexpectedResponse:
-                # Collection doesn't exist (404), create it
-                await client.create_collection(
-                    collection_name=QDRANT_COLLECTION,
-                    vectors_config=VectorParams(
-                        size=VECTOR_SIZE,
-                        distance=Distance.COSINE,
-                    ),
-                )
-                print(f"✅ Created Qdrant collection '{QDRANT_COLLECTION}'")
-                return  # Created successfully
+            await _ensure_one(client, QDRANT_COLLECTION)
+            await _ensure_one(client, QDRANT_SUMMARY_COLLECTION)
+            return
                 
         except (ResponseHandlingException, ConnectionError, OSError) as e:
             if attempt < max_retries:
@@ -92,14 +122,17 @@ async def ensure_collection(max_retries: int = 10, retry_delay: float = 2.0) ->
 async def upsert_chunks(
     chunks: List[Dict[str, Any]],
     embeddings: List[List[float]],
+    indexing: bool = False,
 ) -> None:
     """
     Upsert document chunks with embeddings to Qdrant.
 
     Args:
         chunks: List of chunk dicts with keys: chunk_id, document_id, chunk_index,
-                text, source, page
+                text, source, page and optionally char_start, char_end
         embeddings: List of embedding vectors matching chunks
+        indexing: Hide the points from search until ``mark_document_indexed``
+                  (documents ingested batch by batch)
     """
     client = await get_client()
 
@@ -114,6 +147,9 @@ async def upsert_chunks(
                 "text": chunk["text"],
                 "source": chunk.get("source", ""),
                 "page": chunk.get("page"),
+                "char_start": chunk.get("char_start"),
+                "char_end": chunk.get("char_end"),
+                "indexing": indexing,
             },
         )
         points.append(point)
@@ -122,6 +158,7 @@ async def upsert_chunks(
         collection_name=QDRANT_COLLECTION,
         points=points,
     )
+    _bump_corpus_generation()
 
 
 async def search_similar(
@@ -135,15 +172,18 @@ async def search_similar(
     Args:
         query_vector: Query embedding vector
         top_k: Number of results to return
-        filters: Optional filters dict with keys: source, type, document_id
+        filters: Optional filters dict with keys: source, type, document_id,
+                 document_ids (any of a list)
 
     Returns:
         List of hits with payload and score
     """
     client = await get_client()
 
-    # Build filter conditions
-    qdrant_filter = None
+    # Points of documents still being ingested are never returned
+    qdrant_filter = Filter(
+        must_not=[FieldCondition(key="indexing", match=MatchValue(value=True))]
+    )
     if filters:
         conditions = []
         if "source" in filters:
@@ -160,8 +200,15 @@ async def search_similar(
                     match=MatchValue(value=str(filters["document_id"])),
                 )
             )
+        if "document_ids" in filters:
+            conditions.append(
+                FieldCondition(
+                    key="document_id",
+                    match=MatchAny(any=[str(d) for d in filters["document_ids"]]),
+                )
+            )
         if conditions:
-            qdrant_filter = Filter(must=conditions)
+            qdrant_filter.must = conditions
 
     results = await client.search(
         collection_name=QDRANT_COLLECTION,
@@ -181,11 +228,36 @@ async def search_similar(
             "page": result.payload.get("page"),
             "document_id": result.payload.get("document_id"),
             "chunk_index": result.payload.get("chunk_index"),
+            "char_start": result.payload.get("char_start"),
+            "char_end": result.payload.get("char_end"),
         })
 
     return hits
 
 
+async def mark_document_indexed(document_id: uuid.UUID) -> None:
+    """
+    Make all points of a document searchable once its ingestion completed.
+
+    Args:
+        document_id: UUID of the document
+    """
+    client = await get_client()
+    await client.set_payload(
+        collection_name=QDRANT_COLLECTION,
+        payload={"indexing": False},
+        points=Filter(
+            must=[
+                FieldCondition(
+                    key="document_id",
+                    match=MatchValue(value=str(document_id)),
+                )
+            ]
+        ),
+    )
+    _bump_corpus_generation()
+
+
 async def delete_document_chunks(document_id: uuid.UUID) -> None:
     """
     Delete all chunks for a document.
@@ -206,6 +278,7 @@ async def delete_document_chunks(document_id: uuid.UUID) -> None:
             ]
         ),
     )
+    _bump_corpus_generation()
 
 
 async def delete_by_document_id(document_id: uuid.UUID) -> int:
@@ -246,10 +319,138 @@ async def delete_by_document_id(document_id: uuid.UUID) -> int:
             ]
         ),
     )
+    _bump_corpus_generation()
 
     return count
 
 
+async def delete_points(point_ids: List[uuid.UUID]) -> int:
+    """
+    Delete specific points by id in a single request.
+
+    Args:
+        point_ids: Point ids (chunk ids) to delete
+
+    Returns:
+        Number of point ids submitted for deletion
+    """
+    if not point_ids:
+        return 0
+
+    client = await get_client()
+    await client.delete(
+        collection_name=QDRANT_COLLECTION,
+        points_selector=PointIdsList(points=[str(pid) for pid in point_ids]),
+    )
+    _bump_corpus_generation()
+    return len(point_ids)
+
+
+async def update_chunk_payloads(updates: List[Dict[str, Any]]) -> None:
+    """
+    Update payload fields of existing points in one batch request.
+
+    Used when a chunk keeps its vector but moves position (chunk_index,
+    page) or gets a new source label.
+
+    Args:
+        updates: Dicts with key chunk_id plus the payload fields to set
+    """
+    if not updates:
+        return
+
+    client = await get_client()
+    operations = [
+        SetPayloadOperation(
+            set_payload=SetPayload(
+                payload={k: v for k, v in update.items() if k != "chunk_id"},
+                points=[str(update["chunk_id"])],
+            )
+        )
+        for update in updates
+    ]
+    await client.batch_update_points(
+        collection_name=QDRANT_COLLECTION,
+        update_operations=operations,
+    )
+    _bump_corpus_generation()
+
+
+async def upsert_document_summary(
+    document_id: uuid.UUID,
+    embedding: List[float],
+    payload: Dict[str, Any],
+) -> None:
+    """
+    Store (or replace) the summary vector of a document.
+
+    Args:
+        document_id: Document UUID (used as point id)
+        embedding: Summary embedding
+        payload: Summary fields (name, source, summary)
+    """
+    client = await get_client()
+    await client.upsert(
+        collection_name=QDRANT_SUMMARY_COLLECTION,
+        points=[
+            PointStruct(
+                id=str(document_id),
+                vector=embedding,
+                payload={**payload, "document_id": str(document_id)},
+            )
+        ],
+    )
+    _bump_corpus_generation()
+
+
+async def search_document_summaries(
+    query_vector: List[float],
+    top_k: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    Search document summaries by vector.
+
+    Args:
+        query_vector: Query embedding vector
+        top_k: Number of documents to return
+
+    Returns:
+        List of hits with document_id, name, source, summary and score
+    """
+    client = await get_client()
+    results = await client.search(
+        collection_name=QDRANT_SUMMARY_COLLECTION,
+        query_vector=query_vector,
+        limit=top_k,
+        with_payload=True,
+    )
+    return [
+        {
+            "document_id": result.payload.get("document_id"),
+            "name": result.payload.get("name", ""),
+            "source": result.payload.get("source", ""),
+            "summary": result.payload.get("summary", ""),
+            "score": result.score,
+        }
+        for result in results
+    ]
+
+
+async def delete_document_summary(document_id: uuid.UUID) -> None:
+    """
+    Delete the summary vector of a document.
+
+    Args:
+        document_id: Document UUID
+    """
+    client = await get_client()
+    await client.delete(
+        collection_name=QDRANT_SUMMARY_COLLECTION,
+        points_selector=PointIdsList(points=[str(document_id)]),
+    )
+    _bump_corpus_generation()
+
+
 async def close_client() -> None:
     """Close Qdrant client connection."""
     global _client
@@ -0,0 +1,224 @@
+"""Process-wide priority scheduler for OpenAI API calls.
+
+Chat, query embeddings, admin tips and bulk ingestion all draw on the same
+OpenAI rate limits. Every call acquires capacity here first:
+
+- token buckets track requests-per-minute and tokens-per-minute
+- waiters are served strictly by priority (interactive before background),
+  FIFO within a priority
+- background calls may not dip into a reserved headroom of each bucket, so
+  a large ingestion job queues (backpressure) instead of pushing chat into
+  429s
+- after a 429, background traffic pauses briefly while interactive traffic
+  continues
+- time spent queued is exported as a Prometheus histogram
+
+Limits are per model family (OpenAI enforces them per model), configured via
+OPENAI_{CHAT,EMBED}_{RPM,TPM}. A limit of 0 disables that bucket.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from backend.observability.metrics import OPENAI_QUEUE_TIME
+
+# Fraction of each bucket reserved for interactive traffic
+BACKGROUND_HEADROOM = float(os.getenv("OPENAI_BACKGROUND_HEADROOM", "0.2"))
+
+# How long background traffic pauses after a rate-limit response
+BACKGROUND_PAUSE_SECONDS = float(os.getenv("OPENAI_BACKGROUND_PAUSE", "5.0"))
+
+SCHEDULER_LIMITS: Dict[str, Tuple[int, int]] = {
+    "chat": (
+        int(os.getenv("OPENAI_CHAT_RPM", "500")),
+        int(os.getenv("OPENAI_CHAT_TPM", "30000")),
+    ),
+    "embeddings": (
+        int(os.getenv("OPENAI_EMBED_RPM", "3000")),
+        int(os.getenv("OPENAI_EMBED_TPM", "1000000")),
+    ),
+}
+
+
+class Priority(IntEnum):
+    """Scheduling class of an API call (lower is served first)."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class TokenBucket:
+    """Continuously refilling token bucket sized for one minute of capacity."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float) -> None:
+        """Add tokens accrued since the last refill."""
+        if self.unlimited:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken while keeping ``reserve``."""
+        if self.unlimited:
+            return 0.0
+        deficit = amount + reserve - self.tokens
+        return max(0.0, deficit / self._rate)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens (the balance may go negative after reconciliation)."""
+        if not self.unlimited:
+            self.tokens -= amount
+
+    def credit(self, amount: float) -> None:
+        """Return (or, if negative, charge) tokens after the fact."""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateScheduler:
+    """Priority-ordered admission control over an RPM and a TPM bucket."""
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        tpm: int,
+        background_headroom: float = BACKGROUND_HEADROOM,
+    ):
+        self.name = name
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._headroom = background_headroom
+        self._waiters: List[Tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+        self._background_paused_until = 0.0
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for capacity."""
+        return len(self._waiters)
+
+    def _wait_time(self, tokens: float, priority: Priority, now: float) -> float:
+        self._requests.refill(now)
+        self._tokens.refill(now)
+
+        reserve_requests = reserve_tokens = 0.0
+        pause = 0.0
+        if priority == Priority.BACKGROUND:
+            reserve_requests = self._requests.capacity * self._headroom
+            reserve_tokens = self._tokens.capacity * self._headroom
+            pause = max(0.0, self._background_paused_until - now)
+
+        return max(
+            pause,
+            self._requests.wait_time(1, reserve_requests),
+            self._tokens.wait_time(tokens, reserve_tokens),
+        )
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> float:
+        """Wait until the call may be issued and charge its estimated cost.
+
+        Args:
+            tokens: Estimated tokens for the call (prompt + max completion)
+            priority: Scheduling class
+
+        Returns:
+            Seconds spent queued
+        """
+        if not self._tokens.unlimited:
+            # A single call can never need more than a full bucket
+            tokens = min(tokens, int(self._tokens.capacity * (1 - self._headroom)))
+
+        condition = self._get_condition()
+        entry = (int(priority), next(self._counter))
+        start = time.monotonic()
+
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout: Optional[float] = None
+                    if self._waiters[0] == entry:
+                        timeout = self._wait_time(tokens, priority, time.monotonic())
+                        if timeout <= 0:
+                            heapq.heappop(self._waiters)
+                            self._requests.consume(1)
+                            self._tokens.consume(tokens)
+                            break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                # Let the next waiter re-evaluate
+                condition.notify_all()
+
+        queued = time.monotonic() - start
+        OPENAI_QUEUE_TIME.labels(
+            scheduler=self.name,
+            priority=priority.name.lower(),
+        ).observe(queued)
+        return queued
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        tokens: int,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[None]:
+        """Context manager form of ``acquire``."""
+        await self.acquire(tokens, priority)
+        yield
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the TPM bucket once the real usage is known."""
+        self._tokens.credit(estimated_tokens - actual_tokens)
+
+    def rate_limited(self, pause: float = BACKGROUND_PAUSE_SECONDS) -> None:
+        """Record a 429: pause background traffic for ``pause`` seconds."""
+        self._background_paused_until = max(
+            self._background_paused_until,
+            time.monotonic() + pause,
+        )
+
+
+_schedulers: Dict[str, RateScheduler] = {}
+
+
+def get_rate_scheduler(kind: str) -> RateScheduler:
+    """Get the process-wide scheduler for a model family.
+
+    Args:
+        kind: "chat" or "embeddings"
+
+    Returns:
+        Shared RateScheduler instance
+    """
+    if kind not in _schedulers:
+        rpm, tpm = SCHEDULER_LIMITS[kind]
+        _schedulers[kind] = RateScheduler(kind, rpm=rpm, tpm=tpm)
+    return _schedulers[kind]
@@ -0,0 +1,198 @@
+"""Singleflight coalescing of identical in-flight calls.
+
+When several requests need the same result at the same time (e.g. many
+users asking the same trending question), only the first caller issues the
+call; concurrent duplicates await its result instead of calling again.
+Nothing is cached: once a call finishes, the next caller starts a new one.
+
+Calls are keyed by a request fingerprint (``fingerprint``):
+
+- embeddings: model + text
+- retrieval: query + parameters + filters + corpus generation
+- chat completions: model + full prompt + temperature + max tokens, only for
+  temperatures up to SINGLEFLIGHT_MAX_TEMPERATURE
+
+The shared call runs in its own task, so a caller disconnecting doesn't fail
+the others. Streams are broadcast: late joiners replay the tokens so far,
+then follow live; the upstream stream is cancelled once nobody listens.
+
+Every call is counted in ``singleflight_calls_total{group, role}``; the
+coalescing ratio of a group is followers / (leaders + followers).
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from backend.observability.metrics import SINGLEFLIGHT_CALLS
+
+SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+# Completions above this temperature are never shared
+SINGLEFLIGHT_MAX_TEMPERATURE = float(os.getenv("SINGLEFLIGHT_MAX_TEMPERATURE", "0.3"))
+
+T = TypeVar("T")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of JSON-serializable request parts."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class _Broadcast:
+    """Tokens of one upstream stream, replayable by any number of readers."""
+
+    def __init__(self) -> None:
+        self.tokens: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.readers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    async def pump(self, stream: AsyncIterator[str]) -> None:
+        try:
+            async for token in stream:
+                async with self._changed:
+                    self.tokens.append(token)
+                    self._changed.notify_all()
+        except BaseException as e:
+            self.error = e
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                # Release the upstream call (connection, concurrency slot)
+                await aclose()
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+
+    async def read(self) -> AsyncIterator[str]:
+        position = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.done or len(self.tokens) > position)
+                pending = self.tokens[position:]
+                finished = self.done
+            for token in pending:
+                yield token
+            position += len(pending)
+            if finished and position == len(self.tokens):
+                break
+        if self.error is not None and not isinstance(self.error, asyncio.CancelledError):
+            raise self.error
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key within a group."""
+
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+
+    def _count(self, role: str) -> None:
+        SINGLEFLIGHT_CALLS.labels(group=self.group, role=role).inc()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._calls) + len(self._streams)
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        copy_result: bool = False,
+    ) -> T:
+        """Run ``fn`` unless an identical call is in flight, then share its result.
+
+        Args:
+            key: Request fingerprint
+            fn: Coroutine function issuing the call
+            copy_result: Give each caller its own deep copy (for mutable
+                results the callers modify)
+
+        Returns:
+            Result of the (shared) call; its exception is raised to every caller
+        """
+        if not SINGLEFLIGHT_ENABLED:
+            return await fn()
+
+        task = self._calls.get(key)
+        if task is None:
+            self._count("leader")
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+
+            def forget(done: asyncio.Task) -> None:
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+                if not done.cancelled():
+                    done.exception()  # retrieved: callers re-raise it
+
+            task.add_done_callback(forget)
+        else:
+            self._count("follower")
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result) if copy_result else result
+
+    async def stream(
+        self,
+        key: str,
+        fn: Callable[[], AsyncIterator[str]],
+    ) -> AsyncIterator[str]:
+        """Stream tokens of ``fn()`` unless an identical stream is in flight.
+
+        Args:
+            key: Request fingerprint
+            fn: Function returning the upstream token stream
+
+        Yields:
+            All tokens of the (shared) stream, from the first
+        """
+        if not SINGLEFLIGHT_ENABLED:
+            async for token in fn():
+                yield token
+            return
+
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            self._count("leader")
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            broadcast.task = asyncio.ensure_future(broadcast.pump(fn()))
+
+            def forget(_: asyncio.Task) -> None:
+                if self._streams.get(key) is broadcast:
+                    del self._streams[key]
+
+            broadcast.task.add_done_callback(forget)
+        else:
+            self._count("follower")
+
+        broadcast.readers += 1
+        try:
+            async for token in broadcast.read():
+                yield token
+        finally:
+            broadcast.readers -= 1
+            if broadcast.readers == 0 and not broadcast.done and broadcast.task:
+                # Nobody listens anymore: stop the upstream call
+                if self._streams.get(key) is broadcast:
+                    del self._streams[key]
+                broadcast.task.cancel()
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_singleflight(group: str) -> SingleFlight:
+    """Get the process-wide singleflight group ("embeddings", "retrieval", "llm")."""
+    if group not in _groups:
+        _groups[group] = SingleFlight(group)
+    return _groups[group]
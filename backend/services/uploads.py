@@ -0,0 +1,150 @@
+"""Streaming upload handling.
+
+Uploaded files are copied to disk in fixed-size chunks in a worker thread,
+so peak memory per upload stays at one chunk regardless of file size and
+the event loop never blocks on disk I/O. While copying:
+
+- the SHA-256 is computed incrementally (used for duplicate detection)
+- the first chunk is checked against the expected file signature, so a
+  mislabeled file is rejected before the rest is written
+- the size limit is enforced; uploads whose size is already known are
+  rejected before any copying
+
+Files are written to a ``.part`` path and renamed when complete, so a failed
+or rejected upload never leaves a truncated file behind.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+
+MIB = 1024 * 1024
+
+UPLOAD_CHUNK_BYTES = MIB
+
+# Maximum upload sizes
+MAX_PDF_UPLOAD_BYTES = int(os.getenv("MAX_PDF_UPLOAD_MB", "100")) * MIB
+MAX_DATA_UPLOAD_BYTES = int(os.getenv("MAX_DATA_UPLOAD_MB", "50")) * MIB
+MAX_ARCHIVE_UPLOAD_BYTES = int(os.getenv("MAX_ARCHIVE_UPLOAD_MB", "2048")) * MIB
+
+# Accepted leading bytes per file kind
+_ZIP = (b"PK\x03\x04", b"PK\x05\x06")
+SIGNATURES = {
+    ".pdf": (b"%PDF-",),
+    ".xlsx": _ZIP,
+    ".zip": _ZIP,
+    # tar archives (plain, gzip, bzip2, xz); plain tar is checked at offset 257
+    ".tar": (b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00"),
+}
+
+
+class UploadError(Exception):
+    """Raised when an upload is rejected."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class SavedUpload:
+    """An upload written to disk."""
+    path: Path
+    size: int
+    sha256: str
+
+
+def check_signature(head: bytes, kind: str) -> None:
+    """Validate the leading bytes of a file of the given kind.
+
+    Args:
+        head: First bytes of the file (at least 512 for tar detection)
+        kind: File kind (".pdf", ".xlsx", ".csv", ".zip" or ".tar")
+
+    Raises:
+        UploadError: If the content doesn't match the kind
+    """
+    if kind == ".csv":
+        if b"\x00" in head:
+            raise UploadError("File is not a text CSV")
+        return
+
+    if kind == ".tar" and head[257:262] == b"ustar":
+        return
+    if not head.startswith(SIGNATURES[kind]):
+        raise UploadError(f"File content is not a valid {kind.lstrip('.').upper()} file")
+
+
+def _copy(src, dest: Path, max_bytes: int, kind: str) -> SavedUpload:
+    digest = hashlib.sha256()
+    size = 0
+    part = dest.with_name(dest.name + ".part")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(part, "wb") as out:
+            first = True
+            while chunk := src.read(UPLOAD_CHUNK_BYTES):
+                if first:
+                    check_signature(chunk, kind)
+                    first = False
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError(
+                        f"File exceeds the maximum upload size of {max_bytes // MIB} MB",
+                        status_code=413,
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise UploadError("Uploaded file is empty")
+        part.replace(dest)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return SavedUpload(path=dest, size=size, sha256=digest.hexdigest())
+
+
+async def save_upload(
+    file: UploadFile,
+    dest: Path,
+    max_bytes: int,
+    kind: Optional[str] = None,
+) -> SavedUpload:
+    """Stream an upload to ``dest``, hashing and validating it on the way.
+
+    Args:
+        file: Uploaded file
+        dest: Destination path
+        max_bytes: Maximum accepted size
+        kind: File kind for signature checks; defaults to the dest suffix
+
+    Returns:
+        SavedUpload with path, size and SHA-256
+
+    Raises:
+        UploadError: If the upload is too large (413), empty or its content
+            doesn't match the kind (400)
+    """
+    kind = kind or dest.suffix.lower()
+    if file.size is not None and file.size > max_bytes:
+        raise UploadError(
+            f"File exceeds the maximum upload size of {max_bytes // MIB} MB",
+            status_code=413,
+        )
+    return await asyncio.to_thread(_copy, file.file, dest, max_bytes, kind)
+
+
+async def save_upload_to_temp(file: UploadFile, max_bytes: int, kind: str) -> SavedUpload:
+    """Stream an upload to a new temporary file (caller deletes it)."""
+    fd, name = tempfile.mkstemp(suffix=kind)
+    os.close(fd)
+    try:
+        return await save_upload(file, Path(name), max_bytes, kind)
+    except BaseException:
+        Path(name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,90 @@
+"""Standalone ingestion and scheduler worker for SISUiQ.
+
+Runs the CPU-heavy background workloads outside the API process:
+
+- ingestion job workers (PDF extraction, OCR, chunking, embedding)
+- the APScheduler jobs from ``backend.services.scheduler``
+
+Run directly: python -m backend.worker
+Or via Docker Compose: the ``worker`` service.
+
+The API should then be started with RUN_INGESTION_WORKERS=false so it only
+enqueues jobs. Both tiers coordinate through the ingestion_jobs table and
+can be scaled independently.
+"""
+import argparse
+import asyncio
+import os
+import signal
+
+from loguru import logger
+
+from backend.db import close_db
+from backend.services.ingestion_jobs import INGESTION_WORKERS, start_workers, stop_workers
+from backend.services.llm_gateway import close_gateway
+from backend.services.qdrant import close_client, ensure_collection
+
+# Ingestion workers in this process (overrides INGESTION_WORKERS)
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", str(INGESTION_WORKERS)))
+
+# Run the scheduled jobs in this process
+RUN_SCHEDULER = os.getenv("WORKER_RUN_SCHEDULER", "true").lower() == "true"
+
+
+async def run(concurrency: int, run_scheduler: bool) -> None:
+    """Run workers until SIGINT/SIGTERM."""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows: fall back to KeyboardInterrupt
+
+    await ensure_collection()
+
+    start_workers(concurrency)
+    logger.info(f"Started {concurrency} ingestion workers")
+
+    if run_scheduler:
+        from backend.services.scheduler import register_default_jobs, start_scheduler
+
+        register_default_jobs()
+        await start_scheduler()
+        logger.info("Started scheduler")
+
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Shutting down worker...")
+        if run_scheduler:
+            from backend.services.scheduler import stop_scheduler
+
+            await stop_scheduler()
+        await stop_workers()
+        await close_db()
+        await close_client()
+        await close_gateway()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="SISUiQ background worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=WORKER_CONCURRENCY,
+        help="Number of concurrent ingestion workers",
+    )
+    parser.add_argument(
+        "--no-scheduler",
+        action="store_true",
+        help="Do not run scheduled jobs in this process",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, RUN_SCHEDULER and not args.no_scheduler))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Routing evaluation: how well the local mode router picks agents.
+
+Runs the router over the golden dataset (each case's ``mode`` is the
+expected agent) and reports accuracy and decision latency. Runs offline with
+the keyword rules; ``--embeddings`` adds centroid similarity (needs
+OPENAI_API_KEY).
+
+Usage:
+    python -m eval.routing [--embeddings] [--output routing_report.json]
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from backend.agents.router import RoutingDecision, load_centroids, route_query
+from eval.dataset import GoldenDataset, load_golden_dataset
+
+# Routing decisions timed per case (latency is the median of these)
+TIMING_REPEATS = 50
+
+
+@dataclass
+class RoutingResult:
+    """Routing decision for one evaluation case."""
+
+    case_id: str
+    query: str
+    expected: str
+    decision: RoutingDecision
+    latency_ms: float
+
+    @property
+    def correct(self) -> bool:
+        """Whether the best-scoring agent is the expected one."""
+        return self.decision.modes[0] == self.expected
+
+    @property
+    def covered(self) -> bool:
+        """Whether the expected agent is among the picked ones."""
+        return self.expected in self.decision.modes
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "case_id": self.case_id,
+            "query": self.query,
+            "expected": self.expected,
+            "correct": self.correct,
+            "covered": self.covered,
+            "latency_ms": round(self.latency_ms, 4),
+            "decision": self.decision.to_dict(),
+        }
+
+
+@dataclass
+class RoutingReport:
+    """Routing accuracy and latency over a dataset."""
+
+    dataset_name: str
+    method: str
+    results: list[RoutingResult] = field(default_factory=list)
+
+    @property
+    def accuracy(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r.correct for r in self.results) / len(self.results)
+
+    @property
+    def coverage(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r.covered for r in self.results) / len(self.results)
+
+    @property
+    def avg_agents(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(len(r.decision.modes) for r in self.results) / len(self.results)
+
+    def latency_percentile(self, percentile: float) -> float:
+        latencies = sorted(r.latency_ms for r in self.results)
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(percentile / 100 * len(latencies)))
+        return latencies[index]
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "dataset_name": self.dataset_name,
+            "method": self.method,
+            "summary": {
+                "cases": len(self.results),
+                "accuracy": round(self.accuracy, 4),
+                "coverage": round(self.coverage, 4),
+                "avg_agents": round(self.avg_agents, 2),
+                "latency_p50_ms": round(self.latency_percentile(50), 4),
+                "latency_p99_ms": round(self.latency_percentile(99), 4),
+            },
+            "results": [r.to_dict() for r in self.results],
+        }
+
+    def print_summary(self) -> None:
+        """Print summary to console."""
+        print(f"\nRouting evaluation: {self.dataset_name} ({self.method})")
+        print(f"Accuracy (top agent): {self.accuracy:.1%}")
+        print(f"Coverage (expected agent picked): {self.coverage:.1%}")
+        print(f"Agents per query: {self.avg_agents:.2f}")
+        print(
+            f"Decision latency: p50 {self.latency_percentile(50):.3f} ms, "
+            f"p99 {self.latency_percentile(99):.3f} ms"
+        )
+        misses = [r for r in self.results if not r.correct]
+        if misses:
+            print("\nMisrouted:")
+            for r in misses:
+                print(f"  {r.case_id}: expected {r.expected}, got {r.decision.modes}")
+
+
+async def evaluate_routing(
+    dataset: Optional[GoldenDataset] = None,
+    embeddings: bool = False,
+) -> RoutingReport:
+    """Route every case of the dataset and collect the report.
+
+    Args:
+        dataset: Dataset to evaluate (default: golden dataset)
+        embeddings: Whether to use centroid similarity too
+
+    Returns:
+        RoutingReport
+    """
+    dataset = dataset or load_golden_dataset()
+    cases = [case for case in dataset.cases if case.query.strip()]
+
+    centroids = None
+    vectors: list[Optional[list[float]]] = [None] * len(cases)
+    if embeddings:
+        from backend.services.embeddings import get_embeddings
+
+        centroids = await load_centroids()
+        if centroids:
+            vectors = await get_embeddings([case.query for case in cases])
+
+    report = RoutingReport(
+        dataset_name=dataset.name,
+        method="keywords+centroids" if centroids else "keywords",
+    )
+    for case, vector in zip(cases, vectors):
+        decisions = [
+            route_query(case.query, vector, centroids or {})
+            for _ in range(TIMING_REPEATS)
+        ]
+        latencies = sorted(d.elapsed_ms for d in decisions)
+        report.results.append(RoutingResult(
+            case_id=case.id,
+            query=case.query,
+            expected=case.mode,
+            decision=decisions[0],
+            latency_ms=latencies[len(latencies) // 2],
+        ))
+    return report
+
+
+async def main():
+    """Run routing evaluation from command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Evaluate the SISUiQ mode router")
+    parser.add_argument(
+        "--embeddings",
+        action="store_true",
+        help="Use centroid similarity (needs OPENAI_API_KEY)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="Output file for report",
+    )
+
+    args = parser.parse_args()
+
+    report = await evaluate_routing(embeddings=args.embeddings)
+    report.print_summary()
+
+    if args.output:
+        with open(Path(args.output), "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"\nReport saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
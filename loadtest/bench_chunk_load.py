@@ -0,0 +1,130 @@
+"""Benchmark chunk-row loading into Postgres.
+
+Loads a synthetic document of N chunks with each method and reports
+rows per second:
+
+- orm:    one ``db.add(DocumentChunk(...))`` per row (previous behaviour)
+- insert: multi-row ``INSERT ... VALUES`` batches
+- copy:   asyncpg binary COPY (``copy_records_to_table``)
+
+Every run creates its own document and deletes it afterwards, so the
+benchmark can be pointed at a development database.
+
+Usage (from the repository root):
+    DATABASE_URL=postgresql+asyncpg://... python -m loadtest.bench_chunk_load
+    python -m loadtest.bench_chunk_load --rows 100000 --method copy --method orm
+
+To measure the old trigger-based FTS column, run the ``orm`` method against
+a database migrated to ``add_user_auth_fields`` (before revision 002).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from backend.db import async_session_maker, close_db
+from backend.models import Document, DocumentChunk, DocumentSource, DocumentType
+from backend.services.chunk_loader import bulk_insert_chunks
+
+WORDS = (
+    "transmission grid substation capacity tariff regulation outage reliability "
+    "investment network kilovolt line upgrade compliance licence authority energy "
+    "demand forecast strategic objective performance indicator maintenance"
+).split()
+
+
+def make_chunks(document_id: uuid.UUID, rows: int, words: int) -> list[dict]:
+    """Build synthetic chunk dicts for one document."""
+    rng = random.Random(42)
+    return [
+        {
+            "chunk_id": uuid.uuid4(),
+            "document_id": document_id,
+            "chunk_index": idx,
+            "text": " ".join(rng.choices(WORDS, k=words)),
+            "source": "other - synthetic benchmark",
+            "page": idx // 4 + 1,
+        }
+        for idx in range(rows)
+    ]
+
+
+async def run_method(method: str, rows: int, words: int, batch_size: int) -> float:
+    """Load one synthetic document with the given method.
+
+    Returns:
+        Rows per second
+    """
+    document_id = uuid.uuid4()
+    chunks = make_chunks(document_id, rows, words)
+
+    async with async_session_maker() as db:
+        db.add(Document(
+            id=document_id,
+            name=f"bench-{method}",
+            type=DocumentType.OTHER,
+            source=DocumentSource.OTHER,
+            file_path="bench/synthetic.pdf",
+        ))
+        await db.flush()
+
+        start = time.perf_counter()
+        if method == "orm":
+            for c in chunks:
+                db.add(DocumentChunk(
+                    id=c["chunk_id"],
+                    document_id=c["document_id"],
+                    chunk_index=c["chunk_index"],
+                    text=c["text"],
+                    source=c["source"],
+                    page=c["page"],
+                ))
+            await db.flush()
+        else:
+            await bulk_insert_chunks(db, chunks, method=method, batch_size=batch_size)
+        await db.commit()
+        elapsed = time.perf_counter() - start
+
+        await db.execute(delete(Document).where(Document.id == document_id))
+        await db.commit()
+
+    return rows / elapsed if elapsed > 0 else float("inf")
+
+
+async def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark chunk row loading")
+    parser.add_argument("--rows", type=int, default=100_000, help="Chunks per run")
+    parser.add_argument("--words", type=int, default=120, help="Words per chunk")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT")
+    parser.add_argument(
+        "--method",
+        action="append",
+        choices=["orm", "insert", "copy"],
+        help="Method(s) to run (default: all)",
+    )
+    args = parser.parse_args()
+
+    methods = args.method or ["orm", "insert", "copy"]
+    results: dict[str, float] = {}
+    try:
+        for method in methods:
+            rate = await run_method(method, args.rows, args.words, args.batch_size)
+            results[method] = rate
+            print(f"{method:>8}: {rate:12,.0f} rows/s")
+    finally:
+        await close_db()
+
+    if "orm" in results:
+        baseline = results["orm"]
+        for method, rate in results.items():
+            if method != "orm":
+                print(f"{method:>8}: {rate / baseline:.1f}x vs orm")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())